@@ -13,6 +13,9 @@ Date: December 12, 2019
 from consts import *
 from game2d import *
 from wave import *
+from simworker import WaveWorker
+from controllers import KeyboardController
+import random
 
 
 # PRIMARY RULE: Invaders can only access attributes in wave.py via getters/setters
@@ -59,8 +62,9 @@ class Invaders(GameApp):
     # STATE_PAUSED, STATE_CONTINUE, or STATE_COMPLETE
     #
     # Attribute _wave: the subcontroller for a single wave, managing aliens
-    # Invariant: _wave is a Wave object, or None if there is no wave currently
-    # active. It is only None if _state is STATE_INACTIVE.
+    # Invariant: _wave is a Wave object (or a WaveWorker if SIM_WORKER is set),
+    # or None if there is no wave currently active. It is only None if _state
+    # is STATE_INACTIVE.
     #
     # Attribute _text: the currently active message
     # Invariant: _text is a GLabel object, or None if there is no message to
@@ -69,6 +73,17 @@ class Invaders(GameApp):
     # You may have new attributes if you wish (you might want an attribute to
     # store any score across multiple waves). But you must document them.
     # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    #
+    # Attribute _turboHeld: whether TURBO_KEY was held in the last update
+    # Invariant: _turboHeld is a bool
+    #
+    # Attribute _controller: the controller that plays the game
+    # Invariant: _controller is a Controller object (a KeyboardController for
+    # the attribute input, unless it was changed with setController)
+    #
+    # Attribute _seeds: the random numbers that pick the seed of each wave
+    # Invariant: _seeds is a random.Random object, or None if every wave gets
+    # a fresh seed
 
     # DO NOT MAKE A NEW INITIALIZER!
     def getState(self):
@@ -89,6 +104,37 @@ class Invaders(GameApp):
         """
         return self._text
 
+    def getController(self):
+        """
+        Returns the controller that plays the game.
+        """
+        return self._controller
+
+    def setController(self, controller):
+        """
+        Sets the controller that plays the game, in place of the keyboard.
+
+        Parameter controller: the new controller
+        Precondition: controller is a Controller object (see controllers.py)
+        """
+        self._controller = controller
+
+    def setSeed(self, seed):
+        """
+        Sets the seed of the waves.
+
+        The seed picks the seed of each new wave in turn, so a game played
+        again with the same seed and the same keys in each update (and the
+        same time steps) has the same waves.  This is not true for waves
+        played on a worker, which keep their own clock.
+
+        Parameter seed: the seed of the waves, or None for fresh seeds
+        Precondition: seed is None or an int >= 0
+        """
+        assert seed == None or (type(seed) == int and seed >= 0), \
+            '%s is not a valid seed' % repr(seed)
+        self._seeds = None if seed == None else random.Random(seed)
+
     #counts the number of kys currently held down, from GInput
     def key_count(self):
         """
@@ -125,6 +171,9 @@ class Invaders(GameApp):
         given invariants. When done, it sets the _state to STATE_INACTIVE and
         create a message (in attribute _text) saying that the user should press
         to play a game.
+
+        It also sets the attribute tickrate to TICKRATE, which turns on a fixed
+        time step unless it is None.
         """
 
         # IMPLEMENT ME
@@ -132,6 +181,10 @@ class Invaders(GameApp):
         self._game = None
         self._wave = None
         self.key_count = 0
+        self._turboHeld = False
+        self.tickrate = TICKRATE
+        self._controller = KeyboardController(self.input)
+        self._seeds = None
         self._text = GLabel(text="Press 'S' to Play",font_size=50, left=110, bottom=350, font_name="RetroGame.ttf")
 
 
@@ -190,6 +243,8 @@ class Invaders(GameApp):
         # IMPLEMENT ME
 
         #
+        self._controller.update(self._wave)
+        self._changeTurbo()
         self._determineState()
         if self._state == STATE_INACTIVE:
             self._stateInactive()
@@ -219,15 +274,28 @@ class Invaders(GameApp):
         getters for these attributes or you need to add a draw method to
         class Wave.  We suggest the latter.  See the example subcontroller.py
         from class.
+
+        The game has a fixed time step of TICKRATE updates a second (unless
+        TICKRATE is None), so the wave is drawn with the attribute alpha, and
+        the ship and bolts move smoothly between updates.
         """
 
         if self._text != None:
             self._text.draw(self.view)
         if self._state == STATE_ACTIVE:
-            self._wave.draw(self.view)
+            self._wave.draw(self.view, self.alpha)
         if self._state == STATE_PAUSED:
             self._text.draw(self.view)
-            self._wave.draw(self.view)
+            self._wave.draw(self.view, self.alpha)
+
+
+    def on_stop(self):
+        """
+        Stops the worker of the current wave when the application stops.
+
+        This is a Kivy event handler, so it is called for you.
+        """
+        self._stopWorker()
 
 
     # HELPER METHODS FOR THE STATES GO HERE
@@ -238,18 +306,34 @@ class Invaders(GameApp):
         This method checks for either the mouse being held down at a certain key.
         """
 
-        transition = self.input.is_key_down('s')
+        transition = self._controller.is_key_down('s')
         if self._state == STATE_INACTIVE and transition:
             self._state = STATE_NEWWAVE
         if self._state == STATE_PAUSED and transition:
             self._state = STATE_CONTINUE
         if self._wave != None:
-            if self._wave._lives == 0 or self._noAliens():
+            if self._wave.getLives() == 0 or self._noAliens():
                 self._state = STATE_COMPLETE
         if self._state == STATE_COMPLETE and transition:
             self._state = STATE_NEWWAVE
 
 
+    def _changeTurbo(self):
+        """
+        Doubles the number of updates per frame when TURBO_KEY is pressed.
+
+        Once the number passes TURBO_MAX, it goes back to 1 (normal speed).
+        Holding the key down only counts as one press.  A wave played on a
+        worker keeps its own clock, so the turbo is passed on to the worker.
+        """
+        held = self._controller.is_key_down(TURBO_KEY)
+        if held and not self._turboHeld:
+            self.turbo = self.turbo*2 if self.turbo*2 <= TURBO_MAX else 1
+            if SIM_WORKER != None and self._wave != None:
+                self._wave.setTurbo(self.turbo)
+        self._turboHeld = held
+
+
     def _stateInactive(self):
         """
         Assigns actions to STATE_INACTIVE
@@ -267,7 +351,12 @@ class Invaders(GameApp):
 
         if self._state == STATE_NEWWAVE:
             self._text = None
-            self._wave = Wave()
+            self._stopWorker()
+            seed = None if self._seeds == None else self._seeds.getrandbits(32)
+            if SIM_WORKER == None:
+                self._wave = Wave(seed)
+            else:
+                self._wave = WaveWorker(seed, rate=SIM_RATE, mode=SIM_WORKER, turbo=self.turbo)
             self._state = STATE_ACTIVE
 
     def _stateActive(self,dt):
@@ -275,18 +364,18 @@ class Invaders(GameApp):
         Assigns actions to STATE_ACTIVE
         """
         if self._wave != None:
-            self._wave.update(self.input,dt)
-        if self._wave._ship == None:
+            self._wave.update(self._controller,dt)
+        if not self._wave.hasShip():
             self._state = STATE_PAUSED
 
     def _statePaused(self):
         """
         Assigns actions to STATE_PAUSED
         """
-        if self._wave._ship == None:
+        if not self._wave.hasShip():
             if self._wave != None:
                 self._text = GLabel(text="Game Paused.\n 'S' To Continue \nLives remaining: " + str(self._wave.getLives()),font_size=50, left=110, bottom=350, font_name="RetroGame.ttf")
-            self._wave._bolts = []
+            self._wave.clearBolts()
         self._determineState()
 
     def drawPaused(self, view):
@@ -298,7 +387,7 @@ class Invaders(GameApp):
 
 
     def _stateContinue(self):
-        self._wave._ship = Ship(x=(GAME_WIDTH//2),y=SHIP_BOTTOM,source='ship.png')
+        self._wave.restoreShip()
         self._text = None
         self._state = STATE_ACTIVE
 
@@ -315,15 +404,17 @@ class Invaders(GameApp):
 
 
 
+    def _stopWorker(self):
+        """
+        Stops the worker of the current wave, if the wave is played on one.
+        """
+        if SIM_WORKER != None and self._wave != None:
+            self._wave.stop()
+
+
     def _noAliens(self):
         """
         This method checks if there are no aliens remaining. If there are no aliens
         remaining, return True. Else, return False.
         """
-        # nonelist =
-        for row in range(len(self._wave._aliens)):
-            for col in range(len(self._wave._aliens[row])):
-                each_alien = self._wave._aliens[row][col]
-                if self._wave._aliens[row][col] != None:
-                    return False
-        return True
+        return not self._wave.hasAliens()
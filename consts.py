@@ -73,6 +73,26 @@ BOLT_HEIGHT = 16
 BOLT_SPEED  = 10
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE   = 20
+# the number of seconds the aliens hold their fire after the ship is restored
+SHIP_RESPAWN = 1.5
+# the most alien bolts that can be on screen at once
+BOLT_MAX    = 6
+# the number of seconds a column of aliens must wait after firing
+BOLT_COOLDOWN = 2.0
+# how the aliens fire: 'single' (one random column), 'spread' (several
+# random columns) or 'aimed' (the column closest to the ship)
+BOLT_PATTERN = 'single'
+# the most bolts in a single 'spread' volley
+BOLT_VOLLEY = 3
+# the owner of a bolt fired by the ship
+PLAYER_BOLT = 0
+# the owner of a bolt fired by an alien
+ALIEN_BOLT  = 1
+# the action bits of a batched wave: move left, move right, fire (the keys
+# 'left', 'right' and 'up' of a Wave); combine them with |
+ACTION_LEFT  = 1
+ACTION_RIGHT = 2
+ACTION_FIRE  = 4
 
 
 ### GAME CONSTANTS ###
@@ -89,6 +109,20 @@ STATE_PAUSED   = 3
 STATE_CONTINUE = 4
 #: state when the game is complete (won or lost)
 STATE_COMPLETE = 5
+# the number of updates per frame when the game starts (1 is normal speed)
+TURBO       = 1
+# the most updates per frame in turbo mode
+TURBO_MAX   = 64
+# the key that doubles the updates per frame (wrapping back to 1)
+TURBO_KEY   = 't'
+# where the wave is played: None (in update, on the Kivy thread), 'thread' or
+# 'process' (on a worker that publishes snapshots to draw; see simworker.py)
+SIM_WORKER  = None
+# the ticks per second of a wave played on a worker
+SIM_RATE    = 60
+# the updates per second of game time in Invaders (a fixed time step), or None
+# to update once per frame with the time since the last frame (the default)
+TICKRATE    = None
 
 
 ### USE COMMAND LINE ARGUMENTS TO CHANGE NUMBER OF ALIENS IN A ROW
@@ -100,27 +134,73 @@ arguments are everything after the word python. So if you start the game typing
 
 Python puts ['breakout.py', '3', '4', '0.5'] into sys.argv. Below, we take
 advantage of this fact to change the constants ALIEN_ROWS, ALIENS_IN_ROW, and
-ALIEN_SPEED.
+ALIEN_SPEED.  A fourth argument changes TURBO, so
+
+    python invaders 3 4 0.5 16
+
+runs the game 16 times faster than it is drawn.  A fifth argument sets
+SIM_WORKER, so
+
+    python invaders 3 4 0.5 1 thread
+
+plays the wave on a worker thread.
+
+Only the plain arguments before the first option (an argument that starts with
+'-') are read here, so a script with options of its own, such as headless.py,
+must take the layout first:
+
+    python headless.py 3 4 0.5 --frames 5000
+
+The arguments read are kept in LAYOUT_ARGS, so such a script can check that
+its own parser agrees.
 """
+def _layoutArgs():
+    """
+    Returns the plain command line arguments before the first option.
+    """
+    result = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('-'):
+            break
+        result.append(arg)
+    return result
+
+# the plain command line arguments that set the layout (rows, aliens in a row,
+# speed, turbo and worker)
+LAYOUT_ARGS = _layoutArgs()
+
 try:
-    rows = int(sys.argv[1])
+    rows = int(LAYOUT_ARGS[0])
     if rows >= 1 and rows <= 10:
         ALIEN_ROWS = rows
 except:
     pass # Use original value
 
 try:
-    perrow = int(sys.argv[2])
+    perrow = int(LAYOUT_ARGS[1])
     if perrow >= 1 and perrow <= 15:
         ALIENS_IN_ROW = perrow
 except:
     pass # Use original value
 
 try:
-    speed = float(sys.argv[3])
+    speed = float(LAYOUT_ARGS[2])
     if speed > 0 and speed <= 3:
         ALIEN_SPEED = speed
 except:
     pass # Use original value
 
+try:
+    turbo = int(LAYOUT_ARGS[3])
+    if turbo >= 1 and turbo <= TURBO_MAX:
+        TURBO = turbo
+except:
+    pass # Use original value
+
+try:
+    if LAYOUT_ARGS[4] in ('thread', 'process'):
+        SIM_WORKER = LAYOUT_ARGS[4]
+except:
+    pass # Use original value
+
 ### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
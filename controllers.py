@@ -0,0 +1,548 @@
+"""
+Controllers for Alien Invaders
+
+This module contains the controllers that can play the ship.  A Wave reads
+its input with the method is_key_down (for the keys 'left', 'right' and
+'up'), and Invaders reads the keys 's' and TURBO_KEY the same way.  A
+Controller has that method too, so it can stand in for the keyboard.
+Before each update, Invaders calls the method update of its controller
+with the current wave, so that the controller can decide which keys to hold
+down in that frame.
+
+The controllers are
+
+    KeyboardController:   the keys held down on a GInput (the default)
+    ScriptedController:   the keys returned by a function of the wave
+    ReplayController:     the keys of each frame of a recording
+    RecordingController:  the keys of another controller, which it records
+
+and the reference bots RandomBot, TrackingBot and DodgeBot.  A bot always
+holds down 's', so Invaders starts every wave and continues after every
+lost life without waiting.  See the module soak for playing Invaders with
+a bot and no window.
+
+A recording is a text file with one line per frame.  Each line lists the
+keys held down in that frame, separated by commas.  The waves of Invaders
+are random, so to play back the same game a recording may also start with
+the line
+
+    # seed 1234
+
+giving the seed of the waves (see Invaders.setSeed).
+
+Author: agent
+Date: October 18, 2026
+"""
+from consts import *
+import random
+
+
+class Controller(object):
+    """
+    This class is the base class of every controller.
+
+    A controller holds down a set of keys, which is decided once per frame
+    by the method update.  A subclass overrides the method decide.  The base
+    class never holds down any key.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _keys: the keys held down in this frame
+    # Invariant: _keys is a frozenset of strings
+
+    # GETTERS AND SETTERS
+    def getKeys(self):
+        """
+        Returns the frozenset of keys held down in this frame.
+        """
+        return self._keys
+
+    def isDone(self):
+        """
+        Returns True if the controller has nothing more to play.
+
+        Only a recording can run out, so this is False for most controllers.
+        """
+        return False
+
+    # INITIALIZER
+    def __init__(self):
+        """
+        Initializes a controller with no keys held down.
+        """
+        self._keys = frozenset()
+
+    def update(self, wave):
+        """
+        Decides the keys to hold down in this frame.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object, or None if there is no wave
+        """
+        self._keys = frozenset(self.decide(wave))
+
+    def decide(self, wave):
+        """
+        Returns the keys to hold down in this frame.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object, or None if there is no wave
+        """
+        return ()
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is held down.
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return key in self._keys
+
+
+class KeyboardController(Controller):
+    """
+    This class is a controller that holds down the keys of a GInput.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _input: the keyboard
+    # Invariant: _input has a method is_key_down, like GInput
+
+    # GETTERS AND SETTERS
+    def getKeys(self):
+        """
+        Returns the frozenset of the keys used by the game that are held down.
+        """
+        return frozenset(key for key in ('left', 'right', 'up', 's', TURBO_KEY)
+                         if self._input.is_key_down(key))
+
+    # INITIALIZER
+    def __init__(self, input):
+        """
+        Initializes a controller for the keyboard input.
+
+        Parameter input: the keyboard
+        Precondition: input has a method is_key_down, like GInput
+        """
+        Controller.__init__(self)
+        self._input = input
+
+    def update(self, wave):
+        """
+        Does nothing, as the keyboard is read when a key is tested.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object, or None if there is no wave
+        """
+        pass
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is held down on the keyboard.
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return self._input.is_key_down(key)
+
+
+class ScriptedController(Controller):
+    """
+    This class is a controller that asks a function for its keys.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _policy: the function deciding the keys
+    # Invariant: _policy is a function of a wave (or None) that returns an
+    # iterable of keys
+
+    # INITIALIZER
+    def __init__(self, policy):
+        """
+        Initializes a controller that holds down the keys policy(wave).
+
+        Parameter policy: the function deciding the keys
+        Precondition: policy is a function of a wave (or None) that returns an
+        iterable of strings
+        """
+        assert callable(policy), '%s is not a function' % repr(policy)
+        Controller.__init__(self)
+        self._policy = policy
+
+    def decide(self, wave):
+        """
+        Returns the keys chosen by the policy.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object, or None if there is no wave
+        """
+        return self._policy(wave)
+
+
+class ReplayController(Controller):
+    """
+    This class is a controller that plays back recorded keys, a frame at a time.
+
+    When the recording runs out, no key is held down (or, if the controller
+    loops, the recording starts again).
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _frames: the keys of each frame
+    # Invariant: _frames is a list of tuples of strings
+    #
+    # Attribute _next: the position of the next frame
+    # Invariant: _next is an int in 0..len(_frames)
+    #
+    # Attribute _loop: whether to start again at the end
+    # Invariant: _loop is a bool
+    #
+    # Attribute _seed: the seed of the waves of the recording
+    # Invariant: _seed is an int >= 0, or None if it is not known
+
+    # GETTERS AND SETTERS
+    def isDone(self):
+        """
+        Returns True if every frame has been played back (and it does not loop).
+        """
+        return not self._loop and self._next >= len(self._frames)
+
+    def getSeed(self):
+        """
+        Returns the seed of the waves of the recording, or None if it is not known.
+        """
+        return self._seed
+
+    # CLASS METHODS
+    @classmethod
+    def load(cls, path, loop=False):
+        """
+        Returns a controller that plays back the recording in a file.
+
+        Parameter path: the name of the file
+        Precondition: path is a string naming a recording
+
+        Parameter loop: whether to start again at the end
+        Precondition: loop is a bool
+        """
+        frames = []
+        seed = None
+        with open(path) as file:
+            for line in file:
+                if line.startswith('#'):
+                    words = line[1:].split()
+                    if len(words) == 2 and words[0] == 'seed':
+                        seed = int(words[1])
+                else:
+                    frames.append(_parseKeys(line))
+        return cls(frames, loop, seed)
+
+    # INITIALIZER
+    def __init__(self, frames, loop=False, seed=None):
+        """
+        Initializes a controller that plays back frames.
+
+        Parameter frames: the keys of each frame
+        Precondition: frames is an iterable of iterables of strings
+
+        Parameter loop: whether to start again at the end
+        Precondition: loop is a bool
+
+        Parameter seed: the seed of the waves of the recording, or None
+        Precondition: seed is None or an int >= 0
+        """
+        assert type(loop) == bool, '%s is not a bool' % repr(loop)
+        assert seed == None or (type(seed) == int and seed >= 0), \
+            '%s is not a valid seed' % repr(seed)
+        Controller.__init__(self)
+        self._frames = [tuple(keys) for keys in frames]
+        self._next = 0
+        self._loop = loop
+        self._seed = seed
+
+    def decide(self, wave):
+        """
+        Returns the keys of the next frame.
+
+        Parameter wave: the wave being played (ignored)
+        Precondition: wave is a Wave object, or None if there is no wave
+        """
+        if self._next >= len(self._frames):
+            if not self._loop or len(self._frames) == 0:
+                return ()
+            self._next = 0
+        keys = self._frames[self._next]
+        self._next += 1
+        return keys
+
+
+class RecordingController(Controller):
+    """
+    This class is a controller that records the keys of another controller.
+
+    Only the keys 'left', 'right', 'up' and 's' are recorded.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _inner: the controller being recorded
+    # Invariant: _inner is a Controller
+    #
+    # Attribute _frames: the keys of each frame so far
+    # Invariant: _frames is a list of tuples of strings
+    #
+    # Attribute _seed: the seed of the waves being played
+    # Invariant: _seed is an int >= 0, or None if it is not known
+
+    # The keys that are recorded
+    KEYS = ('left', 'right', 'up', 's')
+
+    # GETTERS AND SETTERS
+    def getFrames(self):
+        """
+        Returns the list of the keys of each frame so far.
+
+        The list belongs to the controller; do not change it.
+        """
+        return self._frames
+
+    def getSeed(self):
+        """
+        Returns the seed of the waves being played, or None if it is not known.
+        """
+        return self._seed
+
+    def isDone(self):
+        """
+        Returns True if the controller being recorded has nothing more to play.
+        """
+        return self._inner.isDone()
+
+    # INITIALIZER
+    def __init__(self, inner, seed=None):
+        """
+        Initializes a controller that records inner.
+
+        The seed is written with the keys, so that the game can be played back
+        with the same waves.
+
+        Parameter inner: the controller to record
+        Precondition: inner is a Controller
+
+        Parameter seed: the seed of the waves being played, or None
+        Precondition: seed is None or an int >= 0
+        """
+        assert seed == None or (type(seed) == int and seed >= 0), \
+            '%s is not a valid seed' % repr(seed)
+        Controller.__init__(self)
+        self._inner = inner
+        self._frames = []
+        self._seed = seed
+
+    def update(self, wave):
+        """
+        Updates the controller being recorded and records its keys.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object, or None if there is no wave
+        """
+        self._inner.update(wave)
+        self._frames.append(tuple(key for key in self.KEYS if self._inner.is_key_down(key)))
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is held down by the controller being recorded.
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return self._inner.is_key_down(key)
+
+    def save(self, path):
+        """
+        Writes the recording to a file.
+
+        If the seed is known, the file starts with a line giving it.
+
+        Parameter path: the name of the file
+        Precondition: path is a string
+        """
+        with open(path, 'w') as file:
+            if self._seed != None:
+                file.write('# seed %d\n' % self._seed)
+            for keys in self._frames:
+                file.write(','.join(keys)+'\n')
+
+
+class Bot(Controller):
+    """
+    This class is the base class of the reference bots.
+
+    A bot always holds down 's', so that the game never waits for a player.
+    A subclass overrides the method play instead of decide.
+
+    The wave may be a WaveWorker, whose getters read the latest snapshot, so
+    two calls in the same frame can see different ticks.  Hence a bot reads
+    the ship position once in play, and plays nothing if it is None.
+    """
+
+    def decide(self, wave):
+        """
+        Returns the keys chosen by play, and 's'.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object, or None if there is no wave
+        """
+        if wave == None or wave.getShipX() == None:
+            return ('s',)
+        return tuple(self.play(wave)) + ('s',)
+
+    def play(self, wave):
+        """
+        Returns the keys to hold down to play the wave.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object with a ship
+        """
+        return ()
+
+
+class RandomBot(Bot):
+    """
+    This class is a bot that moves and fires at random.
+
+    The bot picks a direction (left, right or none) and holds it for a random
+    number of frames, firing at random.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _rng: the random numbers of the bot
+    # Invariant: _rng is a random.Random object
+    #
+    # Attribute _hold: the most frames to hold a direction
+    # Invariant: _hold is an int > 0
+    #
+    # Attribute _move: the direction held
+    # Invariant: _move is a tuple of at most one of 'left' and 'right'
+    #
+    # Attribute _left: the frames left to hold _move
+    # Invariant: _left is an int >= 0
+
+    # INITIALIZER
+    def __init__(self, seed=None, hold=30):
+        """
+        Initializes a random bot.
+
+        Parameter seed: the seed of the bot, or None for a random one
+        Precondition: seed is None or an int
+
+        Parameter hold: the most frames to hold a direction
+        Precondition: hold is an int > 0
+        """
+        assert type(hold) == int and hold > 0, '%s is not a valid hold' % repr(hold)
+        Controller.__init__(self)
+        self._rng = random.Random(seed)
+        self._hold = hold
+        self._move = ()
+        self._left = 0
+
+    def play(self, wave):
+        """
+        Returns a random direction and maybe 'up'.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object with a ship
+        """
+        if self._left == 0:
+            self._move = self._rng.choice(((), ('left',), ('right',)))
+            self._left = self._rng.randint(1, self._hold)
+        self._left -= 1
+        return self._move + (('up',) if self._rng.random() < 0.5 else ())
+
+
+class TrackingBot(Bot):
+    """
+    This class is a bot that moves under the nearest column of aliens and fires.
+    """
+
+    def play(self, wave):
+        """
+        Returns the keys that move the ship toward the nearest column, and 'up'.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object with a ship
+        """
+        x = wave.getShipX()
+        target = self._target(wave, x) if x != None else None
+        if target == None:
+            return ()
+        return self._toward(x, target) + ('up',)
+
+    def _target(self, wave, x):
+        """
+        Returns the x-coordinate of the live column nearest x, or None.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object
+
+        Parameter x: the x-coordinate of the ship
+        Precondition: x is a number
+        """
+        cols = wave.getAlienGrid().any(axis=0).nonzero()[0]
+        if len(cols) == 0:
+            return None
+        cellX, cellY = wave.getAlienCells()
+        xs = cellX[cols] + wave.getAlienOffset()[0]
+        return float(xs[abs(xs - x).argmin()])
+
+    def _toward(self, x, target):
+        """
+        Returns the key that moves a ship at x toward target, as a tuple.
+
+        Parameter x: the x-coordinate of the ship
+        Precondition: x is a number
+
+        Parameter target: the x-coordinate to move to
+        Precondition: target is a number
+        """
+        if target < x - SHIP_MOVEMENT:
+            return ('left',)
+        if target > x + SHIP_MOVEMENT:
+            return ('right',)
+        return ()
+
+
+class DodgeBot(TrackingBot):
+    """
+    This class is a bot that tracks the aliens like TrackingBot, but first
+    moves out of the way of any alien bolt about to hit the ship.
+    """
+    # The height above the ship at which a bolt is a danger
+    DANGER = 6*ALIEN_HEIGHT
+
+    def play(self, wave):
+        """
+        Returns the keys that dodge the nearest danger, or track the aliens.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object with a ship
+        """
+        x = wave.getShipX()
+        if x == None:
+            return ()
+        xs, ys = wave.getBoltPositions(ALIEN_BOLT)
+        reach = SHIP_WIDTH/2 + BOLT_WIDTH + SHIP_MOVEMENT
+        danger = (abs(xs - x) < reach) & (ys < SHIP_BOTTOM + self.DANGER)
+        if danger.any():
+            # Run away from the lowest dangerous bolt, unless against a wall
+            bolt = float(xs[danger][ys[danger].argmin()])
+            if bolt >= x and x > SHIP_WIDTH:
+                return ('left',)
+            if bolt < x and x < GAME_WIDTH - SHIP_WIDTH:
+                return ('right',)
+            return ('left',) if x > GAME_WIDTH/2 else ('right',)
+        return TrackingBot.play(self, wave)
+
+
+def _parseKeys(line):
+    """
+    Returns the tuple of keys in a line of a recording.
+
+    Parameter line: a line of a recording
+    Precondition: line is a string
+    """
+    return tuple(key.strip() for key in line.split(',') if key.strip())
@@ -0,0 +1,355 @@
+"""
+Observation encoder for Alien Invaders
+
+This module contains the class WaveEncoder, which writes the state of a
+Wave into numpy arrays.  Bots and analysis scripts should use it instead
+of reading the hidden attributes of a Wave.  An encoder has two modes.
+
+In the mode 'features', the state is a float32 vector.  Its entries are,
+in order:
+
+    the ship x-coordinate (as a fraction of GAME_WIDTH)
+    1 if the ship is alive, 0 otherwise
+    the lives left (as a fraction of SHIP_LIVES)
+    the formation offset dx (as a fraction of GAME_WIDTH)
+    the formation offset dy (as a fraction of GAME_HEIGHT)
+    the player bolt as (on, x, y), x and y as fractions of the window
+    the nearest alien bolts to the ship as (on, x, y) each, nearest first
+    the alive grid of the aliens, row by row from the top (1 or 0)
+
+In the mode 'grid', the state is a uint8 array of shape (CHANNELS, H, W).
+It is a picture of the window cut into square cells, with row 0 at the top.
+A cell of a channel is GRID_ON if some object of that channel overlaps it,
+and 0 otherwise.  The channels are the aliens, the ship, the player bolts
+and the alien bolts, in that order.
+
+An encoder writes into an array given by the caller, or into its own array
+if none is given, so it makes no new output arrays as a game is played.
+The method encodeBatch writes many waves into the rows of one array.
+
+Author: agent
+Date: October 18, 2026
+"""
+from consts import *
+import numpy as np
+
+
+class WaveEncoder(object):
+    """
+    This class writes the state of a Wave into a preallocated array.
+
+    The shape and type of the arrays written by an encoder are given by
+    getShape() and getDtype().
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _mode: the kind of array written
+    # Invariant: _mode is FEATURES or GRID
+    #
+    # Attribute _bolts: the number of alien bolts in a feature vector
+    # Invariant: _bolts is an int >= 0
+    #
+    # Attribute _cell: the width and height of a grid cell in pixels
+    # Invariant: _cell is an int > 0
+    #
+    # Attribute _shape: the shape of an encoded wave
+    # Invariant: _shape is a tuple of ints
+    #
+    # Attribute _out: the array written when the caller gives none
+    # Invariant: _out is an array of shape _shape and type getDtype()
+    #
+    # Attribute _dist: scratch space for the squared distances of the bolts
+    # Invariant: _dist is a float array of shape (2, k), where k is at least
+    # BOLT_MAX and the most alien bolts ever encoded
+    #
+    # Attribute _near: scratch space for the positions of the nearest bolts
+    # Invariant: _near is a float array of length at least _bolts
+
+    # The modes
+    FEATURES = 'features'
+    GRID     = 'grid'
+
+    # The channels of a grid
+    CHANNEL_ALIENS = 0
+    CHANNEL_SHIP   = 1
+    CHANNEL_PLAYER = 2
+    CHANNEL_ALIEN  = 3
+    # The number of channels
+    CHANNELS = 4
+    # The value of an occupied cell
+    GRID_ON = 255
+
+    # The length of a feature vector with BOLT_MAX alien bolts
+    FEATURE_SIZE = 8 + 3*BOLT_MAX + ALIEN_ROWS*ALIENS_IN_ROW
+
+    # The position of each part of a feature vector
+    _SHIP   = 0
+    _FORM   = 3
+    _PLAYER = 5
+    _ALIEN_BOLTS = 8
+
+    # GETTERS AND SETTERS
+    def getMode(self):
+        """
+        Returns the mode of this encoder, FEATURES or GRID.
+        """
+        return self._mode
+
+    def getShape(self):
+        """
+        Returns the shape of the array for one wave.
+        """
+        return self._shape
+
+    def getDtype(self):
+        """
+        Returns the numpy type of the array for one wave.
+        """
+        return np.float32 if self._mode == self.FEATURES else np.uint8
+
+    # INITIALIZER
+    def __init__(self, mode=FEATURES, bolts=BOLT_MAX, cell=8):
+        """
+        Initializes an encoder.
+
+        Parameter mode: the kind of array to write
+        Precondition: mode is FEATURES or GRID
+
+        Parameter bolts: the number of alien bolts in a feature vector
+        Precondition: bolts is an int >= 0
+
+        Parameter cell: the width and height of a grid cell in pixels
+        Precondition: cell is an int > 0
+        """
+        assert mode in (self.FEATURES, self.GRID), '%s is not a valid mode' % repr(mode)
+        assert type(bolts) == int and bolts >= 0, '%s is not a valid bolt count' % repr(bolts)
+        assert type(cell) == int and cell > 0, '%s is not a valid cell size' % repr(cell)
+        self._mode = mode
+        self._bolts = bolts
+        self._cell = cell
+        if mode == self.FEATURES:
+            self._shape = (self._ALIEN_BOLTS + 3*bolts + ALIEN_ROWS*ALIENS_IN_ROW,)
+        else:
+            self._shape = (self.CHANNELS, -(-GAME_HEIGHT//cell), -(-GAME_WIDTH//cell))
+        self._out = np.zeros(self._shape, dtype=self.getDtype())
+        self._dist = np.empty((2, BOLT_MAX))
+        self._near = np.empty(bolts)
+
+    # METHODS TO ENCODE
+    def encode(self, wave, out=None):
+        """
+        Writes the state of wave into out and returns out.
+
+        If out is None, the state is written into an array owned by this
+        encoder, which is overwritten by the next call to encode.
+
+        Parameter wave: the wave to encode
+        Precondition: wave is a Wave object
+
+        Parameter out: the array to write into
+        Precondition: out is None or an array of shape getShape() and type
+        getDtype()
+        """
+        if out is None:
+            out = self._out
+        assert out.shape == self._shape and out.dtype == self.getDtype(), \
+            'the output is not a %s array of shape %s' % (np.dtype(self.getDtype()).name, self._shape)
+        if self._mode == self.FEATURES:
+            self._encodeFeatures(wave, out)
+        else:
+            self._encodeGrid(wave, out)
+        return out
+
+    def encodeBatch(self, waves, out):
+        """
+        Writes the state of each wave into a row of out and returns out.
+
+        Row i of out is the state of waves[i].  Any rows past the last wave
+        are left alone.
+
+        Parameter waves: the waves to encode
+        Precondition: waves is a sequence of Wave objects
+
+        Parameter out: the array to write into
+        Precondition: out is an array of shape (n,)+getShape() and type
+        getDtype(), with n >= len(waves)
+        """
+        assert out.shape[1:] == self._shape and out.dtype == self.getDtype(), \
+            'the output is not a %s array of rows of shape %s' % (np.dtype(self.getDtype()).name, self._shape)
+        assert len(waves) <= len(out), 'the output has fewer than %d rows' % len(waves)
+        for i in range(len(waves)):
+            self.encode(waves[i], out[i])
+        return out
+
+    # HELPER METHODS
+    def _encodeFeatures(self, wave, out):
+        """
+        Writes the feature vector of wave into out.
+
+        Parameter wave: the wave to encode
+        Precondition: wave is a Wave object
+
+        Parameter out: the array to write into
+        Precondition: out is a float32 array of shape getShape()
+        """
+        ship = wave.getShipX()
+        out[self._SHIP] = (ship if ship != None else 0.0)/GAME_WIDTH
+        out[self._SHIP+1] = ship != None
+        out[self._SHIP+2] = wave.getLives()/SHIP_LIVES
+        dx, dy = wave.getAlienOffset()
+        out[self._FORM] = dx/GAME_WIDTH
+        out[self._FORM+1] = dy/GAME_HEIGHT
+
+        xs, ys = wave.getBoltPositions(PLAYER_BOLT)
+        out[self._PLAYER:self._ALIEN_BOLTS] = 0.0
+        if len(xs) > 0:
+            out[self._PLAYER] = 1.0
+            out[self._PLAYER+1] = xs[0]/GAME_WIDTH
+            out[self._PLAYER+2] = ys[0]/GAME_HEIGHT
+
+        grid = self._ALIEN_BOLTS + 3*self._bolts
+        bolts = out[self._ALIEN_BOLTS:grid]
+        bolts[:] = 0.0
+        xs, ys = wave.getBoltPositions(ALIEN_BOLT)
+        n = min(len(xs), self._bolts)
+        if n > 0:
+            # With no ship, the bolts nearest the middle of the bottom matter most
+            x = ship if ship != None else GAME_WIDTH/2
+            near = self._nearest(xs, ys, x, n)
+            bolts[0:3*n:3] = 1.0
+            pos = self._near[:n]
+            np.take(xs, near, out=pos)
+            np.divide(pos, GAME_WIDTH, out=bolts[1:3*n:3])
+            np.take(ys, near, out=pos)
+            np.divide(pos, GAME_HEIGHT, out=bolts[2:3*n:3])
+
+        out[grid:] = wave.getAlienGrid().ravel()
+
+    def _nearest(self, xs, ys, x, n):
+        """
+        Returns the indices of the n bolts nearest (x, SHIP_BOTTOM), nearest first.
+
+        The distances are computed in scratch space, and only the n nearest
+        bolts are sorted.
+
+        Parameter xs: the x-coordinates of the bolts
+        Precondition: xs is a float array
+
+        Parameter ys: the y-coordinates of the bolts
+        Precondition: ys is a float array of the same length as xs
+
+        Parameter x: the x-coordinate to measure from
+        Precondition: x is a number
+
+        Parameter n: the number of bolts to pick
+        Precondition: n is an int in 1..len(xs)
+        """
+        m = len(xs)
+        if self._dist.shape[1] < m:
+            self._dist = np.empty((2, m))
+        dist = self._dist[0, :m]
+        temp = self._dist[1, :m]
+        np.subtract(xs, x, out=dist)
+        np.multiply(dist, dist, out=dist)
+        np.subtract(ys, SHIP_BOTTOM, out=temp)
+        np.multiply(temp, temp, out=temp)
+        dist += temp
+        if n == m:
+            return np.argsort(dist, kind='stable')
+        near = np.argpartition(dist, n-1)[:n]
+        return near[np.argsort(dist[near], kind='stable')]
+
+    def _encodeGrid(self, wave, out):
+        """
+        Writes the occupancy grid of wave into out.
+
+        Parameter wave: the wave to encode
+        Precondition: wave is a Wave object
+
+        Parameter out: the array to write into
+        Precondition: out is a uint8 array of shape getShape()
+        """
+        out[:] = 0
+        alive = wave.getAlienGrid()
+        cellX, cellY = wave.getAlienCells()
+        dx, dy = wave.getAlienOffset()
+        rows, cols = np.nonzero(alive)
+        self._fillMany(out[self.CHANNEL_ALIENS], cellX[cols]+dx, cellY[rows]+dy,
+                       ALIEN_WIDTH, ALIEN_HEIGHT)
+
+        ship = wave.getShipX()
+        if ship != None:
+            self._fill(out[self.CHANNEL_SHIP], ship, SHIP_BOTTOM, SHIP_WIDTH, SHIP_HEIGHT)
+
+        for owner, channel in ((PLAYER_BOLT, self.CHANNEL_PLAYER),
+                               (ALIEN_BOLT, self.CHANNEL_ALIEN)):
+            xs, ys = wave.getBoltPositions(owner)
+            self._fillMany(out[channel], xs, ys, BOLT_WIDTH, BOLT_HEIGHT)
+
+    def _fill(self, plane, x, y, width, height):
+        """
+        Marks the cells of plane that overlap a rectangle.
+
+        The parts of the rectangle outside of the window are ignored.
+
+        Parameter plane: one channel of a grid
+        Precondition: plane is a uint8 array of shape getShape()[1:]
+
+        Parameter x: the x-coordinate of the rectangle center
+        Precondition: x is a number
+
+        Parameter y: the y-coordinate of the rectangle center
+        Precondition: y is a number
+
+        Parameter width: the width of the rectangle
+        Precondition: width is a number > 0
+
+        Parameter height: the height of the rectangle
+        Precondition: height is a number > 0
+        """
+        rows, cols = plane.shape
+        left = max(int((x - width/2)//self._cell), 0)
+        right = min(int((x + width/2)//self._cell) + 1, cols)
+        top = max(int((GAME_HEIGHT - y - height/2)//self._cell), 0)
+        bottom = min(int((GAME_HEIGHT - y + height/2)//self._cell) + 1, rows)
+        if left < right and top < bottom:
+            plane[top:bottom, left:right] = self.GRID_ON
+
+    def _fillMany(self, plane, xs, ys, width, height):
+        """
+        Marks the cells of plane that overlap any of several rectangles.
+
+        This is the same as calling _fill for each rectangle, but all of the
+        cells are marked with one scatter.  A rectangle spans at most
+        width//cell+2 cells across and height//cell+2 cells down, so each
+        rectangle is given that many cells, and the ones past its edges (or
+        the window) are masked out.
+
+        Parameter plane: one channel of a grid
+        Precondition: plane is a uint8 array of shape getShape()[1:]
+
+        Parameter xs: the x-coordinates of the rectangle centers
+        Precondition: xs is a float array
+
+        Parameter ys: the y-coordinates of the rectangle centers
+        Precondition: ys is a float array of the same length as xs
+
+        Parameter width: the width of each rectangle
+        Precondition: width is a number > 0
+
+        Parameter height: the height of each rectangle
+        Precondition: height is a number > 0
+        """
+        if len(xs) == 0:
+            return
+        rows, cols = plane.shape
+        left = np.maximum((xs - width/2)//self._cell, 0).astype(int)
+        right = np.minimum((xs + width/2)//self._cell + 1, cols).astype(int)
+        top = np.maximum((GAME_HEIGHT - ys - height/2)//self._cell, 0).astype(int)
+        bottom = np.minimum((GAME_HEIGHT - ys + height/2)//self._cell + 1, rows).astype(int)
+
+        across = left[:, None] + np.arange(int(width//self._cell) + 2)
+        down = top[:, None] + np.arange(int(height//self._cell) + 2)
+        inside = ((down < bottom[:, None])[:, :, None] &
+                  (across < right[:, None])[:, None, :])
+        down, across = np.broadcast_arrays(down[:, :, None], across[:, None, :])
+        plane[down[inside], across[inside]] = self.GRID_ON
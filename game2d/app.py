@@ -16,6 +16,8 @@ from kivy.config import Config
 from kivy.clock  import Clock
 
 import os.path
+from . import backend
+from .resources import Resources
 
 class GameApp(kivy.app.App):
     """
@@ -35,9 +37,31 @@ class GameApp(kivy.app.App):
     
     :meth:`draw`: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to ``self.view.draw()``.
+    
+    With the null backend (see :mod:`backend`), the game does not open a window.  It
+    runs in a plain loop, calling :meth:`update` and :meth:`draw` with a fixed time
+    step of 1/``fps`` seconds as fast as it can, until :meth:`stop` is called or it 
+    has run for ``frames`` frames.
+    
+    By default, :meth:`update` is called once per animation frame with the time since
+    the last frame.  If ``tickrate`` is set, the game uses a fixed time step instead.
+    The time of each frame is added to an accumulator, and :meth:`update` is called
+    with a time of exactly 1/``tickrate`` seconds as many times as the accumulator 
+    allows.  A frame longer than ``MAX_LAG`` seconds only counts as ``MAX_LAG``, so a
+    hitch does not cause a burst of updates.  The time left in the accumulator is 
+    available to :meth:`draw` as the attribute ``alpha``, for drawing objects between
+    their last two positions.
+    
+    To fast-forward the game, set ``turbo`` to a value K > 1.  Every animation frame 
+    then runs K frames worth of updates, but :meth:`draw` is still only called once.
+    
+    Each game has its own :class:`Resources` context for its images, sounds and fonts
+    (see :mod:`resources`), which is current while the game starts, updates and draws.
+    Hence several games may share a process (with the null backend), even if their 
+    assets are in different folders.
     """
-    # Class attribute for tracking textures (to reduce memory footprint)
-    TEXTURE_CACHE = {}
+    # The longest frame (in seconds) the fixed time step catches up on
+    MAX_LAG = 0.25
     
     
     # MUTABLE ATTRIBUTES
@@ -58,12 +82,72 @@ class GameApp(kivy.app.App):
     def fps(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         assert value > 0, 'value %s is not positive' % repr(value)
-        Clock.unschedule(self._refresh)
         self._fps = value
-        Clock.schedule_interval(self._refresh,1.0/self._fps)
+        if not backend.is_null():
+            Clock.unschedule(self._refresh)
+            Clock.schedule_interval(self._refresh,1.0/self._fps)
+    
+    
+    @property
+    def tickrate(self):
+        """
+        The number of updates per second with a fixed time step, or None
+        
+        If this value is None (the default), :meth:`update` is called once every 
+        animation frame, with the time since the last frame.  Otherwise, it is called
+        with a fixed time step of 1/``tickrate`` seconds, as often as needed to keep
+        up with the clock.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._tickrate
+    
+    @tickrate.setter
+    def tickrate(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._tickrate = value
+        self._lag = 0.0
+        self._alpha = 1.0
+    
+    
+    @property
+    def turbo(self):
+        """
+        The number of frames worth of updates to run per animation frame.
+        
+        By default this value is 1.  If it is K > 1, every animation frame calls 
+        :meth:`update` K times (or, with a fixed time step, K times as many steps),
+        and only draws the result of the last one.  Hence the game runs K times 
+        faster than it is shown, without drawing the frames nobody sees.
+        
+        **Invariant**: Must be an int >= 1.
+        """
+        return self._turbo
+    
+    @turbo.setter
+    def turbo(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value >= 1, 'value %s is not positive' % repr(value)
+        self._turbo = value
     
     
     # IMMUTABLE PROPERTIES
+    @property
+    def alpha(self):
+        """
+        How far the current frame is between the last update and the next one.
+        
+        This value is only meaningful with a fixed time step (see ``tickrate``).  It
+        is the time left over after the last update, as a fraction of the time step.
+        To draw an object smoothly, draw it at ``prev + alpha*(curr-prev)``, where 
+        ``prev`` and ``curr`` are its positions before and after the last update.  
+        Without a fixed time step, this value is always 1.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        return self._alpha
+    
     @property
     def width(self):
         """
@@ -106,13 +190,27 @@ class GameApp(kivy.app.App):
         """
         return self._input
     
+    @property
+    def resources(self):
+        """
+        The resource context of this game.
+        
+        The context holds the **Images**, **Sounds** and **Fonts** folders of the game,
+        and the textures loaded from them.  See the class :class:`Resources` for more 
+        information.
+        
+        **Invariant**: Must be instance of :class:`Resources`
+        """
+        return self._resources
+    
     # CLASS METHODS
     @classmethod
     def is_image(cls,name):
         """
         Checks if ``name`` refers to an image file
     
-        The method searches the **Images** folder for the given file name.
+        The method searches the **Images** folder of the current resource context (see
+        :meth:`Resources.current`) for the given file name.
     
         :param name: The file name
         :type name:  ``str``
@@ -120,17 +218,15 @@ class GameApp(kivy.app.App):
         :return: True if ``name`` refers to an image file; False otherwise
         :rtype:  ``bool``
         """
-        if type(name) != str:
-            return False
-    
-        return os.path.exists(cls.images+'/'+name)
+        return not Resources.current().find_image(name) is None
     
     @classmethod
     def is_font(cls,name):
         """
         Checks if ``name`` refers to a font file
         
-        The method searches the **Fonts** folder for the given file name.
+        The method searches the **Fonts** folder of the current resource context (see
+        :meth:`Resources.current`) for the given file name.
         
         :param name: The file name
         :type name:  ``str``
@@ -138,17 +234,15 @@ class GameApp(kivy.app.App):
         :return: True if ``name`` refers to a font file; False otherwise
         :rtype:  ``bool``
         """
-        if type(name) != str:
-            return False
-        
-        return os.path.exists(cls.fonts+'/'+name)
+        return not Resources.current().find_font(name) is None
     
     @classmethod
     def is_sound(cls,name):
         """
         Checks if ``name`` refers to a sound file
         
-        The method searches the **Sounds** folder for the given file name.
+        The method searches the **Sounds** folder of the current resource context (see
+        :meth:`Resources.current`) for the given file name.
         
         :param name: The file name
         :type name:  ``str``
@@ -156,19 +250,18 @@ class GameApp(kivy.app.App):
         :return: True if ``name`` refers to a sound file; False otherwise
         :rtype:  ``bool``
         """
-        if type(name) != str:
-            return False
-        
-        return os.path.exists(os.path.join(cls.sounds,name))
+        return not Resources.current().find_sound(name) is None
     
     @classmethod
     def load_texture(cls,name):
         """
         Returns: The texture for the given file name, or None if it cannot be loaded
         
-        The ``name`` must refer to the file in the **Images** folder.  If the texture
-        has already been loaded, it will return the cached texture.  Otherwise, it will
-        load the texture and cache it before returning it.
+        The ``name`` must refer to the file in the **Images** folder of the current
+        resource context.  If the texture has already been loaded in that context, it 
+        will return the cached texture.  Otherwise, it will load the texture and cache 
+        it before returning it.  With the null backend, no texture is loaded and this 
+        method returns None.
         
         This method will crash if name is not a valid file.
         
@@ -176,37 +269,22 @@ class GameApp(kivy.app.App):
         :type name:  ``str``
         """
         assert cls.is_image(name), '%s is not an image file' % repr(name)
-        if name in cls.TEXTURE_CACHE:
-            return cls.TEXTURE_CACHE[name]
-        
-        try:
-            from kivy.core.image import Image
-            texture = Image(name).texture
-            cls.TEXTURE_CACHE[name] = texture
-        except:
-            texture = None
-        
-        return texture
+        return Resources.current().load_texture(name)
     
     @classmethod
     def unload_texture(cls,name):
         """
         Returns: The texture for the given file name, or None if it does not exist
         
-        The ``name`` should refer to the file in in the texture cache.  If the texture
-        is in the cache, it will return the cached texture before removing it.  Otherwise, 
-        it will returning None.
+        The ``name`` should refer to the file in in the texture cache of the current
+        resource context.  If the texture is in the cache, it will return the cached 
+        texture before removing it.  Otherwise, it will returning None.
         
         :param name: The file name
         :type name:  ``str``
         """
         assert type(name) == str, '%s is not a valid texture name' % repr(name)
-        if name in cls.TEXTURE_CACHE:
-            texture = cls.TEXTURE_CACHE[name]
-            del cls.TEXTURE_CACHE[name]
-            return texture
-        
-        return None
+        return Resources.current().unload_texture(name)
     
     # BUILT-IN METHODS
     def __init__(self,**keywords):
@@ -226,25 +304,42 @@ class GameApp(kivy.app.App):
         **You will never call the constructor or run yourself**.  That is handled for 
         you in the provided code.
         
+        The keyword ``tickrate`` turns on the fixed time step (see ``tickrate``), and 
+        the keyword ``turbo`` sets the number of updates per frame (see ``turbo``).  The
+        keyword ``frames`` limits the number of frames the game runs with the null
+        backend.  It is ignored by the Kivy backend.  The keyword ``root`` is the folder
+        holding the **Images**, **Sounds** and **Fonts** folders of the game.  By 
+        default, it is the folder holding the game class.
+        
         :param keywords: dictionary of keyword arguments 
         :type keywords:  keys are attribute names
         """
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        n = keywords.pop('frames', None)
+        t = keywords.pop('tickrate', None)
+        k = keywords.pop('turbo', 1)
+        r = keywords.pop('root', None)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
         assert type(f) in [int,float], 'fps %s is not a number' % repr(f)
         assert f > 0, 'fps %s is not positive' % repr(value)
+        assert n is None or (type(n) == int and n >= 0), 'frames %s is not valid' % repr(n)
+        assert r is None or type(r) == str, 'root %s is not a path' % repr(r)
 
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self._frames = n
+        self.tickrate = t
+        self.turbo = k
+        self._running = False
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
-        self._setpaths()
+        self._setpaths(r)
         
         # Tell Kivy to build the application
         kivy.app.App.__init__(self,**keywords)
@@ -262,7 +357,8 @@ class GameApp(kivy.app.App):
         self._view = GView()
         self._view.size_hint = (1,1)
         self._input = GInput()
-        self._input._register(self._view)
+        if not backend.is_null():
+            self._input._register(self._view)
         return self.view
     
     def run(self):
@@ -272,6 +368,10 @@ class GameApp(kivy.app.App):
         This is a Kivy reserved method.  It is part of the Kivy application process.  
         It should **never** be overridden.
         """
+        if backend.is_null():
+            self._loop()
+            return
+        
         Clock.schedule_once(self._bootstrap,-1)
         kivy.app.App.run(self)
     
@@ -281,7 +381,13 @@ class GameApp(kivy.app.App):
         
         This is a Kivy reserved method.  It is part of the Kivy application process.  
         It should **never** be overridden.
+        
+        With the null backend, this only ends the loop started by ``run()``.
         """
+        if backend.is_null():
+            self._running = False
+            return
+        
         import sys
         kivy.app.App.stop(self)
         sys.exit(0)
@@ -337,40 +443,66 @@ class GameApp(kivy.app.App):
             Clock.schedule_interval(self._refresh,1.0/self.fps)
         else:
             Clock.schedule_interval(self._refresh,0)
-        self.start()
+        with self._resources:
+            self.start()
+    
+    def _loop(self):
+        """
+        Runs the game without a window, for the null backend.
+        
+        The game is updated and drawn with a fixed time step of 1/``fps`` seconds, 
+        until :meth:`stop` is called or it has run for ``frames`` frames.  Then the
+        event ``on_stop`` is dispatched, as Kivy does when a window closes.
+        """
+        self.build()
+        self._running = True
+        with self._resources:
+            self.start()
+        
+        dt = 1.0/self.fps
+        count = 0
+        while self._running and (self._frames is None or count < self._frames):
+            self._refresh(dt)
+            count += 1
+        self._running = False
+        self.dispatch('on_stop')
     
     def _refresh(self,dt):
         """
         Processes a single animation frame.
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
-        important issues behind the scenes, particularly with clearing the window.
+        important issues behind the scenes, particularly with clearing the window and
+        the fixed time step.
         
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
-        self.view.clear()
-        self.update(dt)
-        self.draw()
-    
-    def _setpaths(self):
-        """
-        Sets the resource paths to the application directory.
-        """
-        # This prevents us from running two game simultaneously
-        # But kivy already prevents this from happening
-        import os, sys
-        import inspect
-        
-        path = os.path.abspath(inspect.getfile(self.__class__))
-        path = os.path.dirname(path)
-        
-        GameApp.fonts  = str(os.path.join(path, 'Fonts'))
-        GameApp.sounds = str(os.path.join(path, 'Sounds'))
-        GameApp.images = str(os.path.join(path, 'Images'))
-        
-        import kivy.resources
-        kivy.resources.resource_add_path(GameApp.fonts)
-        kivy.resources.resource_add_path(GameApp.sounds)
-        kivy.resources.resource_add_path(GameApp.images)
-
+        with self._resources:
+            self.view.clear()
+            if self._tickrate is None:
+                for x in range(self._turbo):
+                    self.update(dt)
+            else:
+                step = 1.0/self._tickrate
+                self._lag += min(dt,self.MAX_LAG)*self._turbo
+                while self._lag >= step:
+                    self.update(step)
+                    self._lag -= step
+                self._alpha = self._lag/step
+            self.draw()
+            self.view._present()
+    
+    def _setpaths(self,root=None):
+        """
+        Sets the resource context of this game.
+        
+        :param root: The folder holding the game assets, or None for the folder 
+            holding the game class
+        :type root:  ``str`` or ``None``
+        """
+        if root is None:
+            import inspect
+            root = os.path.dirname(os.path.abspath(inspect.getfile(self.__class__)))
+        
+        self._resources = Resources.for_root(root)
@@ -0,0 +1,375 @@
+"""
+The graphics backend for 2D game support.
+
+By default, the drawables in this package build Kivy graphics instructions, and
+images and sounds are loaded with Kivy.  For tests and batch jobs, there is also a
+*null* backend.  With the null backend, every drawable keeps its geometry and other
+properties, but the instructions it builds are plain Python objects that are never
+sent to the graphics card, no textures are loaded, and sounds are silent.  A
+:class:`GameApp` then runs in a plain loop without opening a window.
+
+The backend is chosen once, when the package is first imported, from the
+environment variable ``GAME2D_BACKEND``.  It may be either 'kivy' (the default) or
+'null'.  For example, to run a game with the null backend from the command line::
+
+    GAME2D_BACKEND=null python invaders
+
+Kivy must still be installed to use the null backend, as :class:`GameApp` is a
+Kivy application.
+
+Author: agent
+Date:   October 18, 2026
+"""
+import os
+
+#: The supported backends
+BACKENDS = ('kivy', 'null')
+
+#: The name of the active backend
+NAME = os.environ.get('GAME2D_BACKEND', 'kivy').strip().lower() or 'kivy'
+
+if not NAME in BACKENDS:
+    raise ValueError('GAME2D_BACKEND %s is not one of %s' % (repr(NAME), repr(BACKENDS)))
+
+
+def is_null():
+    """
+    Checks whether the null backend is active.
+
+    :return: True if the drawables do not build real graphics instructions
+    :rtype:  ``bool``
+    """
+    return NAME == 'null'
+
+
+if NAME == 'kivy':
+    from kivy.graphics import Color, Translate, Rotate, Scale, PushMatrix, PopMatrix
+    from kivy.graphics import Rectangle, Ellipse, Line, Mesh, Triangle
+    from kivy.graphics.instructions import InstructionGroup
+    from kivy.uix.label import Label
+
+else:
+    class NullInstruction(object):
+        """
+        A graphics instruction that is never drawn.
+
+        The keyword arguments of the constructor become attributes, so that code
+        that reads back the settings of an instruction (such as a texture) still works.
+        """
+
+        def __init__(self,*args,**keywords):
+            """
+            Creates a new instruction that stores its keywords.
+
+            :param keywords: dictionary of keyword arguments
+            :type keywords:  keys are attribute names
+            """
+            self.__dict__.update(keywords)
+
+
+    class InstructionGroup(NullInstruction):
+        """
+        A group of instructions that is never drawn.
+
+        As nothing is drawn, the group does not keep its instructions.
+        """
+
+        def add(self,cmd):
+            """
+            Ignores an instruction.
+
+            :param cmd: the instruction to add
+            :type cmd:  any instruction
+            """
+            pass
+
+        def insert(self,pos,cmd):
+            """
+            Ignores an instruction.
+
+            :param pos: the position to insert at
+            :type pos:  ``int``
+
+            :param cmd: the instruction to insert
+            :type cmd:  any instruction
+            """
+            pass
+
+        def remove(self,cmd):
+            """
+            Ignores an instruction.
+
+            :param cmd: the instruction to remove
+            :type cmd:  any instruction
+            """
+            pass
+
+        def clear(self):
+            """
+            Does nothing, as the group is always empty.
+            """
+            pass
+
+
+    class Translate(NullInstruction):
+        """
+        A translation that is never applied.
+        """
+
+        def __init__(self,x=0,y=0,z=0):
+            """
+            Creates a new translation by (x,y,z).
+            """
+            self.x = x
+            self.y = y
+            self.z = z
+
+
+    class Scale(Translate):
+        """
+        A scaling that is never applied.
+        """
+        pass
+
+
+    class Rotate(NullInstruction):
+        """
+        A rotation that is never applied.
+        """
+
+        def __init__(self,angle=0,axis=(0,0,1)):
+            """
+            Creates a new rotation by angle degrees about axis.
+            """
+            self.angle = angle
+            self.axis = axis
+
+
+    class Color(NullInstruction):
+        """
+        A color that is never applied.
+        """
+
+        def __init__(self,*rgba):
+            """
+            Creates a new color from 3 or 4 components in the range 0..1.
+            """
+            self.rgba = tuple(rgba) if len(rgba) == 4 else tuple(rgba)+(1,)
+
+
+    class PushMatrix(NullInstruction):
+        """
+        A matrix push that is never applied.
+        """
+        pass
+
+
+    class PopMatrix(NullInstruction):
+        """
+        A matrix pop that is never applied.
+        """
+        pass
+
+
+    class Rectangle(NullInstruction):
+        """
+        A rectangle that is never drawn.
+        """
+        pass
+
+
+    class Ellipse(NullInstruction):
+        """
+        An ellipse that is never drawn.
+        """
+        pass
+
+
+    class Line(NullInstruction):
+        """
+        A line that is never drawn.
+        """
+        pass
+
+
+    class Mesh(NullInstruction):
+        """
+        A mesh that is never drawn.
+        """
+        pass
+
+
+    class Triangle(NullInstruction):
+        """
+        A triangle that is never drawn.
+        """
+        pass
+
+
+    class Label(NullInstruction):
+        """
+        A text label that is never rendered.
+
+        As the text is not rendered, the size of the label is only an estimate from
+        the number of lines and the length of the longest line.
+        """
+        # The font size used by Kivy if none is given
+        FONT_SIZE = 15
+
+        def __init__(self,**keywords):
+            """
+            Creates a new label.
+
+            :param keywords: dictionary of keyword arguments
+            :type keywords:  keys are attribute names
+            """
+            self.text = ''
+            self.font_size = self.FONT_SIZE
+            self.font_name = None
+            self.bold = False
+            self.color = (1,1,1,1)
+            self.x = 0
+            self.y = 0
+            NullInstruction.__init__(self,**keywords)
+            self.canvas = InstructionGroup()
+            self.texture_update()
+            self.size = self.texture_size
+
+        @property
+        def size(self):
+            """
+            The size of this label as a (width,height) pair.
+            """
+            return (self.width, self.height)
+
+        @size.setter
+        def size(self,value):
+            self.width = value[0]
+            self.height = value[1]
+
+        @property
+        def center(self):
+            """
+            The center of this label as an (x,y) pair.
+            """
+            return (self.x+self.width/2.0, self.y+self.height/2.0)
+
+        @center.setter
+        def center(self,value):
+            self.x = value[0]-self.width/2.0
+            self.y = value[1]-self.height/2.0
+
+        @property
+        def right(self):
+            """
+            The right edge of this label.
+            """
+            return self.x+self.width
+
+        @right.setter
+        def right(self,value):
+            self.x = value-self.width
+
+        @property
+        def top(self):
+            """
+            The top edge of this label.
+            """
+            return self.y+self.height
+
+        @top.setter
+        def top(self,value):
+            self.y = value-self.height
+
+        @property
+        def bottom(self):
+            """
+            The bottom edge of this label.
+            """
+            return self.y
+
+        @bottom.setter
+        def bottom(self,value):
+            self.y = value
+
+        def texture_update(self):
+            """
+            Estimates the size of the text.
+            """
+            size = self.font_size if type(self.font_size) in [int,float] else self.FONT_SIZE
+            lines = str(self.text).split('\n')
+            self.texture_size = (0.6*size*max(len(line) for line in lines),
+                                 1.2*size*len(lines))
+
+        def bind(self,**keywords):
+            """
+            Ignores a callback, as the text is never rendered.
+            """
+            pass
+
+
+    class NullSound(object):
+        """
+        A sound that is never played.
+        """
+
+        def __init__(self):
+            """
+            Creates a new silent sound.
+            """
+            self.volume = 1
+            self.loop = False
+            self.state = 'stop'
+
+        def play(self):
+            """
+            Does nothing, as the sound is silent.
+            """
+            pass
+
+        def stop(self):
+            """
+            Does nothing, as the sound is silent.
+            """
+            pass
+
+
+def load_texture(name):
+    """
+    Loads the texture for an image file.
+
+    With the null backend, no texture is loaded.
+
+    :param name: The image file name
+    :type name:  ``str``
+
+    :return: The texture for the file, or None if it cannot (or should not) be loaded
+    :rtype:  ``kivy.graphics.texture.Texture`` or ``None``
+    """
+    if is_null():
+        return None
+
+    try:
+        from kivy.core.image import Image
+        return Image(name).texture
+    except:
+        return None
+
+
+def load_sound(name):
+    """
+    Loads the sound in a sound file.
+
+    With the null backend, the file is not read and the sound is silent.
+
+    :param name: The sound file name
+    :type name:  ``str``
+
+    :return: The sound for the file, or None if it cannot be loaded
+    :rtype:  ``kivy.core.audio.Sound`` or ``None``
+    """
+    if is_null():
+        return NullSound()
+
+    from kivy.core.audio import SoundLoader
+    return SoundLoader.load(name)
@@ -8,8 +8,8 @@ These classes will not work unless you adhere to proper subclassing practices.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
+from .backend import Color, Translate, Rotate, Scale, PushMatrix, PopMatrix
+from .backend import InstructionGroup
 from introcs.geom import Point2, Matrix
 
 def is_color(c):
@@ -71,7 +71,7 @@ def is_gobject_list(g):
     """
     try:
         from functools import reduce
-        return len(g) >= 0 and reduce(lambda x, y: x and y, map(lambda z: isinstance(z,GObject), g))
+        return len(g) >= 0 and reduce(lambda x, y: x and y, map(lambda z: isinstance(z,GObject), g), True)
     except:
         return False
 
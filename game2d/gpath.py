@@ -8,8 +8,7 @@ Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
 # Lower-level kivy modules to support animation
-from kivy.graphics import *
-from kivy.graphics.instructions import *
+from .backend import Color, PopMatrix, Line, Mesh
 from .gobject import GObject
 
 
@@ -8,10 +8,7 @@ to draw shapes.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from kivy.uix.label import Label
-from kivy.uix.image import Image
+from .backend import Color, PopMatrix, Rectangle, Ellipse, Line, Label
 from .gobject import GObject, is_num_tuple
 from .app import GameApp
 
@@ -319,14 +316,19 @@ class GLabel(GRectangle):
         """
         The file name for the .ttf file to use as a font
         
+        The file is looked up in the **Fonts** folder of the current resource context
+        (see :mod:`resources`) when this attribute is set.
+        
         **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
-        return self._label.font_name
+        return self._fname if not self._fname is None else self._label.font_name
     
     @font_name.setter
     def font_name(self,value):
         from .app import GameApp
+        from .resources import Resources
         assert GameApp.is_font(value), 'value %s is not a font name' % repr(value)
-        self._label.font_name = value
+        self._fname = value
+        self._label.font_name = Resources.current().find_font(value)
         self._label.texture_update()
     
     @property
@@ -594,14 +596,19 @@ class GLabel(GRectangle):
         self._hanchor = 'center'
         self._vanchor = 'center'
         
+        self._fname = None
+        
         sanitized = {}
-        excludes  = ['linewidth','linecolor','fillcolor','halign','valign','left','bottom']
+        excludes  = ['linewidth','linecolor','fillcolor','halign','valign','left','bottom',
+                     'font_name']
         for key in keywords:
             if not key in excludes:
                 sanitized[key] = keywords[key]
         
         self._label = Label(**sanitized)
         self._label.size_hint = (None,None)
+        if 'font_name' in keywords:
+            self.font_name = keywords['font_name']
         
         self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
         self.halign = keywords['halign'] if 'halign' in keywords else 'center'
@@ -9,8 +9,8 @@ by changing the current frame.
 Author: Walker M. White (wmw2)
 Date:   November 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
+from . import backend
+from .backend import Color, PopMatrix, Rectangle, Line
 from .grectangle import GRectangle, GObject
 from .app import GameApp
 
@@ -142,7 +142,7 @@ class GSprite(GRectangle):
                     self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
                     tx += width
                 ty += width
-        else:
+        elif not backend.is_null():
             print('Failed to load',repr(self.source))
         
         self._texture = self._images[self._frame]
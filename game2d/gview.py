@@ -15,6 +15,7 @@ from kivy.uix.floatlayout import FloatLayout
 from kivy.metrics import dp
 
 from introcs.geom import Point2
+from . import backend
 
 
 class GInput(object):
@@ -319,6 +320,14 @@ class GView(FloatLayout):
     :class:`GObject` instances to the :meth:`draw` method.  You must do this every
     animation frame, as the game is constantly clearing the window.
 
+    By default, the view is *retained*.  The commands drawn in a frame are not sent to
+    the canvas right away.  At the end of the frame, they are compared with those of the
+    last frame: commands drawn in both frames stay attached, commands no longer drawn
+    are removed, and new commands are inserted in the order they were drawn.  Hence the
+    canvas is not rebuilt every frame, and the cost of a frame depends on what changed
+    rather than on how many objects there are.  The result on screen is the same as
+    clearing the window and drawing everything again.
+
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
@@ -336,11 +345,41 @@ class GView(FloatLayout):
         :class:`GameApp`. See the documentation of that class for more information.
         """
         FloatLayout.__init__(self)
-        self._frame = InstructionGroup()
+        self._frame = backend.InstructionGroup()
         self.bind(pos=self._reset)
         self.bind(size=self._reset)
         self._reset()
         self._contents = set()
+        self._drawn = []
+        self._shown = []
+        self._showing = set()
+        self._retained = True
+
+
+    # MUTABLE ATTRIBUTES
+    @property
+    def retained(self):
+        """
+        Whether the view keeps its commands attached from one frame to the next.
+
+        If this value is False, the view is cleared at the start of every frame, and
+        each command is added to the canvas as it is drawn.  Changing this value clears
+        the view, so it should be set in ``start`` or ``update``, not in ``draw``.  The
+        value is True by default.
+
+        **Invariant**: Must be a bool
+        """
+        return self._retained
+
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+        self._frame.clear()
+        self._contents.clear()
+        self._drawn = []
+        self._shown = []
+        self._showing.clear()
 
 
     # PUBLIC METHODS
@@ -355,24 +394,73 @@ class GView(FloatLayout):
         :type cmd:  A Kivy graphics command
         """
         if not cmd in self._contents:
-            self._frame.add(cmd)
             self._contents.add(cmd)
+            if self._retained:
+                self._drawn.append(cmd)
+            else:
+                self._frame.add(cmd)
 
     def clear(self):
         """
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  If the
+        view is retained, the canvas is not touched until the end of the frame.
         """
-        self._frame.clear()
         self._contents.clear()
+        if self._retained:
+            self._drawn = []
+        else:
+            self._frame.clear()
 
     # HIDDEN METHODS
+    def _present(self):
+        """
+        Applies the commands drawn this frame to the canvas, if the view is retained.
+
+        This method is called for you automatically at the end of the animation frame.
+        Commands drawn in the last frame and again in this one stay attached.  The
+        others are removed, and the new ones are inserted where they were drawn.  If
+        the commands kept by both frames were drawn in a different order, the frame is
+        rebuilt from scratch instead.
+        """
+        if not self._retained:
+            return
+
+        drawn = self._drawn
+        shown = self._shown
+        if drawn != shown:
+            old = self._showing
+            new = self._contents
+            kept = [cmd for cmd in shown if cmd in new]
+            if kept == [cmd for cmd in drawn if cmd in old]:
+                for cmd in shown:
+                    if not cmd in new:
+                        self._frame.remove(cmd)
+                for (pos,cmd) in enumerate(drawn):
+                    if not cmd in old:
+                        self._frame.insert(pos,cmd)
+            else:
+                self._frame.clear()
+                for cmd in drawn:
+                    self._frame.add(cmd)
+
+        # The commands of this frame become the ones shown
+        self._shown = drawn
+        self._drawn = []
+        self._showing, self._contents = self._contents, self._showing
+        self._contents.clear()
+
     def _reset(self,obj=None,value=None):
         """
         Resets the view canvas in response to a resizing event
+        
+        With the null backend, nothing is ever added to the canvas.
         """
+        if backend.is_null():
+            return
+        
         self.canvas.clear()
         self.canvas.add(Color(1,1,1))
         self.canvas.add(Rectangle(pos=self.pos,size=self.size))
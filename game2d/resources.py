@@ -0,0 +1,248 @@
+"""
+Resource contexts for 2D game support.
+
+A game finds its images, sounds and fonts in the folders **Images**, **Sounds** and
+**Fonts** of its asset root (by default, the folder holding the game class).  The
+class :class:`Resources` holds these folders and the textures loaded from them.  Every
+:class:`GameApp` has its own context, so several games with different asset roots can
+run in one process.  Games with the same asset root share one context, and hence one
+texture cache, as the files they read are the same.
+
+Drawables and sounds do not know which game they belong to.  Instead, they use the
+*current* context of the thread.  A game makes its context current while it starts,
+updates and draws, so objects created or drawn by a game use its assets.  Outside of
+a game, there is no current context; code that loads assets there must make a context
+current itself, with a ``with`` block.
+
+File names are resolved to full paths by the context, so the Kivy resource paths (which
+are global to the process) are never changed.
+
+Author: agent
+Date:   October 18, 2026
+"""
+import os.path
+import threading
+from . import backend
+
+
+class Resources(object):
+    """
+    The asset folders and texture cache of a game.
+
+    Contexts are shared, so you should get one with :meth:`for_root` instead of the
+    constructor.  To make a context current for a block of code, use it in a ``with``
+    statement::
+
+        with Resources.for_root(path):
+            image = GImage(source='ship.png')
+
+    Contexts may be nested; the previous context is current again at the end of the
+    block.
+    """
+    # The shared contexts, by asset root
+    _shared = {}
+
+    # The stack of current contexts of each thread
+    _local = threading.local()
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def root(self):
+        """
+        The asset root (the folder holding **Images**, **Sounds** and **Fonts**)
+
+        **Invariant**: Must be an absolute path (a ``str``).
+        """
+        return self._root
+
+    @property
+    def images(self):
+        """
+        The folder with the image files
+
+        **Invariant**: Must be an absolute path (a ``str``).
+        """
+        return self._images
+
+    @property
+    def sounds(self):
+        """
+        The folder with the sound files
+
+        **Invariant**: Must be an absolute path (a ``str``).
+        """
+        return self._sounds
+
+    @property
+    def fonts(self):
+        """
+        The folder with the font files
+
+        **Invariant**: Must be an absolute path (a ``str``).
+        """
+        return self._fonts
+
+    # CLASS METHODS
+    @classmethod
+    def for_root(cls,root):
+        """
+        Returns the context for the asset root ``root``, making it if necessary.
+
+        :param root: The folder holding **Images**, **Sounds** and **Fonts**
+        :type root:  ``str``
+
+        :return: The shared context for ``root``
+        :rtype:  :class:`Resources`
+        """
+        assert type(root) == str, '%s is not a valid path' % repr(root)
+        root = os.path.normcase(os.path.abspath(root))
+        if not root in cls._shared:
+            cls._shared[root] = cls(root)
+        return cls._shared[root]
+
+    @classmethod
+    def current(cls):
+        """
+        Returns the current context of this thread.
+
+        This is the context of the innermost ``with`` block.  Contexts are never shared
+        between threads, so a thread that did not enter a ``with`` block has no current
+        context.
+
+        :raise RuntimeError: if this thread is not in the ``with`` block of a context
+
+        :return: The current context
+        :rtype:  :class:`Resources`
+        """
+        stack = getattr(cls._local,'stack',None)
+        if not stack:
+            raise RuntimeError('There is no current resource context; make one current '
+                               'with a with block or load assets from inside a game')
+        return stack[-1]
+
+    # BUILT-IN METHODS
+    def __init__(self,root):
+        """
+        Creates a new context for the asset root ``root``.
+
+        You should use :meth:`for_root` instead, so that contexts are shared.
+
+        :param root: The folder holding **Images**, **Sounds** and **Fonts**
+        :type root:  ``str``
+        """
+        self._root = root
+        self._images = str(os.path.join(root, 'Images'))
+        self._sounds = str(os.path.join(root, 'Sounds'))
+        self._fonts  = str(os.path.join(root, 'Fonts'))
+        self._textures = {}
+
+    def __enter__(self):
+        """
+        Makes this context current until the end of the ``with`` block.
+        """
+        stack = getattr(Resources._local,'stack',None)
+        if stack is None:
+            stack = []
+            Resources._local.stack = stack
+        stack.append(self)
+        return self
+
+    def __exit__(self,*exc):
+        """
+        Restores the context that was current before the ``with`` block.
+        """
+        Resources._local.stack.pop()
+        return False
+
+    def __repr__(self):
+        """
+        :return: An unambiguous representation of this context
+        :rtype:  ``str``
+        """
+        return '%s(%s)' % (self.__class__.__name__, repr(self._root))
+
+    # PUBLIC METHODS
+    def find_image(self,name):
+        """
+        Returns the full path of the image file ``name``, or None if there is none.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :rtype:  ``str`` or ``None``
+        """
+        return self._find(self._images,name)
+
+    def find_sound(self,name):
+        """
+        Returns the full path of the sound file ``name``, or None if there is none.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :rtype:  ``str`` or ``None``
+        """
+        return self._find(self._sounds,name)
+
+    def find_font(self,name):
+        """
+        Returns the full path of the font file ``name``, or None if there is none.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :rtype:  ``str`` or ``None``
+        """
+        return self._find(self._fonts,name)
+
+    def load_texture(self,name):
+        """
+        Returns: The texture for the image file ``name``, or None if it cannot be loaded
+
+        If the texture has already been loaded, it will return the cached texture.
+        Otherwise, it will load the texture and cache it before returning it.  With the
+        null backend, no texture is loaded and this method returns None.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        if name in self._textures:
+            return self._textures[name]
+
+        path = self.find_image(name)
+        texture = None if path is None else backend.load_texture(path)
+        if not texture is None:
+            self._textures[name] = texture
+
+        return texture
+
+    def unload_texture(self,name):
+        """
+        Returns: The texture for the image file ``name``, or None if it is not cached
+
+        If the texture is in the cache, it will return the cached texture before
+        removing it.  Otherwise, it will returning None.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        return self._textures.pop(name,None)
+
+    # HIDDEN METHODS
+    def _find(self,folder,name):
+        """
+        Returns the full path of the file ``name`` in ``folder``, or None if there is none.
+
+        :param folder: The folder to search
+        :type folder:  ``str``
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :rtype:  ``str`` or ``None``
+        """
+        if type(name) != str:
+            return None
+
+        path = os.path.join(folder,name)
+        return path if os.path.exists(path) else None
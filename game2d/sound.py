@@ -6,8 +6,9 @@ This classes wrap the Kivy audio interface, making it simpler for students to us
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.core.audio import SoundLoader
+from . import backend
 from .app import GameApp
+from .resources import Resources
 
 
 class Sound(object):
@@ -18,10 +19,13 @@ class Sound(object):
     While some platforms may support MP3s, we can only guarantee that WAVs work on all 
     platforms. In order for Kivy to find a WAV or MP3 file, you should put it in the
     **Sounds** directory.  Sounds in that folder can be referenced directly by name.
+    The folder is that of the current resource context (see :mod:`resources`).
     
     When a sound is played, it cannot be played again until it finishes, or is stopped.  
     This means that if you want multiple, simultaneous sound effects from the same WAV 
     file.you will need to create multiple Sound objects.
+    
+    With the null backend (see :mod:`backend`), sounds are silent.
     """
     # This class is a simply replacement for the built-in Kivy Sound class.  It is a
     # little better with error handling, since GStreamer appears to be quite unreliable.
@@ -78,7 +82,7 @@ class Sound(object):
         from .app import GameApp
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
         self._source = source
-        self._sound  = SoundLoader.load(source)
+        self._sound  = backend.load_sound(Resources.current().find_sound(source))
         if self._sound is None:
             raise IOError('Module game2d cannot read the file %s' % repr(source))
     
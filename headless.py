@@ -0,0 +1,189 @@
+"""
+Headless driver for Alien Invaders
+
+This module plays waves of Alien Invaders without a window.  The waves are
+made with headless=True, so they make no images and play no sounds, and
+they are updated from a plain Python loop with a fixed dt.  The input comes
+from an object that holds down a fixed set of keys.  This is useful for load
+tests, bots and running the game on a server without a display.
+
+To play a wave from the command line, type
+
+    python headless.py --frames 5000 --seed 7 --keys up,left
+
+The plain arguments are still read by consts.py (rows, aliens in a row and
+alien speed), as long as they come before the options, so
+
+    python headless.py 3 4 0.5 --frames 5000
+
+plays a wave with 3 rows of 4 aliens.  With the option --games, the driver
+plays that many waves at once with a WaveBatch (see the module wavebatch).
+
+Author: agent
+Date: October 18, 2026
+"""
+import os
+# Kivy reads the command line when it is imported; these options are ours
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from consts import *
+from wave import Wave
+from wavebatch import WaveBatch
+import argparse
+import time
+
+
+class StubInput(object):
+    """
+    An input object that holds down a fixed set of keys.
+
+    This class has the method is_key_down of GInput, so a Wave cannot tell
+    it apart from the keyboard.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _keys: the keys held down
+    # Invariant: _keys is a frozenset of strings
+
+    # GETTERS AND SETTERS
+    def setKeys(self, keys):
+        """
+        Sets the keys held down.
+
+        Parameter keys: the keys to hold down
+        Precondition: keys is an iterable of strings
+        """
+        self._keys = frozenset(keys)
+
+    # INITIALIZER
+    def __init__(self, keys=()):
+        """
+        Initializes an input that holds down keys.
+
+        Parameter keys: the keys to hold down
+        Precondition: keys is an iterable of strings
+        """
+        self.setKeys(keys)
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is held down.
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return key in self._keys
+
+
+def play(frames, dt=1/60, keys=('up',), seed=None):
+    """
+    Plays one headless wave and returns the pair (wave, frames played).
+
+    The wave is played until it is over or for the given number of frames.
+    When the ship is destroyed, the bolts are cleared and the ship is
+    restored on the next frame, as Invaders does when the player continues.
+
+    Parameter frames: the most frames to play
+    Precondition: frames is an int >= 0
+
+    Parameter dt: the time of each frame
+    Precondition: dt is a number > 0
+
+    Parameter keys: the keys to hold down
+    Precondition: keys is an iterable of strings
+
+    Parameter seed: the seed of the wave
+    Precondition: seed is None or an int >= 0
+    """
+    assert type(frames) == int and frames >= 0, '%s is not a frame count' % repr(frames)
+    assert type(dt) in [int,float] and dt > 0, '%s is not a valid dt' % repr(dt)
+    wave = Wave(seed=seed, headless=True)
+    input = StubInput(keys)
+    played = 0
+    while played < frames:
+        if wave.getLives() == 0 or not wave.hasAliens():
+            break
+        if not wave.hasShip():
+            wave.clearBolts()
+            wave.restoreShip()
+        wave.update(input, dt)
+        played += 1
+    return wave, played
+
+
+def playBatch(games, frames, dt=1/60, keys=('up',), seed=None):
+    """
+    Plays games waves at once and returns the pair (batch, frames played).
+
+    Every wave holds down the same keys.  The batch is played until every
+    wave is over or for the given number of frames.
+
+    Parameter games: the number of waves
+    Precondition: games is an int > 0
+
+    Parameter frames: the most frames to play
+    Precondition: frames is an int >= 0
+
+    Parameter dt: the time of each frame
+    Precondition: dt is a number > 0
+
+    Parameter keys: the keys to hold down
+    Precondition: keys is an iterable of strings
+
+    Parameter seed: the seed of the first wave
+    Precondition: seed is None or an int >= 0
+    """
+    assert type(frames) == int and frames >= 0, '%s is not a frame count' % repr(frames)
+    keys = frozenset(keys)
+    action = ((ACTION_LEFT if 'left' in keys else 0) |
+              (ACTION_RIGHT if 'right' in keys else 0) |
+              (ACTION_FIRE if 'up' in keys else 0))
+    batch = WaveBatch(games, seed)
+    played = 0
+    while played < frames and not batch.getDone().all():
+        batch.update(action, dt)
+        played += 1
+    return batch, played
+
+
+def main():
+    """
+    Plays a headless wave with the options on the command line.
+    """
+    parser = argparse.ArgumentParser(description='Play Alien Invaders without a window.')
+    parser.add_argument('layout', nargs='*',
+                        help='rows, aliens in a row and alien speed (read by consts.py, '
+                             'so they must come before the options)')
+    parser.add_argument('--frames', type=int, default=10000, help='the most frames to play')
+    parser.add_argument('--fps', type=float, default=60.0, help='the frames in a second of game time')
+    parser.add_argument('--seed', type=int, default=None, help='the seed of the wave')
+    parser.add_argument('--keys', default='up', help='the keys to hold down, separated by commas')
+    parser.add_argument('--games', type=int, default=None, help='the number of waves to play at once')
+    args = parser.parse_args()
+    if args.layout != LAYOUT_ARGS:
+        parser.error('the layout must come before the options')
+
+    keys = [k for k in args.keys.split(',') if k]
+    if args.games != None:
+        start = time.perf_counter()
+        batch, played = playBatch(args.games, args.frames, 1.0/args.fps, keys, args.seed)
+        elapsed = time.perf_counter() - start
+        print('%d waves: %d frames, %.2f lives and %.1f aliens left on average, %d over' %
+              (args.games, played, batch.getLives().mean(), batch.getAlienCounts().mean(),
+               batch.getDone().sum()))
+        if elapsed > 0:
+            print('%.0f wave frames per second' % (args.games*played/elapsed))
+        return
+
+    start = time.perf_counter()
+    wave, played = play(args.frames, 1.0/args.fps, keys, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print('seed %d: %d frames, %d lives, %d aliens left' %
+          (wave.getSeed(), played, wave.getLives(), wave.getAlienCount()))
+    if elapsed > 0:
+        print('%.0f frames per second' % (played/elapsed))
+
+
+# Application code
+if __name__ == '__main__':
+    main()
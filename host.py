@@ -0,0 +1,578 @@
+"""
+Multi-session game host for Alien Invaders
+
+This module contains the class GameHost, which plays many headless waves
+in one process with asyncio.  Every wave belongs to a Session.  The host
+ticks all of its sessions on one shared fixed-rate schedule, and sends the
+state of each session to the clients watching it over a local socket.  This
+lets remote bots play the game and lets spectators follow a game.
+
+A client talks to the host with lines of text.  The commands are
+
+    new [seed]     starts a new session and plays it
+    join <id>      plays an existing session
+    watch <id>     watches a session without playing it
+    keys <keys>    holds down keys, separated by commas (may be empty)
+    quit           closes the connection
+
+The host answers new, join and watch with the line 'session <id> <seed>',
+and a bad command with a line starting with 'error'.  After that, it sends
+the line 'state <json>' every tick, where json is the summary returned by
+Session.getState().  Each keys command is queued, and the session takes one
+queued command per tick, so a bot may send its keys ahead of time.  The
+keys stay held down until the next command is taken.
+
+The sessions are ticked in batches of a fixed size.  The host yields to
+the event loop between batches, so that clients are served even when there
+are many sessions.  If a tick takes longer than its period, the host counts
+an overrun; see getStats().  To measure how many sessions a core can host,
+type
+
+    python host.py --sessions 500 --rate 60
+
+which plays 500 sessions with no clients and reports the load every second.
+With the option --socket, the host also listens for clients on a socket.
+
+Author: agent
+Date: October 18, 2026
+"""
+import os
+# Kivy reads the command line when it is imported; these options are ours
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from consts import *
+from wave import Wave
+from headless import StubInput
+import collections
+import argparse
+import asyncio
+import json
+import socket
+
+
+# The most keys commands queued for a session; older ones are dropped
+INPUT_QUEUE = 256
+# The most bytes waiting to be sent to a client before its states are dropped
+SEND_BUFFER = 1 << 16
+
+
+class Session(object):
+    """
+    This class is a headless wave being played on a GameHost.
+
+    A session is played by the keys in its input queue, and is watched by
+    zero or more clients.  When the ship is destroyed, the next tick clears
+    the bolts and restores the ship, as Invaders does when the player
+    continues.  A session stops playing when its wave is over.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _id: the session id
+    # Invariant: _id is an int >= 0, unique on its host
+    #
+    # Attribute _wave: the wave being played
+    # Invariant: _wave is a Wave object made with headless=True
+    #
+    # Attribute _input: the keys held down
+    # Invariant: _input is a StubInput object
+    #
+    # Attribute _queue: the keys commands not yet taken
+    # Invariant: _queue is a deque of tuples of strings, of at most INPUT_QUEUE
+    #
+    # Attribute _watchers: the clients watching the session
+    # Invariant: _watchers is a set of asyncio StreamWriter objects
+    #
+    # Attribute _tick: the ticks played
+    # Invariant: _tick is an int >= 0
+
+    # GETTERS AND SETTERS
+    def getId(self):
+        """
+        Returns the session id.
+        """
+        return self._id
+
+    def getWave(self):
+        """
+        Returns the wave being played.
+        """
+        return self._wave
+
+    def getTick(self):
+        """
+        Returns the number of ticks played.
+        """
+        return self._tick
+
+    def getWatchers(self):
+        """
+        Returns the set of clients watching this session.
+
+        The set belongs to the session; do not change it.
+        """
+        return self._watchers
+
+    def isOver(self):
+        """
+        Returns True if the wave is over (won or lost).
+        """
+        return self._wave.getLives() == 0 or not self._wave.hasAliens()
+
+    # INITIALIZER
+    def __init__(self, id, seed=None, keys=()):
+        """
+        Initializes a session with a new wave.
+
+        Parameter id: the session id
+        Precondition: id is an int >= 0
+
+        Parameter seed: the seed of the wave, or None for a random one
+        Precondition: seed is None or an int >= 0
+
+        Parameter keys: the keys held down at the start
+        Precondition: keys is an iterable of strings
+        """
+        self._id = id
+        self._wave = Wave(seed=seed, headless=True)
+        self._input = StubInput(keys)
+        self._queue = collections.deque(maxlen=INPUT_QUEUE)
+        self._watchers = set()
+        self._tick = 0
+
+    # METHODS TO PLAY AND WATCH
+    def pushKeys(self, keys):
+        """
+        Queues a keys command.
+
+        Parameter keys: the keys to hold down when the command is taken
+        Precondition: keys is an iterable of strings
+        """
+        self._queue.append(tuple(keys))
+
+    def addWatcher(self, writer):
+        """
+        Adds a client to the watchers of this session.
+
+        Parameter writer: the stream to the client
+        Precondition: writer is an asyncio StreamWriter
+        """
+        self._watchers.add(writer)
+
+    def removeWatcher(self, writer):
+        """
+        Removes a client from the watchers of this session (if it is one).
+
+        Parameter writer: the stream to the client
+        Precondition: writer is an asyncio StreamWriter
+        """
+        self._watchers.discard(writer)
+
+    def tick(self, dt):
+        """
+        Plays one tick of the wave, unless it is over.
+
+        Parameter dt: the seconds of game time in a tick
+        Precondition: dt is a number > 0
+        """
+        if self.isOver():
+            return
+        if self._queue:
+            self._input.setKeys(self._queue.popleft())
+        wave = self._wave
+        if not wave.hasShip():
+            wave.clearBolts()
+            wave.restoreShip()
+        wave.update(self._input, dt)
+        self._tick += 1
+
+    def getState(self):
+        """
+        Returns a dictionary summarizing the session.
+
+        The keys are 'session', 'tick', 'seed', 'lives', 'aliens', 'ship' (the
+        ship x-coordinate, or None), 'offset' (the formation offset [dx, dy]),
+        'alive' (the alive grid as one int per row, bit c for column c),
+        'bolts' (the [x, y] of every bolt as [player bolts, alien bolts]) and
+        'over'.
+        """
+        wave = self._wave
+        dx, dy = wave.getAlienOffset()
+        alive = []
+        for row in wave.getAlienGrid():
+            bits = 0
+            for col in range(len(row)-1, -1, -1):
+                bits = (bits << 1) | bool(row[col])
+            alive.append(bits)
+        bolts = []
+        for owner in (PLAYER_BOLT, ALIEN_BOLT):
+            xs, ys = wave.getBoltPositions(owner)
+            bolts.append([[round(float(x), 1), round(float(y), 1)] for x, y in zip(xs, ys)])
+        return {'session': self._id, 'tick': self._tick, 'seed': wave.getSeed(),
+                'lives': wave.getLives(), 'aliens': wave.getAlienCount(),
+                'ship': wave.getShipX(), 'offset': [dx, dy], 'alive': alive,
+                'bolts': bolts, 'over': self.isOver()}
+
+
+class GameHost(object):
+    """
+    This class plays many sessions at once on a fixed-rate schedule.
+
+    Call run to play the sessions, and serve to let clients connect.  Both
+    are coroutines, and should be run in the same event loop.  Sessions
+    that are over and have no watchers are closed by the host.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _rate: the ticks in a second
+    # Invariant: _rate is a float > 0
+    #
+    # Attribute _batch: the sessions ticked between yields to the event loop
+    # Invariant: _batch is an int > 0
+    #
+    # Attribute _sessions: the open sessions
+    # Invariant: _sessions is a dict mapping a session id to a Session
+    #
+    # Attribute _nextId: the id of the next new session
+    # Invariant: _nextId is an int greater than every id in _sessions
+    #
+    # Attribute _running: whether run should keep playing
+    # Invariant: _running is a bool
+    #
+    # Attribute _servers: the socket servers started by serve
+    # Invariant: _servers is a list of asyncio Server objects
+    #
+    # Attribute _stats: the tick metrics
+    # Invariant: _stats is a dict with the keys of getStats()
+
+    # GETTERS AND SETTERS
+    def getRate(self):
+        """
+        Returns the number of ticks in a second.
+        """
+        return self._rate
+
+    def getSessions(self):
+        """
+        Returns a list of the open sessions, in the order they were opened.
+        """
+        return list(self._sessions.values())
+
+    def getSession(self, id):
+        """
+        Returns the session with the given id, or None if it is not open.
+
+        Parameter id: the session id
+        Precondition: id is an int
+        """
+        return self._sessions.get(id)
+
+    def getStats(self):
+        """
+        Returns a dictionary of the tick metrics since the last resetStats.
+
+        The keys are
+
+            'ticks':    the ticks played
+            'overruns': the ticks that finished after the next tick was due
+            'skipped':  the ticks dropped to catch up after an overrun
+            'work':     the mean seconds of work in a tick
+            'worst':    the most seconds of work in a tick
+            'load':     the mean fraction of the tick period spent working
+            'sessions': the sessions now open
+
+        The dictionary is a copy, so it may be kept.
+        """
+        stats = dict(self._stats)
+        ticks = max(stats['ticks'], 1)
+        stats['work'] = stats['work']/ticks
+        stats['load'] = stats['work']*self._rate
+        stats['sessions'] = len(self._sessions)
+        return stats
+
+    def resetStats(self):
+        """
+        Resets the tick metrics to zero.
+        """
+        self._stats = {'ticks': 0, 'overruns': 0, 'skipped': 0, 'work': 0.0, 'worst': 0.0}
+
+    # INITIALIZER
+    def __init__(self, rate=60, batch=64):
+        """
+        Initializes a host with no sessions.
+
+        Parameter rate: the ticks in a second
+        Precondition: rate is a number > 0
+
+        Parameter batch: the sessions ticked between yields to the event loop
+        Precondition: batch is an int > 0
+        """
+        assert type(rate) in [int,float] and rate > 0, '%s is not a valid rate' % repr(rate)
+        assert type(batch) == int and batch > 0, '%s is not a valid batch' % repr(batch)
+        self._rate = float(rate)
+        self._batch = batch
+        self._sessions = {}
+        self._nextId = 0
+        self._running = False
+        self._servers = []
+        self.resetStats()
+
+    # METHODS TO MANAGE SESSIONS
+    def openSession(self, seed=None, keys=()):
+        """
+        Opens a new session and returns it.
+
+        Parameter seed: the seed of the wave, or None for a random one
+        Precondition: seed is None or an int >= 0
+
+        Parameter keys: the keys held down at the start
+        Precondition: keys is an iterable of strings
+        """
+        session = Session(self._nextId, seed, keys)
+        self._sessions[session.getId()] = session
+        self._nextId += 1
+        return session
+
+    def closeSession(self, id):
+        """
+        Closes the session with the given id (if it is open).
+
+        Its watchers stay connected, but are sent no more states.
+
+        Parameter id: the session id
+        Precondition: id is an int
+        """
+        self._sessions.pop(id, None)
+
+    # METHODS TO RUN THE HOST
+    async def run(self, ticks=None):
+        """
+        Plays every session until stop is called or for the given number of ticks.
+
+        The ticks are due every 1/getRate() seconds.  A tick plays one step of
+        each open session, in batches, and then sends the state of each
+        session to its watchers.  If a tick is late by a whole period or
+        more, the ticks it missed are skipped (and counted) rather than
+        played back to back.
+
+        Parameter ticks: the most ticks to play, or None for no limit
+        Precondition: ticks is None or an int >= 0
+        """
+        loop = asyncio.get_running_loop()
+        period = 1.0/self._rate
+        due = loop.time()
+        played = 0
+        self._running = True
+        while self._running and (ticks == None or played < ticks):
+            start = loop.time()
+            sessions = list(self._sessions.values())
+            for pos in range(0, len(sessions), self._batch):
+                for session in sessions[pos:pos+self._batch]:
+                    session.tick(period)
+                await asyncio.sleep(0)
+            self._publish(sessions)
+            played += 1
+
+            now = loop.time()
+            work = now - start
+            stats = self._stats
+            stats['ticks'] += 1
+            stats['work'] += work
+            stats['worst'] = max(stats['worst'], work)
+
+            due += period
+            if now > due:
+                stats['overruns'] += 1
+                missed = int((now - due)//period)
+                stats['skipped'] += missed
+                due += missed*period
+            await asyncio.sleep(max(due - now, 0))
+        self._running = False
+
+    def stop(self):
+        """
+        Stops run at the end of the current tick, and closes the servers.
+        """
+        self._running = False
+        for server in self._servers:
+            server.close()
+        self._servers = []
+
+    async def serve(self, path=None, port=None):
+        """
+        Starts listening for clients and returns the server.
+
+        If path is given, the host listens on a Unix socket at path.
+        Otherwise it listens on the TCP port of the local host (the loopback
+        address only).  The server is closed by stop.
+
+        Parameter path: the file name of a Unix socket, or None
+        Precondition: path is None or a string
+
+        Parameter port: the TCP port, or None for any free port
+        Precondition: port is None or an int in 0..65535
+        """
+        if path != None:
+            assert hasattr(socket, 'AF_UNIX'), 'Unix sockets are not supported here'
+            server = await asyncio.start_unix_server(self._serveClient, path=path)
+        else:
+            server = await asyncio.start_server(self._serveClient, '127.0.0.1', port or 0)
+        self._servers.append(server)
+        return server
+
+    # HELPER METHODS
+    def _publish(self, sessions):
+        """
+        Sends the state of each session to its watchers.
+
+        A watcher whose unsent data is more than SEND_BUFFER bytes is skipped
+        this tick, so a slow client cannot hold up the host.  Sessions that
+        are over and have no watchers are closed.
+
+        Parameter sessions: the sessions just ticked
+        Precondition: sessions is a list of Session objects
+        """
+        for session in sessions:
+            watchers = session.getWatchers()
+            if not watchers:
+                if session.isOver():
+                    self.closeSession(session.getId())
+                continue
+            line = ('state %s\n' % json.dumps(session.getState())).encode()
+            for writer in list(watchers):
+                if writer.is_closing():
+                    session.removeWatcher(writer)
+                elif writer.transport.get_write_buffer_size() <= SEND_BUFFER:
+                    writer.write(line)
+
+    async def _serveClient(self, reader, writer):
+        """
+        Carries out the commands of one client until it disconnects.
+
+        Parameter reader: the stream from the client
+        Precondition: reader is an asyncio StreamReader
+
+        Parameter writer: the stream to the client
+        Precondition: writer is an asyncio StreamWriter
+        """
+        session = None
+        playing = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                words = line.decode(errors='replace').split()
+                if not words:
+                    continue
+                command, args = words[0].lower(), words[1:]
+
+                if command == 'quit':
+                    break
+                elif command == 'keys':
+                    if playing and session is self.getSession(session.getId()):
+                        session.pushKeys(k for k in ','.join(args).split(',') if k)
+                    else:
+                        writer.write(b'error not playing a session\n')
+                elif command in ('new', 'join', 'watch'):
+                    try:
+                        arg = int(args[0]) if args else None
+                    except ValueError:
+                        arg = -1
+                    if command == 'new':
+                        found = self.openSession(arg) if arg == None or arg >= 0 else None
+                    else:
+                        found = self.getSession(arg)
+                    if found == None:
+                        writer.write(b'error no such session\n')
+                        continue
+                    if session != None:
+                        session.removeWatcher(writer)
+                    session = found
+                    playing = command != 'watch'
+                    session.addWatcher(writer)
+                    writer.write(('session %d %d\n' %
+                                  (session.getId(), session.getWave().getSeed())).encode())
+                else:
+                    writer.write(('error unknown command %s\n' % command).encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if session != None:
+                session.removeWatcher(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def _report(host, seconds):
+    """
+    Prints the tick metrics of host every so often, until the host stops.
+
+    Parameter host: the host to report on
+    Precondition: host is a GameHost
+
+    Parameter seconds: the seconds between reports
+    Precondition: seconds is a number > 0
+    """
+    while True:
+        await asyncio.sleep(seconds)
+        stats = host.getStats()
+        host.resetStats()
+        print('%d sessions: %d ticks, %d overruns, %d skipped, work %.2f ms (worst %.2f), load %.0f%%' %
+              (stats['sessions'], stats['ticks'], stats['overruns'], stats['skipped'],
+               1000*stats['work'], 1000*stats['worst'], 100*stats['load']))
+
+
+async def _main(args):
+    """
+    Runs a host with the options on the command line.
+
+    Parameter args: the command line options
+    Precondition: args is the result of parse_args in main
+    """
+    host = GameHost(args.rate, args.batch)
+    for i in range(args.sessions):
+        host.openSession(None if args.seed == None else args.seed+i, ('up',))
+    if args.socket != None:
+        await host.serve(path=args.socket)
+        print('listening on %s' % args.socket)
+    elif args.port != None:
+        server = await host.serve(port=args.port)
+        print('listening on port %d' % server.sockets[0].getsockname()[1])
+    reporter = asyncio.ensure_future(_report(host, args.every))
+    try:
+        await host.run(args.ticks)
+    finally:
+        reporter.cancel()
+        host.stop()
+
+
+def main():
+    """
+    Runs a game host with the options on the command line.
+    """
+    parser = argparse.ArgumentParser(description='Host many Alien Invaders games in one process.')
+    parser.add_argument('layout', nargs='*',
+                        help='rows, aliens in a row and alien speed (read by consts.py, '
+                             'so they must come before the options)')
+    parser.add_argument('--sessions', type=int, default=0, help='the sessions to open at the start')
+    parser.add_argument('--seed', type=int, default=None, help='the seed of the first session')
+    parser.add_argument('--rate', type=float, default=60.0, help='the ticks in a second')
+    parser.add_argument('--batch', type=int, default=64, help='the sessions ticked between yields')
+    parser.add_argument('--ticks', type=int, default=None, help='the most ticks to play')
+    parser.add_argument('--every', type=float, default=1.0, help='the seconds between reports')
+    parser.add_argument('--socket', default=None, help='a Unix socket to listen on')
+    parser.add_argument('--port', type=int, default=None, help='a local TCP port to listen on')
+    args = parser.parse_args()
+    if args.layout != LAYOUT_ARGS:
+        parser.error('the layout must come before the options')
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+# Application code
+if __name__ == '__main__':
+    main()
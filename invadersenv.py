@@ -0,0 +1,205 @@
+"""
+Gym-style environment for Alien Invaders
+
+This module contains the class InvadersEnv, which lets a program (such as a
+learning agent) play a headless Wave one frame at a time.  It follows the
+interface of an OpenAI Gym environment, without depending on Gym:
+
+    env = InvadersEnv()
+    obs = env.reset(seed=7)
+    while True:
+        obs, reward, done, info = env.step(env.ACTION_FIRE)
+        if done:
+            break
+
+The action of a step is one of four choices (do nothing, move left, move
+right or fire), which takes the place of the keys held down in GInput.  The
+wave itself is an ordinary Wave, so the march, fire and collision rules are
+exactly those of the game.
+
+An environment does not make new arrays or dictionaries as it plays.  The
+observation and the info dictionary returned by step are the same objects
+every time, and are overwritten by the next call to step or reset.  Copy
+them if you need to keep them.
+
+Author: agent
+Date: October 18, 2026
+"""
+import os
+# Kivy reads the command line when it is imported; these options are ours
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from consts import *
+from wave import Wave
+from encoder import WaveEncoder
+from headless import StubInput
+import numpy as np
+
+
+class InvadersEnv(object):
+    """
+    This class is a Gym-style environment that plays one headless Wave.
+
+    The observation is the float32 feature vector of a WaveEncoder (see the
+    module encoder), of length OBSERVATION_SIZE.
+
+    The reward of a step is KILL_REWARD for each alien destroyed plus
+    LIFE_REWARD for each life lost.  An episode is done when the wave is
+    over.  If the episode has a step limit, it also ends after that many
+    steps, and info['truncated'] is True.
+
+    When the ship is destroyed, the next step clears the bolts and restores
+    the ship, as Invaders does when the player continues.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _wave: the wave being played
+    # Invariant: _wave is a Wave object made with headless=True, or None
+    # before the first reset
+    #
+    # Attribute _input: the input given to the wave
+    # Invariant: _input is a StubInput object
+    #
+    # Attribute _dt: the seconds of game time in one step
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _limit: the most steps in an episode
+    # Invariant: _limit is None or an int > 0
+    #
+    # Attribute _steps: the steps taken since the last reset
+    # Invariant: _steps is an int >= 0
+    #
+    # Attribute _encoder: the encoder that writes the observations
+    # Invariant: _encoder is a WaveEncoder object in the mode FEATURES
+    #
+    # Attribute _obs: the observation returned by reset and step
+    # Invariant: _obs is a float32 array of length getObservationSize()
+    #
+    # Attribute _info: the info dictionary returned by step
+    # Invariant: _info is a dict with the keys 'lives', 'aliens', 'kills',
+    # 'steps', 'seed' and 'truncated'
+
+    # The actions
+    ACTION_NOOP  = 0
+    ACTION_LEFT  = 1
+    ACTION_RIGHT = 2
+    ACTION_FIRE  = 3
+    # The number of actions
+    ACTION_COUNT = 4
+    # The keys held down for each action
+    ACTION_KEYS = (frozenset(), frozenset(['left']), frozenset(['right']), frozenset(['up']))
+
+    # The reward for each alien destroyed
+    KILL_REWARD = 1.0
+    # The reward for each life lost
+    LIFE_REWARD = -10.0
+
+    # The length of an observation
+    OBSERVATION_SIZE = WaveEncoder.FEATURE_SIZE
+
+    # GETTERS AND SETTERS
+    def getObservationSize(self):
+        """
+        Returns the length of an observation.
+        """
+        return len(self._obs)
+
+    def getWave(self):
+        """
+        Returns the wave being played, or None before the first reset.
+        """
+        return self._wave
+
+    # INITIALIZER
+    def __init__(self, dt=1/60, limit=None, buffer=None):
+        """
+        Initializes an environment.  Call reset before the first step.
+
+        If buffer is given, the observations are written into it instead of
+        into an array owned by the environment.  This lets the observations
+        of many environments share one (possibly shared-memory) array.
+
+        Parameter dt: the seconds of game time in one step
+        Precondition: dt is a number > 0
+
+        Parameter limit: the most steps in an episode, or None for no limit
+        Precondition: limit is None or an int > 0
+
+        Parameter buffer: the array to write observations into, or None
+        Precondition: buffer is None or a float32 array of length
+        InvadersEnv.OBSERVATION_SIZE
+        """
+        assert type(dt) in [int,float] and dt > 0, '%s is not a valid dt' % repr(dt)
+        assert limit == None or (type(limit) == int and limit > 0), \
+            '%s is not a valid step limit' % repr(limit)
+        self._wave = None
+        self._input = StubInput()
+        self._dt = float(dt)
+        self._limit = limit
+        self._steps = 0
+        self._encoder = WaveEncoder(WaveEncoder.FEATURES)
+        if buffer is None:
+            buffer = np.zeros(self.OBSERVATION_SIZE, dtype=np.float32)
+        assert buffer.shape == (self.OBSERVATION_SIZE,) and buffer.dtype == np.float32, \
+            'the buffer is not a float32 array of length %d' % self.OBSERVATION_SIZE
+        self._obs = buffer
+        self._info = {'lives': 0, 'aliens': 0, 'kills': 0, 'steps': 0,
+                      'seed': None, 'truncated': False}
+
+    # METHODS TO PLAY AN EPISODE
+    def reset(self, seed=None):
+        """
+        Starts a new episode and returns the first observation.
+
+        Parameter seed: the seed of the new wave, or None for a random one
+        Precondition: seed is None or an int >= 0
+        """
+        self._wave = Wave(seed=seed, headless=True)
+        self._steps = 0
+        self._info['seed'] = self._wave.getSeed()
+        self._info['truncated'] = False
+        self._observe()
+        return self._obs
+
+    def step(self, action):
+        """
+        Plays one step and returns the tuple (observation, reward, done, info).
+
+        Parameter action: the action to take
+        Precondition: action is ACTION_NOOP, ACTION_LEFT, ACTION_RIGHT or
+        ACTION_FIRE, and reset has been called since the episode ended
+        """
+        assert self._wave != None, 'reset must be called before step'
+        wave = self._wave
+        if not wave.hasShip():
+            wave.clearBolts()
+            wave.restoreShip()
+
+        lives = wave.getLives()
+        self._input.setKeys(self.ACTION_KEYS[action])
+        wave.update(self._input, self._dt)
+        self._steps += 1
+
+        kills = 0
+        for hit in wave.getHits():
+            if hit.target != None:
+                kills += 1
+        reward = kills*self.KILL_REWARD + (lives - wave.getLives())*self.LIFE_REWARD
+
+        done = wave.getLives() == 0 or not wave.hasAliens()
+        truncated = not done and self._limit != None and self._steps >= self._limit
+        self._info['kills'] = kills
+        self._info['truncated'] = truncated
+        self._observe()
+        return (self._obs, reward, done or truncated, self._info)
+
+    # HELPER METHODS
+    def _observe(self):
+        """
+        Writes the state of the wave into the observation and info.
+        """
+        wave = self._wave
+        info = self._info
+        self._encoder.encode(wave, self._obs)
+        info['lives'] = wave.getLives()
+        info['aliens'] = wave.getAlienCount()
+        info['steps'] = self._steps
@@ -0,0 +1,629 @@
+"""
+Simulation workers for Alien Invaders
+
+This module lets a Wave be played on its own worker, apart from the Kivy
+main thread that draws it.  The worker is either a thread or a process.  It
+plays the wave at a fixed tick rate, and after every tick it publishes a
+Snapshot of the wave into a SnapshotBuffer.  The drawing side only reads
+the latest snapshot, so a slow tick does not delay a frame, and a slow
+frame does not delay the simulation.
+
+The class WaveWorker has the same methods as Wave that Invaders uses
+(update, draw, getLives, hasShip, restoreShip and so on), so Invaders can
+play it in place of a Wave.  Its update method only passes the keys held
+down to the worker; the time step is ignored, as the worker keeps its own
+clock.  Instead, setTurbo makes the worker play several ticks in the time
+of one, and Invaders passes its turbo on this way.
+
+Set SIM_WORKER in consts.py (or give a fifth command line argument) to play
+the game this way, as in
+
+    python invaders 5 12 1.0 1 thread
+
+The worker plays the wave without sounds.  Like Invaders, it clears the
+bolts and stops playing when the ship is destroyed, until restoreShip is
+called, and it stops for good when the wave is over.
+
+Author: agent
+Date: October 18, 2026
+"""
+from consts import *
+from wave import Wave, Formation, BoltManager
+from headless import StubInput
+import collections
+import multiprocessing
+import threading
+import queue
+import time
+try:
+    from game2d import *
+    from models import *
+except ImportError:
+    pass # Without Kivy, a worker can still be played, but not drawn
+
+
+# The most seconds a worker falls behind before it drops the ticks it missed
+MAX_LAG = 0.25
+
+# The state of a wave after a tick.  The arrays are copies that cannot be
+# changed, so a snapshot may be shared between threads or sent to a process.
+#
+#   tick:   the ticks played
+#   ack:    the number of the last command carried out
+#   seed:   the seed of the wave
+#   lives:  the lives left
+#   shipX:  the ship x-coordinate, or None if the ship is destroyed
+#   offset: the formation offset (dx, dy)
+#   alive:  the alive grid of the aliens (row 0 on top)
+#   bolts:  the pairs (xs, ys) of the player bolts and the alien bolts
+Snapshot = collections.namedtuple('Snapshot',
+                                  'tick ack seed lives shipX offset alive bolts')
+
+
+def takeSnapshot(wave, tick, ack):
+    """
+    Returns a Snapshot of wave.
+
+    Parameter wave: the wave to copy
+    Precondition: wave is a Wave object
+
+    Parameter tick: the ticks played
+    Precondition: tick is an int >= 0
+
+    Parameter ack: the number of the last command carried out
+    Precondition: ack is an int >= 0
+    """
+    alive = wave.getAlienGrid().copy()
+    alive.flags.writeable = False
+    bolts = []
+    for owner in (PLAYER_BOLT, ALIEN_BOLT):
+        xs, ys = wave.getBoltPositions(owner)
+        xs = xs.copy()
+        ys = ys.copy()
+        xs.flags.writeable = False
+        ys.flags.writeable = False
+        bolts.append((xs, ys))
+    return Snapshot(tick, ack, wave.getSeed(), wave.getLives(), wave.getShipX(),
+                    wave.getAlienOffset(), alive, tuple(bolts))
+
+
+class SnapshotBuffer(object):
+    """
+    This class is a double buffer of snapshots.
+
+    The buffer holds the latest snapshot and the one before it.  A writer
+    publishes a new snapshot by moving the latest one back and putting the
+    new one in front; a reader gets both of them at once.  As snapshots
+    cannot be changed, a reader never sees a snapshot that is half written.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _lock: the lock around the two snapshots
+    # Invariant: _lock is a threading.Lock
+    #
+    # Attribute _previous: the snapshot before the latest one
+    # Invariant: _previous is a Snapshot, or None
+    #
+    # Attribute _latest: the latest snapshot
+    # Invariant: _latest is a Snapshot, or None if nothing was published
+    #
+    # Attribute _count: the number of snapshots published
+    # Invariant: _count is an int >= 0
+
+    # GETTERS AND SETTERS
+    def getLatest(self):
+        """
+        Returns the latest snapshot, or None if nothing was published.
+        """
+        return self._latest
+
+    def getPair(self):
+        """
+        Returns the pair (previous, latest) of the last two snapshots.
+
+        Either may be None if fewer than two snapshots were published.
+        """
+        with self._lock:
+            return (self._previous, self._latest)
+
+    def getCount(self):
+        """
+        Returns the number of snapshots published.
+        """
+        return self._count
+
+    # INITIALIZER
+    def __init__(self):
+        """
+        Initializes an empty buffer.
+        """
+        self._lock = threading.Lock()
+        self._previous = None
+        self._latest = None
+        self._count = 0
+
+    def publish(self, snapshot):
+        """
+        Makes snapshot the latest snapshot.
+
+        Parameter snapshot: the new snapshot
+        Precondition: snapshot is a Snapshot
+        """
+        with self._lock:
+            self._previous = self._latest
+            self._latest = snapshot
+            self._count += 1
+
+
+def _simulate(seed, rate, receive, publish):
+    """
+    Plays a headless wave at a fixed tick rate until it is over or stopped.
+
+    This function is the body of a worker.  Before each tick, it carries out
+    the commands from receive, which are
+
+        ('keys', keys):   holds down keys (a tuple of strings)
+        ('turbo', k):     plays k ticks in the time of one (an int >= 1)
+        ('restore', n):   restores the ship
+        ('stop', n):      stops the worker
+
+    where n is the number of the command.  Each tick plays 1/rate seconds of
+    game time, even in turbo.  After each tick, it publishes a
+    snapshot.  When the ship is destroyed, the worker clears the bolts, and
+    it does not tick again until the ship is restored.  If it falls more
+    than MAX_LAG seconds behind, it drops the ticks it missed.
+
+    Parameter seed: the seed of the wave
+    Precondition: seed is None or an int >= 0
+
+    Parameter rate: the ticks in a second
+    Precondition: rate is a number > 0
+
+    Parameter receive: a function that returns the list of waiting commands,
+    waiting at most the given seconds for the first one
+    Precondition: receive is a function of one number
+
+    Parameter publish: a function that publishes a snapshot
+    Precondition: publish is a function of one Snapshot
+    """
+    wave = Wave(seed=seed, headless=True)
+    input = StubInput()
+    step = 1.0/rate
+    period = step
+    tick = 0
+    ack = 0
+    publish(takeSnapshot(wave, tick, ack))
+
+    due = time.perf_counter()
+    while wave.getLives() > 0 and wave.hasAliens():
+        changed = False
+        for command in receive(max(due - time.perf_counter(), 0)):
+            if command[0] == 'stop':
+                return
+            elif command[0] == 'keys':
+                input.setKeys(command[1])
+            elif command[0] == 'turbo':
+                period = step/command[1]
+            elif command[0] == 'restore':
+                wave.restoreShip()
+                ack = command[1]
+                changed = True
+
+        now = time.perf_counter()
+        if now < due:
+            if changed:
+                publish(takeSnapshot(wave, tick, ack))
+            continue
+        if wave.hasShip():
+            wave.update(input, step)
+            tick += 1
+            changed = True
+            if not wave.hasShip():
+                # As in Invaders, the bolts go when the game pauses
+                wave.clearBolts()
+        if changed:
+            publish(takeSnapshot(wave, tick, ack))
+        due += period
+        if now - due > MAX_LAG:
+            due = now
+
+
+def _serveProcess(conn, seed, rate):
+    """
+    Plays a wave in a worker process, talking to the parent over conn.
+
+    The commands come from conn, and the snapshots are sent back on it.  The
+    connection is closed when the wave is over or stopped.
+
+    Parameter conn: the worker end of a pipe to the parent
+    Precondition: conn is a Connection object
+
+    Parameter seed: the seed of the wave
+    Precondition: seed is None or an int >= 0
+
+    Parameter rate: the ticks in a second
+    Precondition: rate is a number > 0
+    """
+    def receive(wait):
+        commands = []
+        if conn.poll(wait):
+            while conn.poll():
+                commands.append(conn.recv())
+        return commands
+
+    try:
+        _simulate(seed, rate, receive, conn.send)
+    except (EOFError, OSError):
+        pass
+    finally:
+        conn.close()
+
+
+class SnapshotRenderer(object):
+    """
+    This class draws snapshots of a wave.
+
+    The renderer keeps its own formation and bolts, and brings them up to
+    date with each snapshot it draws.  Only the aliens destroyed since the
+    last snapshot are removed, so the images of the aliens are not made
+    again every frame.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _aliens: the aliens as last drawn
+    # Invariant: _aliens is a Formation object
+    #
+    # Attribute _bolts: the bolts as last drawn
+    # Invariant: _bolts is a BoltManager object
+    #
+    # Attribute _ship: the image of the ship
+    # Invariant: _ship is a Ship object, or None if it was never drawn
+    #
+    # Attribute _defLine: the defensive line
+    # Invariant: _defLine is a DefLine object, or None if it was never drawn
+
+    # INITIALIZER
+    def __init__(self):
+        """
+        Initializes a renderer for a new wave.
+        """
+        self._aliens = Formation()
+        self._bolts = BoltManager()
+        self._ship = None
+        self._defLine = None
+
+    def draw(self, view, snapshot):
+        """
+        Draws snapshot.
+
+        Parameter view: the view to draw to
+        Precondition: view is an instance of GView
+
+        Parameter snapshot: the snapshot to draw
+        Precondition: snapshot is a Snapshot of a wave with the same layout
+        as the wave of this renderer's first snapshot
+        """
+        aliens = self._aliens
+        for row, col in zip(*(aliens.getAlive() & ~snapshot.alive).nonzero()):
+            aliens.kill(row, col)
+        dx, dy = aliens.getOffset()
+        aliens.march(snapshot.offset[0]-dx, snapshot.offset[1]-dy)
+
+        self._bolts.clear()
+        for owner in (PLAYER_BOLT, ALIEN_BOLT):
+            xs, ys = snapshot.bolts[owner]
+            for index in range(len(xs)):
+                self._bolts.fire(owner, xs[index], ys[index])
+
+        aliens.draw(view)
+        if snapshot.shipX != None:
+            if self._ship == None:
+                self._ship = Ship(x=snapshot.shipX, y=SHIP_BOTTOM, source='ship.png')
+            self._ship.x = snapshot.shipX
+            self._ship.draw(view)
+        if self._defLine == None:
+            self._defLine = DefLine()
+        self._defLine.draw(view)
+        self._bolts.draw(view)
+
+
+class WaveWorker(object):
+    """
+    This class plays a Wave on a worker thread or process.
+
+    It has the methods of Wave used by Invaders and by the bots in the
+    module controllers.  The getters read the latest snapshot, so they may
+    be a tick behind the worker.  After restoreShip, hasShip is True at
+    once, even before the worker has restored the ship.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _mode: the kind of worker
+    # Invariant: _mode is 'thread' or 'process'
+    #
+    # Attribute _buffer: the snapshots published by the worker
+    # Invariant: _buffer is a SnapshotBuffer
+    #
+    # Attribute _cells: the starting positions (cellX, cellY) of the aliens
+    # Invariant: _cells is a pair of float arrays, as in Formation.getCells
+    #
+    # Attribute _renderer: the renderer for the snapshots
+    # Invariant: _renderer is a SnapshotRenderer, or None if never drawn
+    #
+    # Attribute _commands: the commands not yet sent (thread mode)
+    # Invariant: _commands is a queue.Queue, or None in process mode
+    #
+    # Attribute _conn: the parent end of the pipe (process mode)
+    # Invariant: _conn is a Connection object, or None in thread mode
+    #
+    # Attribute _worker: the worker playing the wave
+    # Invariant: _worker is a threading.Thread or a multiprocessing.Process
+    #
+    # Attribute _reader: the thread moving snapshots from _conn to _buffer
+    # Invariant: _reader is a threading.Thread, or None in thread mode
+    #
+    # Attribute _keys: the keys last sent to the worker
+    # Invariant: _keys is a tuple of strings
+    #
+    # Attribute _turbo: the turbo last sent to the worker
+    # Invariant: _turbo is an int >= 1
+    #
+    # Attribute _sent: the number of the last command sent
+    # Invariant: _sent is an int >= 0
+    #
+    # Attribute _restored: the number of the last restore command sent
+    # Invariant: _restored is an int in 0.._sent
+
+    # The keys passed on to the worker
+    KEYS = ('left', 'right', 'up')
+
+    # GETTERS AND SETTERS
+    def getMode(self):
+        """
+        Returns the kind of worker, 'thread' or 'process'.
+        """
+        return self._mode
+
+    def getSnapshot(self):
+        """
+        Returns the latest snapshot of the wave.
+        """
+        return self._buffer.getLatest()
+
+    def getBuffer(self):
+        """
+        Returns the buffer of the snapshots published by the worker.
+        """
+        return self._buffer
+
+    def getLives(self):
+        """
+        Returns the number of lives left.
+        """
+        return self.getSnapshot().lives
+
+    def getSeed(self):
+        """
+        Returns the seed of the wave.
+        """
+        return self.getSnapshot().seed
+
+    def hasAliens(self):
+        """
+        Returns True if any alien is still alive.
+        """
+        return bool(self.getSnapshot().alive.any())
+
+    def getAlienCount(self):
+        """
+        Returns the number of aliens still alive.
+        """
+        return int(self.getSnapshot().alive.sum())
+
+    def getAlienGrid(self):
+        """
+        Returns the bool array of which aliens are alive (row 0 on top).
+        """
+        return self.getSnapshot().alive
+
+    def getAlienCells(self):
+        """
+        Returns the starting positions (cellX, cellY) of the alien columns and rows.
+
+        The arrays belong to the worker; do not change them.
+        """
+        return self._cells
+
+    def getAlienOffset(self):
+        """
+        Returns the distance (dx, dy) the aliens moved from their start.
+        """
+        return self.getSnapshot().offset
+
+    def getBoltPositions(self, owner):
+        """
+        Returns the arrays (xs, ys) of the positions of the bolts of owner.
+
+        Parameter owner: the owner of the bolts
+        Precondition: owner is PLAYER_BOLT or ALIEN_BOLT
+        """
+        return self.getSnapshot().bolts[owner]
+
+    def hasShip(self):
+        """
+        Returns True if the ship has not been destroyed (or is being restored).
+        """
+        snapshot = self.getSnapshot()
+        return snapshot.shipX != None or snapshot.ack < self._restored
+
+    def getShipX(self):
+        """
+        Returns the x-coordinate of the ship, or None if it was destroyed.
+        """
+        return self.getSnapshot().shipX
+
+    def restoreShip(self):
+        """
+        Asks the worker to put a new ship on the screen.
+        """
+        self._restored = self._send('restore')
+
+    def clearBolts(self):
+        """
+        Does nothing, as the worker clears the bolts when the ship is destroyed.
+        """
+        pass
+
+    def setTurbo(self, turbo):
+        """
+        Asks the worker to play turbo ticks in the time of one.
+
+        Parameter turbo: the ticks to play in the time of one
+        Precondition: turbo is an int >= 1
+        """
+        assert type(turbo) == int and turbo >= 1, '%s is not a valid turbo' % repr(turbo)
+        if turbo != self._turbo:
+            self._turbo = turbo
+            self._send('turbo', turbo)
+
+    # INITIALIZER
+    def __init__(self, seed=None, rate=60, mode='thread', turbo=1):
+        """
+        Initializes a wave and starts the worker that plays it.
+
+        This method waits for the first snapshot, so the getters may be used
+        as soon as it returns.
+
+        Parameter seed: the seed of the wave, or None for a random one
+        Precondition: seed is None or an int >= 0
+
+        Parameter rate: the ticks in a second
+        Precondition: rate is a number > 0
+
+        Parameter mode: the kind of worker
+        Precondition: mode is 'thread' or 'process'
+
+        Parameter turbo: the ticks to play in the time of one
+        Precondition: turbo is an int >= 1
+        """
+        assert type(rate) in [int,float] and rate > 0, '%s is not a valid rate' % repr(rate)
+        assert mode in ('thread', 'process'), '%s is not a valid mode' % repr(mode)
+        self._mode = mode
+        self._buffer = SnapshotBuffer()
+        self._cells = Formation().getCells()
+        self._renderer = None
+        self._keys = ()
+        self._turbo = 1
+        self._sent = 0
+        self._restored = 0
+        self._commands = None
+        self._conn = None
+        self._reader = None
+
+        if mode == 'thread':
+            self._commands = queue.Queue()
+            self._worker = threading.Thread(target=_simulate, daemon=True,
+                args=(seed, rate, self._receive, self._buffer.publish))
+            self._worker.start()
+        else:
+            self._conn, child = multiprocessing.Pipe()
+            self._worker = multiprocessing.Process(target=_serveProcess, daemon=True,
+                                                   args=(child, seed, rate))
+            self._worker.start()
+            child.close()
+            self._reader = threading.Thread(target=self._read, daemon=True)
+            self._reader.start()
+
+        while self._buffer.getLatest() == None and self._worker.is_alive():
+            time.sleep(0.001)
+        assert self._buffer.getLatest() != None, 'the worker failed to start'
+        self.setTurbo(turbo)
+
+    # METHODS TO PLAY AND DRAW
+    def update(self, input, dt):
+        """
+        Passes the keys held down in input on to the worker.
+
+        The worker keeps its own clock, so dt is ignored.
+
+        Parameter input: the user input
+        Precondition: input has a method is_key_down, like GInput
+
+        Parameter dt: the time since the last update (ignored)
+        Precondition: dt is a number >= 0
+        """
+        keys = tuple(key for key in self.KEYS if input.is_key_down(key))
+        if keys != self._keys:
+            self._keys = keys
+            self._send('keys', keys)
+
+    def draw(self, view, alpha=1.0):
+        """
+        Draws the latest snapshot.
+
+        The worker keeps its own clock, so alpha is ignored.
+
+        Parameter view: the view to draw to
+        Precondition: view is an instance of GView
+
+        Parameter alpha: how far the frame is past the last update (ignored)
+        Precondition: alpha is a number in 0..1
+        """
+        if self._renderer == None:
+            self._renderer = SnapshotRenderer()
+        self._renderer.draw(view, self.getSnapshot())
+
+    def stop(self):
+        """
+        Stops the worker and waits for it to finish.
+        """
+        self._send('stop')
+        self._worker.join()
+        if self._reader != None:
+            self._reader.join()
+
+    # HELPER METHODS
+    def _send(self, command, arg=None):
+        """
+        Sends a command to the worker and returns its number.
+
+        Parameter command: the command
+        Precondition: command is 'keys', 'turbo', 'restore' or 'stop'
+
+        Parameter arg: the argument of the command, or None for its number
+        Precondition: arg is a tuple of strings, an int or None
+        """
+        self._sent += 1
+        message = (command, self._sent if arg == None else arg)
+        if self._commands != None:
+            self._commands.put(message)
+        else:
+            try:
+                self._conn.send(message)
+            except (OSError, EOFError):
+                pass # The worker has already finished
+        return self._sent
+
+    def _receive(self, wait):
+        """
+        Returns the list of waiting commands (thread mode).
+
+        Parameter wait: the most seconds to wait for the first command
+        Precondition: wait is a number >= 0
+        """
+        commands = []
+        try:
+            commands.append(self._commands.get(timeout=wait) if wait > 0
+                            else self._commands.get_nowait())
+            while True:
+                commands.append(self._commands.get_nowait())
+        except queue.Empty:
+            pass
+        return commands
+
+    def _read(self):
+        """
+        Publishes the snapshots sent by the worker process until it finishes.
+        """
+        try:
+            while True:
+                self._buffer.publish(self._conn.recv())
+        except (EOFError, OSError):
+            pass
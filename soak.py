@@ -0,0 +1,232 @@
+"""
+Soak tests for Alien Invaders
+
+This module plays the whole Invaders application, with its state machine,
+without a window.  The ship is played by one of the bots in the module
+controllers, and the game uses the null backend of game2d, so it runs as
+fast as it can.  This is useful to run the game unattended for a long time
+and to measure how many updates a second it can take.
+
+To play 20 waves with the dodging bot at turbo 16, type
+
+    python soak.py --bot dodge --waves 20 --turbo 16
+
+The plain arguments are still read by consts.py (rows, aliens in a row,
+alien speed, turbo and worker), as long as they come before the options, so
+
+    python soak.py 5 12 1 16 thread --bot tracking
+
+plays the waves on a worker thread.  A worker keeps its own clock, so such
+a soak test runs in real time.
+
+With the option --record, the keys of every update are written to a file,
+with the seed of the waves (given by --seed, or picked at random).  The
+option --replay plays such a file back on the same waves, so
+
+    python soak.py --bot random --record keys.txt
+    python soak.py --replay keys.txt
+
+play the same game twice.  Waves on a worker cannot be played back, as they
+do not see the keys at the same ticks each time.
+
+Author: agent
+Date: October 18, 2026
+"""
+import os
+# Kivy reads the command line when it is imported; these options are ours
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+# A soak test never opens a window
+os.environ.setdefault('GAME2D_BACKEND', 'null')
+
+from consts import *
+from app import Invaders
+from controllers import *
+import argparse
+import random
+import time
+
+
+# The bots that can play a soak test
+BOTS = {'random': RandomBot, 'tracking': TrackingBot, 'dodge': DodgeBot}
+
+
+class SoakInvaders(Invaders):
+    """
+    This class is the Invaders application played by a controller.
+
+    It counts the waves won and lost, and stops once it has played enough
+    waves.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _player: the controller given to the game when it starts
+    # Invariant: _player is a Controller object
+    #
+    # Attribute _waves: the most waves to finish, or None for no limit
+    # Invariant: _waves is None or an int > 0
+    #
+    # Attribute _seed: the seed of the waves, or None for fresh seeds
+    # Invariant: _seed is None or an int >= 0
+    #
+    # Attribute _won: the number of waves won
+    # Invariant: _won is an int >= 0
+    #
+    # Attribute _lost: the number of waves lost
+    # Invariant: _lost is an int >= 0
+    #
+    # Attribute _updates: the number of updates played
+    # Invariant: _updates is an int >= 0
+    #
+    # Attribute _counted: the last wave counted as won or lost
+    # Invariant: _counted is a Wave object, or None
+
+    # GETTERS AND SETTERS
+    def getWon(self):
+        """
+        Returns the number of waves won.
+        """
+        return self._won
+
+    def getLost(self):
+        """
+        Returns the number of waves lost.
+        """
+        return self._lost
+
+    def getUpdates(self):
+        """
+        Returns the number of updates played.
+        """
+        return self._updates
+
+    def setPlayer(self, player, waves=None, seed=None):
+        """
+        Sets the controller that plays the game, the waves to finish and their seed.
+
+        Call this method before run.  The game also stops when the controller
+        has nothing more to play.
+
+        Parameter player: the controller
+        Precondition: player is a Controller object
+
+        Parameter waves: the most waves to finish, or None for no limit
+        Precondition: waves is None or an int > 0
+
+        Parameter seed: the seed of the waves, or None for fresh seeds
+        Precondition: seed is None or an int >= 0
+        """
+        self._player = player
+        self._waves = waves
+        self._seed = seed
+
+    # THREE MAIN GAMEAPP METHODS
+    def start(self):
+        """
+        Initializes the application, played by the controller of setPlayer.
+        """
+        Invaders.start(self)
+        self.setController(self._player)
+        self.setSeed(self._seed)
+        self._won = 0
+        self._lost = 0
+        self._updates = 0
+        self._counted = None
+
+    def update(self, dt):
+        """
+        Animates a single frame and keeps count of the waves.
+
+        A wave played on a worker may end between two updates, and be replaced
+        by a new wave in the same update that finds it over.  Hence the wave
+        before the update is counted as well as the wave after it.
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        last = self.getWave()
+        Invaders.update(self, dt)
+        self._updates += 1
+        if last is not self.getWave():
+            self._finish(last)
+        self._finish(self.getWave())
+        if self._player.isDone():
+            self.stop()
+
+    # HELPER METHODS
+    def _finish(self, wave):
+        """
+        Counts the wave if it is over, and stops when enough waves are.
+
+        A wave is only counted once.
+
+        Parameter wave: the current wave
+        Precondition: wave is a Wave object or None
+        """
+        if wave == None or wave is self._counted:
+            return
+        if wave.getLives() == 0:
+            self._lost += 1
+        elif not wave.hasAliens():
+            self._won += 1
+        else:
+            return
+        self._counted = wave
+        if self._waves != None and self._won + self._lost >= self._waves:
+            self.stop()
+
+
+def main():
+    """
+    Plays a soak test with the options on the command line.
+    """
+    parser = argparse.ArgumentParser(description='Play Alien Invaders with a bot and no window.')
+    parser.add_argument('layout', nargs='*',
+                        help='rows, aliens in a row and alien speed (read by consts.py, '
+                             'so they must come before the options)')
+    parser.add_argument('--bot', choices=sorted(BOTS), default='dodge', help='the bot to play')
+    parser.add_argument('--waves', type=int, default=10, help='the most waves to play')
+    parser.add_argument('--frames', type=int, default=None, help='the most frames to play')
+    parser.add_argument('--turbo', type=int, default=TURBO_MAX, help='the updates per frame')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='the seed of the waves and of the random bot')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', default=None, help='a file to record the keys in')
+    group.add_argument('--replay', default=None, help='a recording to play back')
+    args = parser.parse_args()
+    if args.layout != LAYOUT_ARGS:
+        parser.error('the layout must come before the options')
+    if SIM_WORKER != None and (args.record != None or args.replay != None):
+        parser.error('waves on a worker cannot be played back')
+
+    seed = args.seed
+    if args.replay != None:
+        player = ReplayController.load(args.replay)
+        if player.getSeed() == None:
+            parser.error('the recording %s has no seed' % args.replay)
+        seed = player.getSeed()
+        name = 'replay'
+    else:
+        player = BOTS[args.bot](args.seed) if args.bot == 'random' else BOTS[args.bot]()
+        name = args.bot + ' bot'
+    if args.record != None:
+        if seed == None:
+            seed = random.SystemRandom().getrandbits(32)
+        player = RecordingController(player, seed)
+    game = SoakInvaders(width=GAME_WIDTH, height=GAME_HEIGHT, turbo=args.turbo,
+                        frames=args.frames)
+    game.setPlayer(player, args.waves, seed)
+
+    start = time.perf_counter()
+    game.run()
+    elapsed = time.perf_counter() - start
+
+    print('%s: %d waves won, %d lost in %d updates' %
+          (name, game.getWon(), game.getLost(), game.getUpdates()))
+    if elapsed > 0:
+        print('%.0f updates per second' % (game.getUpdates()/elapsed))
+    if args.record != None:
+        player.save(args.record)
+
+
+# Application code
+if __name__ == '__main__':
+    main()
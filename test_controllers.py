@@ -0,0 +1,103 @@
+"""
+Unit tests for the controllers of Alien Invaders
+
+These tests cover the controllers that play back and record keys.  They do
+not need a wave, so they run without Kivy.  To run them, type
+
+    python -m pytest test_controllers.py
+
+Author: agent
+Date: October 18, 2026
+"""
+from controllers import *
+
+
+def _play(controller, frames):
+    """
+    Returns the list of the keys held down by controller in each of frames updates.
+
+    Parameter controller: the controller to play
+    Precondition: controller is a Controller
+
+    Parameter frames: the number of updates
+    Precondition: frames is an int >= 0
+    """
+    result = []
+    for frame in range(frames):
+        controller.update(None)
+        result.append(tuple(key for key in ('left', 'right', 'up', 's')
+                            if controller.is_key_down(key)))
+    return result
+
+
+def test_replay_end():
+    """
+    Tests that a replay holds down no key once the recording runs out.
+    """
+    replay = ReplayController([('left',), ('up', 's'), ()])
+    assert not replay.isDone()
+    assert _play(replay, 3) == [('left',), ('up', 's'), ()]
+    assert replay.isDone()
+    assert _play(replay, 2) == [(), ()]
+    assert replay.getKeys() == frozenset()
+
+
+def test_replay_loop():
+    """
+    Tests that a looping replay starts again at the end of the recording.
+    """
+    replay = ReplayController([('left',), ('right',)], loop=True)
+    assert _play(replay, 5) == [('left',), ('right',), ('left',), ('right',), ('left',)]
+    assert not replay.isDone()
+
+    empty = ReplayController([], loop=True)
+    assert _play(empty, 2) == [(), ()]
+
+
+def test_recording():
+    """
+    Tests that a recording passes on the keys of its controller and records them.
+    """
+    keys = [('left', 'up'), ('right', 'x'), ()]
+    inner = ScriptedController(lambda wave: keys[len(recorder.getFrames()) % len(keys)])
+    recorder = RecordingController(inner)
+    for frame in range(3):
+        recorder.update(None)
+        assert recorder.is_key_down('x') == ('x' in keys[frame])
+    # Only the keys in RecordingController.KEYS are recorded
+    assert recorder.getFrames() == [('left', 'up'), ('right',), ()]
+
+
+def test_save_load(tmp_path):
+    """
+    Tests that a saved recording loads back into the same frames.
+    """
+    frames = [('left', 's'), (), ('up',), ('right', 'up')]
+    recorder = RecordingController(ReplayController(frames))
+    _play(recorder, len(frames))
+    path = str(tmp_path / 'keys.txt')
+    recorder.save(path)
+
+    replay = ReplayController.load(path)
+    assert _play(replay, len(frames)+1) == frames+[()]
+    assert replay.isDone()
+
+    looped = ReplayController.load(path, loop=True)
+    assert _play(looped, len(frames)+1) == frames+frames[:1]
+
+
+def test_save_seed(tmp_path):
+    """
+    Tests that the seed of the waves is saved with a recording.
+    """
+    recorder = RecordingController(ReplayController([('s',), ('left',)]), 42)
+    _play(recorder, 2)
+    assert recorder.isDone()
+    path = str(tmp_path / 'keys.txt')
+    recorder.save(path)
+
+    replay = ReplayController.load(path)
+    assert replay.getSeed() == 42
+    assert _play(replay, 2) == [('s',), ('left',)]
+    assert ReplayController([]).getSeed() == None
+
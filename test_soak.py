@@ -0,0 +1,88 @@
+"""
+Unit tests for playing back a game of Alien Invaders
+
+These tests play the whole Invaders application with the null backend of
+game2d, so they need Kivy but no window.  To run them, type
+
+    python -m pytest test_soak.py
+
+Author: agent
+Date: October 18, 2026
+"""
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('GAME2D_BACKEND', 'null')
+
+import pytest
+pytest.importorskip('kivy')
+
+from soak import *
+import numpy as np
+
+
+def _soak(player, seed, waves=1, frames=3000):
+    """
+    Returns the SoakInvaders application after player plays it.
+
+    Parameter player: the controller to play the game
+    Precondition: player is a Controller object
+
+    Parameter seed: the seed of the waves
+    Precondition: seed is None or an int >= 0
+
+    Parameter waves: the most waves to finish
+    Precondition: waves is an int > 0
+
+    Parameter frames: the most frames to play
+    Precondition: frames is an int > 0
+    """
+    game = SoakInvaders(width=GAME_WIDTH, height=GAME_HEIGHT, turbo=4, frames=frames)
+    game.setPlayer(player, waves, seed)
+    game.run()
+    return game
+
+
+def _state(game):
+    """
+    Returns the state of the last wave of game, as a tuple that can be compared.
+
+    Parameter game: the game that was played
+    Precondition: game is a SoakInvaders object that played a wave
+    """
+    wave = game.getWave()
+    bolts = tuple(tuple(np.concatenate(wave.getBoltPositions(owner)))
+                  for owner in (PLAYER_BOLT, ALIEN_BOLT))
+    return (game.getUpdates(), game.getWon(), game.getLost(), game.getState(),
+            wave.getSeed(), wave.getLives(), wave.getShipX(), wave.getAlienOffset(),
+            tuple(wave.getAlienGrid().ravel()), bolts)
+
+
+@pytest.mark.skipif(SIM_WORKER != None, reason='waves on a worker cannot be played back')
+def test_replay(tmp_path):
+    """
+    Tests that a recorded game played back on the same seed ends the same way.
+    """
+    recorder = RecordingController(RandomBot(5), 1234)
+    first = _soak(recorder, 1234)
+    assert first.getUpdates() == len(recorder.getFrames())
+    path = str(tmp_path / 'keys.txt')
+    recorder.save(path)
+
+    replay = ReplayController.load(path)
+    assert replay.getSeed() == 1234
+    second = _soak(replay, replay.getSeed())
+    assert replay.isDone()
+    assert _state(second) == _state(first)
+
+
+@pytest.mark.skipif(SIM_WORKER != None, reason='waves on a worker cannot be played back')
+def test_replay_seed():
+    """
+    Tests that the seed of the game picks the seeds of its waves.
+    """
+    frames = [('s',)]*50
+    first = _soak(ReplayController(frames), 7, frames=10)
+    again = _soak(ReplayController(frames), 7, frames=10)
+    other = _soak(ReplayController(frames), 8, frames=10)
+    assert first.getWave().getSeed() == again.getWave().getSeed()
+    assert first.getWave().getSeed() != other.getWave().getSeed()
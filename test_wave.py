@@ -0,0 +1,496 @@
+"""
+Unit tests for the wave module of Alien Invaders
+
+These tests cover the helper classes of a wave (Formation, BoltManager,
+FireScheduler and TimerQueue) and waves made with headless=True.  Nothing
+is drawn, so they do not need a window.  To run them, type
+
+    python -m pytest test_wave.py
+
+Author: agent
+Date: October 18, 2026
+"""
+import os
+# Kivy reads the command line when it is imported; these options are pytest's
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from wave import *
+from headless import StubInput
+import random
+import numpy as np
+
+
+def test_layout():
+    """
+    Tests that a new formation fills its lattice, row 0 on top.
+    """
+    formation = Formation()
+    rows, cols = formation.getRows(), formation.getCols()
+    assert formation.getAlive().shape == (rows, cols)
+    assert formation.getAlive().all()
+    assert formation.getCount() == rows*cols
+    assert formation.getOffset() == (0.0, 0.0)
+
+    cellX, cellY = formation.getCells()
+    assert cellX[0] == ALIEN_H_SEP + ALIEN_WIDTH//2
+    assert cellY[0] == GAME_HEIGHT - ALIEN_CEILING - ALIEN_HEIGHT//2
+    assert (np.diff(cellX) == ALIEN_WIDTH + ALIEN_H_SEP).all()
+    assert (np.diff(cellY) == -(ALIEN_HEIGHT + ALIEN_V_SEP)).all()
+    for row in range(rows):
+        for col in range(cols):
+            assert formation.getX(row, col) == cellX[col]
+            assert formation.getY(row, col) == cellY[row]
+
+
+def _killAll(formation, rng):
+    """
+    Returns the cells of formation in a random order, to kill them in.
+
+    Parameter formation: the formation to kill
+    Precondition: formation is a Formation object
+
+    Parameter rng: the source of random numbers
+    Precondition: rng is a random.Random object
+    """
+    cells = [(row, col) for row in range(formation.getRows())
+             for col in range(formation.getCols())]
+    rng.shuffle(cells)
+    return cells
+
+
+def test_kill():
+    """
+    Tests that the counts and the edges of a formation follow its alive mask.
+    """
+    formation = Formation()
+    formation.march(24, -16)
+    cellX, cellY = formation.getCells()
+    dx, dy = formation.getOffset()
+    for row, col in _killAll(formation, random.Random(2)):
+        assert formation.isAlive(row, col)
+        formation.kill(row, col)
+        assert not formation.isAlive(row, col)
+
+        alive = formation.getAlive()
+        assert formation.getCount() == alive.sum()
+        for c in range(formation.getCols()):
+            live = np.flatnonzero(alive[:, c])
+            assert formation.getBottomRow(c) == (live[-1] if len(live) > 0 else -1)
+        if formation.getCount() > 0:
+            rows, cols = np.nonzero(alive)
+            assert formation.getLeft() == cellX[cols.min()] + dx
+            assert formation.getRight() == cellX[cols.max()] + dx
+            assert formation.getBottom() == cellY[rows.max()] + dy - ALIEN_HEIGHT//2
+    assert formation.getCount() == 0
+
+
+def _shooters(formation):
+    """
+    Returns the set of (row, col) of the aliens that may fire, from the alive mask.
+
+    Parameter formation: the formation to search
+    Precondition: formation is a Formation object
+    """
+    alive = formation.getAlive()
+    result = set()
+    for col in range(formation.getCols()):
+        live = np.flatnonzero(alive[:, col])
+        if len(live) > 0:
+            result.add((int(live[-1]), col))
+    return result
+
+
+def test_shooters():
+    """
+    Tests that only the bottom alien of a live column that is not held fires.
+    """
+    rng = random.Random(3)
+    formation = Formation()
+    cells = _killAll(formation, rng)
+    for row, col in cells[:len(cells)//2]:
+        formation.kill(row, col)
+    expected = _shooters(formation)
+    assert set(formation.pickShooter(rng) for x in range(1000)) == expected
+
+    held = min(col for row, col in expected)
+    formation.holdShooter(held)
+    picked = set(formation.pickShooter(rng) for x in range(1000))
+    assert picked == set(cell for cell in expected if cell[1] != held)
+    formation.releaseShooter(held)
+    assert set(formation.pickShooter(rng) for x in range(1000)) == expected
+
+    x = formation.getX(0, held)
+    assert formation.nearestShooter(x)[1] == held
+
+    for row, col in cells[len(cells)//2:]:
+        formation.kill(row, col)
+        if formation.getCount() > 0:
+            assert formation.pickShooter(rng) in _shooters(formation)
+    assert formation.pickShooter(rng) == None
+    assert formation.nearestShooter(x) == None
+    formation.releaseShooter(held)
+    assert formation.pickShooter(rng) == None
+
+
+def test_march():
+    """
+    Tests that a march only moves the shared offset of the formation.
+    """
+    formation = Formation()
+    cellX, cellY = formation.getCells()
+    formation.march(ALIEN_H_WALK, 0)
+    formation.march(ALIEN_H_WALK, -ALIEN_V_SEP)
+    assert formation.getOffset() == (2*ALIEN_H_WALK, -ALIEN_V_SEP)
+    assert formation.getCells() == (cellX, cellY)
+    assert formation.getX(1, 2) == cellX[2] + 2*ALIEN_H_WALK
+    assert formation.getY(1, 2) == cellY[1] - ALIEN_V_SEP
+    assert formation.getLeft() == cellX[0] + 2*ALIEN_H_WALK
+
+
+def test_wave_march():
+    """
+    Tests that the aliens of a wave step sideways, drop at the edges and stay
+    in the window.
+    """
+    wave = Wave(seed=3, headless=True)
+    input = StubInput()
+    cellX, cellY = wave.getAlienCells()
+    last = wave.getAlienOffset()
+    drops = 0
+    while wave.getLives() > 0 and wave.hasAliens():
+        if not wave.hasShip():
+            wave.clearBolts()
+            wave.restoreShip()
+        wave.update(input, 1/60)
+        dx, dy = wave.getAlienOffset()
+        assert (dx - last[0], dy - last[1]) in ((0, 0), (ALIEN_H_WALK, 0), (-ALIEN_H_WALK, 0),
+                                               (ALIEN_H_WALK, -ALIEN_V_SEP),
+                                               (-ALIEN_H_WALK, -ALIEN_V_SEP))
+        drops += dy != last[1]
+        last = (dx, dy)
+        cols = np.flatnonzero(wave.getAlienGrid().any(axis=0))
+        assert cellX[cols[0]] + dx - ALIEN_WIDTH/2 >= 0
+        assert cellX[cols[-1]] + dx + ALIEN_WIDTH/2 <= GAME_WIDTH
+    assert drops > 1
+
+
+def test_bolts():
+    """
+    Tests that a bolt manager keeps the live bolts of each owner in order.
+    """
+    bolts = BoltManager()
+    xs = [10.0*k for k in range(3*BoltManager.CAPACITY)]
+    for x in xs:
+        bolts.fire(ALIEN_BOLT, x, 300+x)
+    bolts.fire(PLAYER_BOLT, 5, SHIP_BOTTOM)
+    assert bolts.getCount(ALIEN_BOLT) == len(xs)
+    assert bolts.getCount(PLAYER_BOLT) == 1
+    px, py = bolts.getPositions(ALIEN_BOLT)
+    assert list(px) == xs
+    assert list(py) == [300+x for x in xs]
+
+    bolts.move()
+    assert bolts.getY(PLAYER_BOLT, 0) == SHIP_BOTTOM + BOLT_SPEED
+    assert list(bolts.getPositions(ALIEN_BOLT)[1]) == [300+x-BOLT_SPEED for x in xs]
+
+    bolts.clear()
+    assert bolts.getCount(ALIEN_BOLT) == 0 and bolts.getCount(PLAYER_BOLT) == 0
+
+
+def test_cull():
+    """
+    Tests that culling removes only the bolts that left the screen.
+    """
+    bolts = BoltManager()
+    bolts.fire(PLAYER_BOLT, 100, GAME_HEIGHT - BOLT_SPEED/2)
+    ys = [BOLT_SPEED/2, 200, BOLT_SPEED, 3*BOLT_SPEED/2, 400]
+    for k in range(len(ys)):
+        bolts.fire(ALIEN_BOLT, k, ys[k])
+    bolts.move()
+    bolts.cull()
+    assert bolts.getCount(PLAYER_BOLT) == 0
+    xs, ys = bolts.getPositions(ALIEN_BOLT)
+    assert list(xs) == [1, 3, 4]
+    assert list(ys) == [200-BOLT_SPEED, BOLT_SPEED/2, 400-BOLT_SPEED]
+
+
+def test_volley():
+    """
+    Tests that a volley holds the columns that fire and keeps to the bolt limit.
+    """
+    rng = random.Random(6)
+    formation = Formation()
+    bolts = BoltManager()
+    gunner = FireScheduler('spread', size=3, cooldown=2, limit=5)
+    assert gunner.getCooldown() == 2.0
+    fired = gunner.volley(formation, bolts, 0, rng)
+    assert len(fired) == 3 and len(set(fired)) == 3
+    assert bolts.getCount(ALIEN_BOLT) == 3
+    xs, ys = bolts.getPositions(ALIEN_BOLT)
+    bottom = formation.getRows()-1
+    assert list(xs) == [formation.getX(bottom, col) for col in fired]
+    assert (ys == formation.getY(bottom, 0)).all()
+    for x in range(100):
+        assert not formation.pickShooter(rng)[1] in fired
+
+    # Only two more bolts fit under the limit
+    assert len(gunner.volley(formation, bolts, 0, rng)) == 2
+    assert gunner.volley(formation, bolts, 0, rng) == []
+    assert bolts.getCount(ALIEN_BOLT) == 5
+
+
+def test_volley_patterns():
+    """
+    Tests that a single volley fires one bolt and an aimed one fires nearest the target.
+    """
+    rng = random.Random(6)
+    formation = Formation()
+    bolts = BoltManager()
+    assert len(FireScheduler('single', size=3).volley(formation, bolts, 0, rng)) == 1
+
+    formation = Formation()
+    target = formation.getX(0, formation.getCols()-1) + 1
+    aimed = FireScheduler('aimed', size=3)
+    assert aimed.volley(formation, bolts, target, rng) == [formation.getCols()-1]
+    if formation.getCols() > 2:
+        assert aimed.volley(formation, bolts, target, rng) == [formation.getCols()-2]
+
+
+def _scanHits(formation, x, y0, y1):
+    """
+    Returns the hits of a bolt on formation, by testing every live alien.
+
+    The hits are in the order of Formation.findHits: the rows the bolt
+    reached first come first, and the columns go left to right.
+
+    Parameter formation: the formation to test
+    Precondition: formation is a Formation object
+
+    Parameter x: the x-coordinate of the bolt
+    Precondition: x is a number
+
+    Parameter y0: the y-coordinate of the bolt before it moved
+    Precondition: y0 is a number
+
+    Parameter y1: the y-coordinate of the bolt after it moved
+    Precondition: y1 is a number
+    """
+    cellX, cellY = formation.getCells()
+    dx, dy = formation.getOffset()
+    ax = (cellX + dx)[None, :]
+    ay = (cellY + dy)[:, None]
+    hit = (formation.getAlive() &
+           (np.abs(ax - x) < ALIEN_WIDTH/2 + BOLT_WIDTH) &
+           (min(y0, y1) - BOLT_HEIGHT < ay + ALIEN_HEIGHT/2) &
+           (max(y0, y1) + BOLT_HEIGHT > ay - ALIEN_HEIGHT/2))
+    hits = [(int(row), int(col)) for row, col in np.argwhere(hit)]
+    if y1 > y0:
+        hits.sort(key=lambda cell: (-cell[0], cell[1]))
+    return hits
+
+
+def _randomFormation(rng):
+    """
+    Returns a formation with random aliens killed and a random offset.
+
+    Parameter rng: the source of random numbers
+    Precondition: rng is a random.Random object
+    """
+    formation = Formation()
+    cells = _killAll(formation, rng)
+    for row, col in cells[:rng.randrange(len(cells))]:
+        formation.kill(row, col)
+    formation.march(rng.randrange(-20, 20)*ALIEN_H_WALK, -rng.randrange(10)*ALIEN_V_SEP)
+    return formation
+
+
+def test_find_hits():
+    """
+    Tests that findHits finds the same aliens as a scan of the alive mask.
+    """
+    rng = random.Random(7)
+    found = 0
+    for trial in range(50):
+        formation = _randomFormation(rng)
+        for bolt in range(500):
+            x = rng.uniform(0, GAME_WIDTH)
+            y = rng.uniform(0, GAME_HEIGHT)
+            hits = formation.findHits(x, y, y)
+            assert hits == _scanHits(formation, x, y, y)
+            found += len(hits)
+    assert found > 0
+
+
+def test_find_hits_edges():
+    """
+    Tests the lattice index arithmetic of findHits at the edges of each band.
+
+    A bolt just inside, on, or just outside the reach of an alien must be
+    looked up in the same cells that a scan finds.
+    """
+    reachx = ALIEN_WIDTH/2 + BOLT_WIDTH
+    reachy = ALIEN_HEIGHT/2 + BOLT_HEIGHT
+    for offset in ((0, 0), (3*ALIEN_H_WALK, -2*ALIEN_V_SEP), (-0.5, 0.25)):
+        formation = Formation()
+        formation.march(*offset)
+        cellX, cellY = formation.getCells()
+        dx, dy = formation.getOffset()
+        xs = [x + dx + side*reachx + nudge for x in cellX
+              for side in (-1, 1) for nudge in (-1e-6, 0, 1e-6)]
+        ys = [y + dy + side*reachy + nudge for y in cellY
+              for side in (-1, 1) for nudge in (-1e-6, 0, 1e-6)]
+        for x in xs:
+            for y in ys:
+                assert formation.findHits(x, y, y) == _scanHits(formation, x, y, y)
+
+
+def test_find_hits_swept():
+    """
+    Tests that findHits covers the whole path of a bolt, in the order it was taken.
+    """
+    formation = Formation()
+    bottom = formation.getRows()-1
+    x = formation.getX(bottom, 0)
+    below = formation.getY(bottom, 0) - ALIEN_HEIGHT - 2*BOLT_HEIGHT
+    above = formation.getY(bottom, 0) + ALIEN_HEIGHT/2 + BOLT_HEIGHT + 1
+    # Neither end of the path touches the alien, but the path crosses it
+    assert _scanHits(formation, x, below, below) == []
+    assert formation.findHits(x, below, above)[0] == (bottom, 0)
+    assert formation.findHits(x, above, below)[-1] == (bottom, 0)
+
+    rng = random.Random(9)
+    found = 0
+    for trial in range(50):
+        formation = _randomFormation(rng)
+        for bolt in range(300):
+            x = rng.uniform(0, GAME_WIDTH)
+            y0 = rng.uniform(0, GAME_HEIGHT)
+            y1 = y0 + rng.choice((-1, 1))*rng.uniform(0, 4*BOLT_SPEED)
+            hits = formation.findHits(x, y0, y1)
+            assert hits == _scanHits(formation, x, y0, y1)
+            found += len(hits) > 1
+    assert found > 0
+
+
+def test_remove_many():
+    """
+    Tests that removing a batch of bolts keeps the rest in order.
+    """
+    bolts = BoltManager()
+    for k in range(10):
+        bolts.fire(ALIEN_BOLT, k, 100+k)
+    bolts.removeMany(ALIEN_BOLT, [])
+    assert bolts.getCount(ALIEN_BOLT) == 10
+    bolts.removeMany(ALIEN_BOLT, [9, 0, 4, 3])
+    xs, ys = bolts.getPositions(ALIEN_BOLT)
+    assert list(xs) == [1, 2, 5, 6, 7, 8]
+    assert list(ys) == [101, 102, 105, 106, 107, 108]
+    bolts.removeMany(ALIEN_BOLT, range(6))
+    assert bolts.getCount(ALIEN_BOLT) == 0
+
+
+def test_resolve_hits():
+    """
+    Tests that each update applies exactly the hits it reports.
+    """
+    rng = random.Random(10)
+    wave = Wave(seed=10, headless=True)
+    input = StubInput()
+    killed = 0
+    while wave.getLives() > 0 and wave.hasAliens():
+        if not wave.hasShip():
+            wave.clearBolts()
+            wave.restoreShip()
+        input.setKeys(rng.choice(((), ('left',), ('right',))) + ('up',))
+        before = wave.getAlienGrid().copy()
+        lives = wave.getLives()
+        wave.update(input, 1/60)
+
+        hits = wave.getHits()
+        targets = [hit.target for hit in hits if hit.owner == PLAYER_BOLT]
+        assert len(set(targets)) == len(targets)
+        assert set(zip(*np.nonzero(before & ~wave.getAlienGrid()))) == set(targets)
+        ship = [hit for hit in hits if hit.owner == ALIEN_BOLT]
+        assert len(ship) <= 1 and all(hit.target == None for hit in ship)
+        assert lives - wave.getLives() == len(ship)
+        assert wave.hasShip() == (len(ship) == 0)
+        killed += len(targets)
+    assert killed > 0
+
+
+def test_timers():
+    """
+    Tests that timers are due in order, and that periodic timers keep their cadence.
+    """
+    timers = TimerQueue()
+    timers.schedule('c', 0.3)
+    timers.schedule('a', 0.1)
+    timers.schedule('b', 0.2)
+    timers.schedule('tie', 0.2)
+    assert timers.advance(0.05) == []
+    assert timers.advance(0.2) == ['a', 'b', 'tie']
+    assert timers.isPending('c') and not timers.isPending('a')
+    assert timers.advance(0.1) == ['c']
+    assert timers.getClock() == 0.35
+
+    timers.schedule('tick', 0.5, 0.5)
+    assert timers.advance(1.6) == ['tick', 'tick', 'tick']
+    assert timers.advance(0.3) == []
+    assert timers.advance(0.2) == ['tick']
+    assert timers.isPending('tick')
+
+
+def test_timers_cancel():
+    """
+    Tests that a cancelled or rescheduled timer is only due at its new time.
+    """
+    timers = TimerQueue()
+    timers.schedule('fire', 1)
+    timers.schedule(('cool', 3), 1)
+    timers.cancel(('cool', 3))
+    timers.schedule('fire', 2)
+    assert timers.advance(1.5) == []
+    assert not timers.isPending(('cool', 3))
+    assert timers.advance(0.5) == ['fire']
+    timers.cancel('nothing')
+    assert timers.advance(10) == []
+
+
+def _play(seed, frames):
+    """
+    Returns the states of a wave with the given seed over a number of updates.
+
+    The ship fires and moves back and forth, and is restored when destroyed.
+
+    Parameter seed: the seed of the wave
+    Precondition: seed is an int >= 0
+
+    Parameter frames: the number of updates
+    Precondition: frames is an int >= 0
+    """
+    wave = Wave(seed=seed, headless=True)
+    assert wave.getSeed() == seed
+    input = StubInput()
+    states = []
+    for frame in range(frames):
+        if not wave.hasShip():
+            wave.clearBolts()
+            wave.restoreShip()
+        input.setKeys(('up', 'left' if frame % 240 < 120 else 'right'))
+        wave.update(input, 1/60)
+        bolts = wave.getBoltPositions(ALIEN_BOLT)
+        states.append((wave.getLives(), wave.getShipX(), wave.getAlienOffset(),
+                       wave.getAlienGrid().tobytes(), bolts[0].tobytes(), bolts[1].tobytes()))
+    return states
+
+
+def test_seed():
+    """
+    Tests that a wave only depends on its seed, and not on other waves.
+    """
+    first = _play(12, 2000)
+    random.seed(0)
+    Wave(seed=99, headless=True)
+    assert _play(12, 2000) == first
+    assert _play(13, 2000) != first
+    assert Wave(headless=True).getSeed() >= 0
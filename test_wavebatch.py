@@ -0,0 +1,84 @@
+"""
+Unit tests for the wavebatch module of Alien Invaders
+
+These tests play a WaveBatch next to a Wave for every game in the batch and
+check that they follow the same rules.  Neither needs a window.  To run them,
+type
+
+    python -m pytest test_wavebatch.py
+
+Author: agent
+Date: October 18, 2026
+"""
+import os
+# Kivy reads the command line when it is imported; these options are pytest's
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+import wave
+import wavebatch
+from wave import Wave
+from wavebatch import WaveBatch
+from headless import StubInput
+from consts import *
+import numpy as np
+
+
+# The keys held down in each game, and the same keys as WaveBatch actions
+KEYS = (('up', 'left'), ('up',), ('up', 'right'), (), ('left',))
+ACTIONS = np.array([ACTION_FIRE|ACTION_LEFT, ACTION_FIRE, ACTION_FIRE|ACTION_RIGHT,
+                    0, ACTION_LEFT])
+
+
+def test_parity(monkeypatch):
+    """
+    Tests that each game of a batch matches a Wave frame for frame.
+
+    A Wave and a batch draw different random numbers, so the aliens never
+    fire in this test.  Everything else (the ship, its bolt, the march, the
+    hits and the end of a game) must then be the same.
+    """
+    monkeypatch.setattr(wave, 'BOLT_RATE', 10**9)
+    monkeypatch.setattr(wavebatch, 'BOLT_RATE', 10**9)
+    batch = WaveBatch(len(KEYS), seed=1)
+    waves = [Wave(seed=1, headless=True) for keys in KEYS]
+    inputs = [StubInput(keys) for keys in KEYS]
+    for frame in range(6000):
+        for wave_, input in zip(waves, inputs):
+            if wave_.getLives() > 0 and wave_.hasAliens():
+                wave_.update(input, 1/60)
+        batch.update(ACTIONS, 1/60)
+
+        dx, dy = batch.getOffsets()
+        on, px, py = batch.getPlayerBolts()
+        for game in range(len(waves)):
+            wave_ = waves[game]
+            assert (wave_.getAlienGrid() == batch.getAlive()[game]).all()
+            assert wave_.getAlienOffset() == (dx[game], dy[game])
+            assert wave_.getLives() == batch.getLives()[game]
+            assert wave_.getShipX() == batch.getShipX()[game]
+            xs, ys = wave_.getBoltPositions(PLAYER_BOLT)
+            assert len(xs) == on[game]
+            if on[game]:
+                assert (xs[0], ys[0]) == (px[game], py[game])
+            assert batch.getDone()[game] == (wave_.getLives() == 0 or not wave_.hasAliens())
+    assert (batch.getAlienCounts() < ALIEN_ROWS*ALIENS_IN_ROW).any()
+
+
+def test_independent():
+    """
+    Tests that a game of a batch only depends on its own seed and actions.
+    """
+    big = WaveBatch(3, seed=40)
+    small = WaveBatch(1, seed=41)
+    assert list(big.getSeeds()) == [40, 41, 42]
+    for frame in range(3000):
+        big.update(ACTIONS[:3], 1/60)
+        small.update(ACTIONS[1:2], 1/60)
+        assert (big.getAlive()[1] == small.getAlive()[0]).all()
+        assert big.getLives()[1] == small.getLives()[0]
+        assert big.getShipX()[1] == small.getShipX()[0]
+        on, xs, ys = big.getAlienBolts()
+        son, sxs, sys = small.getAlienBolts()
+        assert (on[1] == son[0]).all()
+        assert (xs[1][on[1]] == sxs[0][son[0]]).all()
+        assert (ys[1][on[1]] == sys[0][son[0]]).all()
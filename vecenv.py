@@ -0,0 +1,400 @@
+"""
+Process-pool vector environment for Alien Invaders
+
+This module contains the class VecInvadersEnv, which plays many copies of
+InvadersEnv (see the module invadersenv) at once, spread over several
+worker processes.  It is meant for collecting rollouts on every core of a
+machine.
+
+The actions, observations, rewards and done flags of all the environments
+live in blocks of shared memory (see multiprocessing.shared_memory).  The
+workers write their results straight into those blocks, and the parent
+sees them as numpy arrays without copying.  The only messages sent to a
+worker are short commands such as 'step', so nothing is pickled per
+environment.  For example
+
+    envs = VecInvadersEnv(64, workers=4, seed=0)
+    obs = envs.reset()
+    for _ in range(1000):
+        obs, rewards, dones, truncated = envs.step(actions)
+    envs.close()
+
+An environment that is done is reset by its worker at the end of the same
+step, so the observation returned for it is the first observation of the
+next episode.  As in InvadersEnv, the arrays returned are always the same
+arrays and are overwritten by the next step.
+
+To measure the speed of a pool from the command line, type
+
+    python vecenv.py --envs 64 --workers 4 --steps 2000
+
+Author: agent
+Date: October 18, 2026
+"""
+import os
+# Kivy reads the command line when it is imported; these options are ours
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from consts import *
+from invadersenv import InvadersEnv
+from multiprocessing import shared_memory
+import multiprocessing
+import numpy as np
+import argparse
+import random
+import time
+
+
+# The shared arrays as (name, dtype, length of a row); a row per environment
+SHARED_ARRAYS = (('actions',   np.int8,    1),
+                 ('obs',       np.float32, InvadersEnv.OBSERVATION_SIZE),
+                 ('rewards',   np.float64, 1),
+                 ('dones',     np.bool_,   1),
+                 ('truncated', np.bool_,   1))
+
+
+def _views(blocks, count):
+    """
+    Returns a dictionary of numpy arrays over the shared memory blocks.
+
+    The keys are the names in SHARED_ARRAYS, and each array has one row per
+    environment.  Arrays with rows of length 1 are flat.
+
+    Parameter blocks: the shared memory blocks
+    Precondition: blocks is a list of SharedMemory objects in the order of
+    SHARED_ARRAYS, each large enough for count rows
+
+    Parameter count: the number of environments
+    Precondition: count is an int > 0
+    """
+    arrays = {}
+    for (key, dtype, width), block in zip(SHARED_ARRAYS, blocks):
+        shape = (count,) if width == 1 else (count, width)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return arrays
+
+
+def _work(conn, names, count, start, stop, dt, limit):
+    """
+    Plays the environments start..stop-1 of a pool until told to close.
+
+    This function is run by each worker process.  It waits for a command on
+    conn, carries it out on its environments, and then sends None back to
+    say that it is done.  The commands are
+
+        ('reset', seed): resets every environment (seed may be None)
+        ('step', None):  steps every environment with its shared action
+        ('close', None): stops the worker
+
+    Parameter conn: the worker end of a pipe to the parent
+    Precondition: conn is a Connection object
+
+    Parameter names: the names of the shared memory blocks
+    Precondition: names is a list of strings in the order of SHARED_ARRAYS
+
+    Parameter count: the number of environments in the pool
+    Precondition: count is an int > 0
+
+    Parameter start: the first environment of this worker
+    Precondition: start is an int in 0..count-1
+
+    Parameter stop: one past the last environment of this worker
+    Precondition: stop is an int in start+1..count
+
+    Parameter dt: the seconds of game time in one step
+    Precondition: dt is a number > 0
+
+    Parameter limit: the most steps in an episode, or None for no limit
+    Precondition: limit is None or an int > 0
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    arrays = _views(blocks, count)
+    actions = arrays['actions']
+    obs = arrays['obs']
+    rewards = arrays['rewards']
+    dones = arrays['dones']
+    truncated = arrays['truncated']
+
+    envs = [InvadersEnv(dt, limit, obs[i]) for i in range(start, stop)]
+    seeds = [None]*len(envs)
+    try:
+        while True:
+            command, arg = conn.recv()
+            if command == 'step':
+                for k, env in enumerate(envs):
+                    i = start+k
+                    _, reward, done, info = env.step(int(actions[i]))
+                    rewards[i] = reward
+                    dones[i] = done
+                    truncated[i] = info['truncated']
+                    if done:
+                        if seeds[k] != None:
+                            seeds[k] += count
+                        env.reset(seeds[k])
+            elif command == 'reset':
+                for k, env in enumerate(envs):
+                    seeds[k] = None if arg == None else arg+start+k
+                    env.reset(seeds[k])
+                rewards[start:stop] = 0
+                dones[start:stop] = False
+                truncated[start:stop] = False
+            elif command == 'close':
+                break
+            conn.send(None)
+    finally:
+        # The numpy views must go before the blocks can be closed
+        del actions, obs, rewards, dones, truncated, arrays, envs
+        for block in blocks:
+            block.close()
+        conn.close()
+
+
+class VecInvadersEnv(object):
+    """
+    This class plays many InvadersEnv environments at once in worker processes.
+
+    The environments are split into nearly equal slices, one per worker.
+    Calls to reset and step are sent to every worker at once, and return
+    when every worker has finished, so the workers play in parallel.
+
+    The observations are a float32 array with one row per environment, and
+    the rewards, done flags and truncated flags are arrays with one entry
+    per environment.  All of them are views of shared memory.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _count: the number of environments
+    # Invariant: _count is an int > 0
+    #
+    # Attribute _seed: the seed of the first environment on the next reset
+    # Invariant: _seed is an int >= 0
+    #
+    # Attribute _blocks: the shared memory blocks
+    # Invariant: _blocks is a list of SharedMemory objects, in the order of
+    # SHARED_ARRAYS, or empty once the pool is closed
+    #
+    # Attribute _arrays: the numpy views of the shared memory blocks
+    # Invariant: _arrays is a dictionary from the names in SHARED_ARRAYS to
+    # arrays with one row per environment, or None once the pool is closed
+    #
+    # Attribute _conns: the parent ends of the pipes to the workers
+    # Invariant: _conns is a list of Connection objects, one per worker, or
+    # empty once the pool is closed
+    #
+    # Attribute _procs: the worker processes
+    # Invariant: _procs is a list of Process objects, one per worker
+
+    # GETTERS AND SETTERS
+    def getCount(self):
+        """
+        Returns the number of environments.
+        """
+        return self._count
+
+    def getWorkers(self):
+        """
+        Returns the number of worker processes.
+        """
+        return len(self._procs)
+
+    def getObservationSize(self):
+        """
+        Returns the length of the observation of one environment.
+        """
+        return InvadersEnv.OBSERVATION_SIZE
+
+    def getSeed(self):
+        """
+        Returns the seed of the first environment on the next reset.
+
+        Environment i is reset with the seed getSeed()+i.  After that, each
+        environment adds getCount() to its seed whenever it starts a new
+        episode, so no two episodes of a pool share a seed.
+        """
+        return self._seed
+
+    def isClosed(self):
+        """
+        Returns True if the pool has been closed.
+        """
+        return self._arrays == None
+
+    # INITIALIZER
+    def __init__(self, count, workers=None, dt=1/60, limit=None, seed=None):
+        """
+        Initializes a pool of count environments and starts its workers.
+
+        Call reset before the first step, and close when you are done with
+        the pool.  If seed is None, a random seed is chosen, so the pool is
+        still reproducible with getSeed().
+
+        Parameter count: the number of environments
+        Precondition: count is an int > 0
+
+        Parameter workers: the number of worker processes, or None for one
+        per core (never more than count)
+        Precondition: workers is None or an int > 0
+
+        Parameter dt: the seconds of game time in one step
+        Precondition: dt is a number > 0
+
+        Parameter limit: the most steps in an episode, or None for no limit
+        Precondition: limit is None or an int > 0
+
+        Parameter seed: the seed of the first environment
+        Precondition: seed is None or an int >= 0
+        """
+        assert type(count) == int and count > 0, '%s is not a valid count' % repr(count)
+        assert workers == None or (type(workers) == int and workers > 0), \
+            '%s is not a valid number of workers' % repr(workers)
+        assert type(dt) in [int,float] and dt > 0, '%s is not a valid dt' % repr(dt)
+        if workers == None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, count)
+        if seed == None:
+            seed = random.SystemRandom().getrandbits(32)
+
+        self._count = count
+        self._seed = seed
+        self._blocks = []
+        self._arrays = None
+        self._conns = []
+        self._procs = []
+        try:
+            for key, dtype, width in SHARED_ARRAYS:
+                size = count*width*np.dtype(dtype).itemsize
+                self._blocks.append(shared_memory.SharedMemory(create=True, size=size))
+            names = [block.name for block in self._blocks]
+            self._arrays = _views(self._blocks, count)
+            self._arrays['actions'][:] = 0
+
+            for w in range(workers):
+                start = count*w//workers
+                stop = count*(w+1)//workers
+                conn, child = multiprocessing.Pipe()
+                proc = multiprocessing.Process(target=_work, daemon=True,
+                    args=(child, names, count, start, stop, dt, limit))
+                proc.start()
+                child.close()
+                self._conns.append(conn)
+                self._procs.append(proc)
+        except:
+            self.close()
+            raise
+
+    # METHODS TO PLAY
+    def reset(self, seed=None):
+        """
+        Resets every environment and returns the array of observations.
+
+        Parameter seed: the seed of the first environment, or None to
+        keep the current seed
+        Precondition: seed is None or an int >= 0
+        """
+        if seed != None:
+            self._seed = seed
+        self._command('reset', self._seed)
+        return self._arrays['obs']
+
+    def step(self, actions):
+        """
+        Steps every environment and returns (observations, rewards, dones, truncated).
+
+        The results are arrays with one entry (or row) per environment.
+
+        Parameter actions: the action of each environment
+        Precondition: actions is an int or a sequence of getCount() ints,
+        each one of the actions of InvadersEnv
+        """
+        self._arrays['actions'][:] = actions
+        self._command('step', None)
+        arrays = self._arrays
+        return (arrays['obs'], arrays['rewards'], arrays['dones'], arrays['truncated'])
+
+    def close(self):
+        """
+        Stops the workers and frees the shared memory.
+
+        The arrays returned by reset and step may not be used after this.
+        It is safe to close a pool more than once.
+        """
+        for conn in self._conns:
+            try:
+                conn.send(('close', None))
+            except (OSError, EOFError):
+                pass
+        for proc in self._procs:
+            proc.join(1)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+
+        self._arrays = None
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                # Someone still holds an array; the memory goes with it
+                pass
+            block.unlink()
+        self._blocks = []
+
+    # HELPER METHODS
+    def _command(self, command, arg):
+        """
+        Sends a command to every worker and waits for all of them to finish.
+
+        Parameter command: the command to send
+        Precondition: command is 'reset' or 'step'
+
+        Parameter arg: the argument of the command
+        Precondition: arg is an int or None
+        """
+        assert not self.isClosed(), 'the pool has been closed'
+        for conn in self._conns:
+            conn.send((command, arg))
+        for conn in self._conns:
+            conn.recv()
+
+
+def main():
+    """
+    Plays a pool of random environments and reports the steps per second.
+    """
+    parser = argparse.ArgumentParser(description='Play many Alien Invaders environments at once.')
+    parser.add_argument('layout', nargs='*',
+                        help='rows, aliens in a row and alien speed (read by consts.py, '
+                             'so they must come before the options)')
+    parser.add_argument('--envs', type=int, default=64, help='the number of environments')
+    parser.add_argument('--workers', type=int, default=None, help='the number of worker processes')
+    parser.add_argument('--steps', type=int, default=2000, help='the steps to play')
+    parser.add_argument('--seed', type=int, default=None, help='the seed of the first environment')
+    args = parser.parse_args()
+    if args.layout != LAYOUT_ARGS:
+        parser.error('the layout must come before the options')
+
+    envs = VecInvadersEnv(args.envs, args.workers, seed=args.seed)
+    try:
+        rng = np.random.default_rng(envs.getSeed())
+        actions = np.zeros(args.envs, dtype=np.int8)
+        envs.reset()
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            actions[:] = rng.integers(0, InvadersEnv.ACTION_COUNT, args.envs)
+            obs, rewards, dones, truncated = envs.step(actions)
+            episodes += int(dones.sum())
+        elapsed = time.perf_counter() - start
+    finally:
+        envs.close()
+
+    print('%d environments on %d workers: %d steps, %d episodes' %
+          (args.envs, envs.getWorkers(), args.steps, episodes))
+    if elapsed > 0:
+        print('%.0f environment steps per second' % (args.envs*args.steps/elapsed))
+
+
+# Application code
+if __name__ == '__main__':
+    main()
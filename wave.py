@@ -13,19 +13,978 @@ models.py. Whether a helper method belongs in this module or models.py is
 often a complicated issue.  If you do not know, ask on Piazza and we will
 answer.
 
+The positions of the aliens are not stored in the Alien objects themselves.
+They are stored in the helper class Formation, which keeps the whole grid in
+NumPy arrays so that Wave can move and test every alien at once.  Likewise,
+the laser bolts are stored in the helper class BoltManager, and the helper
+class FireScheduler decides which aliens fire.
+
 Authors: Chelsie Beavers cdb95 and Babafemi Badero bkb55
 Date: December 12, 2019
 """
-from game2d import *
 from consts import *
-from models import *
+try:
+    from game2d import *
+    from models import *
+except ImportError:
+    pass # Without Kivy, a Wave can still be made with headless=True
+import math
 import random
+import collections
+import heapq
+import numpy as np
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not
 # permitted to access anything in their parent. To see why, take CS 3152)
 
 
+# A collision between a bolt and its target, found by Wave._detectHits.
+# owner is PLAYER_BOLT or ALIEN_BOLT, slot is the slot of the bolt in the
+# BoltManager, and target is the (row, col) of an alien or None for the ship.
+Hit = collections.namedtuple('Hit', ['owner', 'slot', 'target'])
+
+
+class Formation(object):
+    """
+    This class stores the grid of aliens in a single wave.
+
+    The aliens march as one rigid block, so there is no reason to move them
+    one at a time.  Instead, every alien has a fixed cell in a lattice, and
+    the whole formation has a single offset from its starting position.  A
+    step only changes that offset, and the position of an alien is its cell
+    plus the offset.  The formation also keeps a NumPy mask of which aliens
+    are still alive and the index (into ALIEN_IMAGES) of the image for each
+    alien, so edge detection and collisions are whole-array operations.
+
+    Because the aliens sit on a regular lattice, the position of a bolt
+    tells us directly which (at most two) aliens it could hit.  Finding the
+    aliens hit by a bolt does not look at the rest of the grid.
+
+    The formation also counts the live aliens in every row and column.  These
+    counts are updated whenever an alien is destroyed, so the outer-most live
+    columns, the lowest live row and the number of live aliens are always
+    known without looking at the grid.
+
+    Finally, the formation keeps an index of the columns that still have a
+    live alien, together with the bottom-most live alien in each of them.
+    Only those aliens may fire, so picking a shooter is a single random
+    choice from that index.  A column can be held out of the index while it
+    is cooling down after firing (see FireScheduler).
+
+    The Alien objects are only used for drawing.  They are placed at their
+    lattice cells inside a GScene, and the offset is the position of that
+    scene.  Hence a step moves every image with one shared transform.  The
+    images are not made until the formation is first drawn, so a formation
+    that is never drawn does not need Kivy at all.
+
+    Row 0 is the top row of the formation and column 0 is the left column.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _cellX: the starting x-coordinate of each column
+    # Invariant: _cellX is a float array of length ALIENS_IN_ROW
+    #
+    # Attribute _cellY: the starting y-coordinate of each row
+    # Invariant: _cellY is a float array of length ALIEN_ROWS
+    #
+    # Attribute _dx: how far the formation has moved horizontally
+    # Invariant: _dx is a float
+    #
+    # Attribute _dy: how far the formation has moved vertically
+    # Invariant: _dy is a float
+    #
+    # Attribute _alive: which aliens have not been destroyed
+    # Invariant: _alive is a bool array of shape (ALIEN_ROWS, ALIENS_IN_ROW)
+    #
+    # Attribute _rowCount: the number of live aliens in each row
+    # Invariant: _rowCount is an int array of length ALIEN_ROWS
+    #
+    # Attribute _colCount: the number of live aliens in each column
+    # Invariant: _colCount is an int array of length ALIENS_IN_ROW
+    #
+    # Attribute _count: the number of live aliens
+    # Invariant: _count is an int equal to the sum of _rowCount
+    #
+    # Attribute _leftCol: the left-most column with a live alien
+    # Invariant: _leftCol is an int; _colCount[_leftCol] > 0 if _count > 0
+    #
+    # Attribute _rightCol: the right-most column with a live alien
+    # Invariant: _rightCol is an int; _colCount[_rightCol] > 0 if _count > 0
+    #
+    # Attribute _lowRow: the bottom-most row with a live alien
+    # Invariant: _lowRow is an int; _rowCount[_lowRow] > 0 if _count > 0
+    #
+    # Attribute _bottomRow: the bottom-most live row in each column
+    # Invariant: _bottomRow is an int array of length ALIENS_IN_ROW; an entry
+    # is -1 if that column is empty
+    #
+    # Attribute _shooters: the columns that have at least one live alien and
+    # are not being held
+    # Invariant: _shooters is a list of distinct column indices (any order)
+    #
+    # Attribute _shooterPos: the position of each column in _shooters
+    # Invariant: _shooterPos is an int array of length ALIENS_IN_ROW, with
+    # _shooters[_shooterPos[c]] == c for every column c in _shooters, and -1
+    # for the other columns
+    #
+    # Attribute _kind: the image of each alien
+    # Invariant: _kind is an int array of indices into ALIEN_IMAGES with the
+    # same shape as _alive
+    #
+    # Attribute _sprites: the images used to draw the aliens
+    # Invariant: _sprites is a rectangular 2d list of Alien objects, each
+    # positioned at its lattice cell, or None if the formation was never drawn
+    #
+    # Attribute _scene: the scene holding the images of the live aliens
+    # Invariant: _scene is a GScene at position (_dx, _dy), or None if the
+    # formation was never drawn
+
+    # GETTERS AND SETTERS
+    def getX(self, row, col):
+        """
+        Returns the x-coordinate of the alien at (row, col).
+        """
+        return float(self._cellX[col]) + self._dx
+
+    def getY(self, row, col):
+        """
+        Returns the y-coordinate of the alien at (row, col).
+        """
+        return float(self._cellY[row]) + self._dy
+
+    def getRows(self):
+        """
+        Returns the number of rows in the formation.
+        """
+        return self._alive.shape[0]
+
+    def getCols(self):
+        """
+        Returns the number of columns in the formation.
+        """
+        return self._alive.shape[1]
+
+    def isAlive(self, row, col):
+        """
+        Returns True if the alien at (row, col) has not been destroyed.
+        """
+        return bool(self._alive[row, col])
+
+    def getAlive(self):
+        """
+        Returns the bool array of which aliens have not been destroyed.
+
+        The array has one row per row of aliens, with row 0 on top.  It
+        belongs to the formation; do not change it.
+        """
+        return self._alive
+
+    def getCells(self):
+        """
+        Returns the starting positions (cellX, cellY) of the columns and rows.
+
+        The position of the alien at (row, col) is (cellX[col] + dx,
+        cellY[row] + dy), where (dx, dy) is getOffset().  The arrays belong
+        to the formation; do not change them.
+        """
+        return (self._cellX, self._cellY)
+
+    # INITIALIZER
+    def __init__(self):
+        """
+        Initializes the aliens in their starting positions.
+
+        The top row is ALIEN_CEILING pixels below the top of the window and
+        the left column is ALIEN_H_SEP pixels from the left edge.
+        """
+        rows = np.arange(ALIEN_ROWS)
+        cols = np.arange(ALIENS_IN_ROW)
+        top = GAME_HEIGHT - ALIEN_CEILING - (ALIEN_HEIGHT//2)
+        left = ALIEN_H_SEP + (ALIEN_WIDTH//2)
+
+        self._cellX = (left + cols*(ALIEN_H_SEP + ALIEN_WIDTH)).astype(float)
+        self._cellY = (top - rows*(ALIEN_HEIGHT + ALIEN_V_SEP)).astype(float)
+        self._dx = 0.0
+        self._dy = 0.0
+        self._alive = np.ones((ALIEN_ROWS, ALIENS_IN_ROW), dtype=bool)
+
+        self._rowCount = np.full(ALIEN_ROWS, ALIENS_IN_ROW, dtype=int)
+        self._colCount = np.full(ALIENS_IN_ROW, ALIEN_ROWS, dtype=int)
+        self._count = ALIEN_ROWS*ALIENS_IN_ROW
+        self._leftCol = 0
+        self._rightCol = ALIENS_IN_ROW-1
+        self._lowRow = ALIEN_ROWS-1
+
+        self._bottomRow = np.full(ALIENS_IN_ROW, ALIEN_ROWS-1, dtype=int)
+        self._shooters = list(range(ALIENS_IN_ROW))
+        self._shooterPos = np.arange(ALIENS_IN_ROW)
+
+        # Rows 1-2 use the first image, rows 3-4 the second, rows 0 the third
+        kinds = np.array([2, 0, 0, 1, 1])[rows % 5]
+        self._kind = np.tile(kinds[:, None], (1, ALIENS_IN_ROW))
+
+        self._sprites = None
+        self._scene = None
+
+    # METHODS TO MOVE AND QUERY THE FORMATION
+    def march(self, dx, dy):
+        """
+        Moves every alien in the formation by (dx, dy).
+
+        Parameter dx: the horizontal distance to move
+        Precondition: dx is a number (int or float)
+
+        Parameter dy: the vertical distance to move
+        Precondition: dy is a number (int or float)
+        """
+        self._dx += dx
+        self._dy += dy
+        if self._scene != None:
+            self._scene.x = self._dx
+            self._scene.y = self._dy
+
+    def getBottomRow(self, col):
+        """
+        Returns the bottom-most row with a live alien in column col.
+
+        If the column is empty, this method returns -1.
+        """
+        return int(self._bottomRow[col])
+
+    def pickShooter(self, rng):
+        """
+        Returns the (row, col) of a random alien that is allowed to fire.
+
+        Only the bottom-most live alien in each column can fire, and every
+        non-empty column is equally likely.  If there are no live aliens,
+        this method returns None.
+
+        Parameter rng: the source of random numbers
+        Precondition: rng is a random.Random object
+        """
+        if len(self._shooters) == 0:
+            return None
+        col = self._shooters[rng.randrange(len(self._shooters))]
+        return (int(self._bottomRow[col]), col)
+
+    def nearestShooter(self, x):
+        """
+        Returns the (row, col) of the alien allowed to fire that is closest to x.
+
+        If no alien is allowed to fire, this method returns None.
+
+        Parameter x: the x-coordinate to aim at
+        Precondition: x is a number (int or float)
+        """
+        if len(self._shooters) == 0:
+            return None
+        cols = np.array(self._shooters)
+        col = int(cols[np.argmin(np.abs(self._cellX[cols] + self._dx - x))])
+        return (int(self._bottomRow[col]), col)
+
+    def holdShooter(self, col):
+        """
+        Stops the aliens in column col from being picked to fire.
+
+        Parameter col: the column to hold
+        Precondition: col is a valid column index
+        """
+        if self._shooterPos[col] != -1:
+            self._unindex(col)
+
+    def releaseShooter(self, col):
+        """
+        Allows the aliens in column col to be picked to fire again.
+
+        Nothing happens if the column is empty or was not held.
+
+        Parameter col: the column to release
+        Precondition: col is a valid column index
+        """
+        if self._colCount[col] > 0 and self._shooterPos[col] == -1:
+            self._shooterPos[col] = len(self._shooters)
+            self._shooters.append(col)
+
+    def getCount(self):
+        """
+        Returns the number of aliens still alive.
+        """
+        return self._count
+
+    def getLeft(self):
+        """
+        Returns the x-coordinate of the left-most live alien center.
+
+        Precondition: at least one alien is alive.
+        """
+        return float(self._cellX[self._leftCol]) + self._dx
+
+    def getRight(self):
+        """
+        Returns the x-coordinate of the right-most live alien center.
+
+        Precondition: at least one alien is alive.
+        """
+        return float(self._cellX[self._rightCol]) + self._dx
+
+    def getBottom(self):
+        """
+        Returns the y-coordinate of the bottom edge of the lowest live alien.
+
+        Precondition: at least one alien is alive.
+        """
+        return float(self._cellY[self._lowRow]) + self._dy - ALIEN_HEIGHT//2
+
+    def getOffset(self):
+        """
+        Returns the distance (dx, dy) the formation moved from its start.
+        """
+        return (self._dx, self._dy)
+
+    def findHits(self, x, y0, y1):
+        """
+        Returns the (row, col) pairs of the live aliens hit by a moving bolt.
+
+        The bolt moved straight from (x, y0) to (x, y1) during this update,
+        and it hits every alien that it touched anywhere along the way.  This
+        way a fast bolt cannot jump over an alien between two updates.  The
+        hits are listed in the order the bolt reached them.
+
+        The path of the bolt is turned into the range of lattice rows and
+        columns that it could touch, using the spacing of the aliens.  Only
+        the aliens in that range are tested, so this does not depend on the
+        size of the formation.
+
+        Parameter x: the x-coordinate of the bolt
+        Precondition: x is a number (int or float)
+
+        Parameter y0: the y-coordinate of the bolt before it moved
+        Precondition: y0 is a number (int or float)
+
+        Parameter y1: the y-coordinate of the bolt after it moved
+        Precondition: y1 is a number (int or float)
+        """
+        reachx = ALIEN_WIDTH/2 + BOLT_WIDTH
+        reachy = ALIEN_HEIGHT/2 + BOLT_HEIGHT
+        pitchx = ALIEN_WIDTH + ALIEN_H_SEP
+        pitchy = ALIEN_HEIGHT + ALIEN_V_SEP
+
+        # Columns go right from _cellX[0]; rows go down from _cellY[0]
+        localx = x - self._dx - self._cellX[0]
+        localtop = self._cellY[0] - (max(y0, y1) - self._dy)
+        localbot = self._cellY[0] - (min(y0, y1) - self._dy)
+        col0 = max(int(math.floor((localx - reachx)/pitchx)) + 1, 0)
+        col1 = min(int(math.ceil((localx + reachx)/pitchx)) - 1, self.getCols()-1)
+        row0 = max(int(math.floor((localtop - reachy)/pitchy)) + 1, 0)
+        row1 = min(int(math.ceil((localbot + reachy)/pitchy)) - 1, self.getRows()-1)
+
+        # A bolt moving up reaches the bottom rows first
+        rows = range(row0, row1+1)
+        if y1 > y0:
+            rows = reversed(rows)
+
+        hits = []
+        for row in rows:
+            for col in range(col0, col1+1):
+                if self.collides(row, col, x, y0, y1):
+                    hits.append((row, col))
+        return hits
+
+    def collides(self, row, col, x, y0, y1):
+        """
+        Returns True if the alien at (row, col) is hit by a moving bolt.
+
+        A bolt at (x, y) hits an alien when one of the corners of the box that
+        is BOLT_WIDTH by BOLT_HEIGHT around (x, y) lies inside the alien.  This
+        is the same test as Alien._collidesAlien, applied to every position of
+        the bolt as it moved from (x, y0) to (x, y1).
+
+        Parameter x: the x-coordinate of the bolt
+        Precondition: x is a number (int or float)
+
+        Parameter y0: the y-coordinate of the bolt before it moved
+        Precondition: y0 is a number (int or float)
+
+        Parameter y1: the y-coordinate of the bolt after it moved
+        Precondition: y1 is a number (int or float)
+        """
+        ay = self._cellY[row] + self._dy
+        return (bool(self._alive[row, col]) and
+                abs(self._cellX[col] + self._dx - x) < ALIEN_WIDTH/2 + BOLT_WIDTH and
+                min(y0, y1) - BOLT_HEIGHT < ay + ALIEN_HEIGHT/2 and
+                max(y0, y1) + BOLT_HEIGHT > ay - ALIEN_HEIGHT/2)
+
+    def kill(self, row, col):
+        """
+        Destroys the alien at (row, col).
+
+        Precondition: the alien at (row, col) is alive.
+        """
+        self._alive[row, col] = False
+        self._dropSprite(row, col)
+        self._rowCount[row] -= 1
+        self._colCount[col] -= 1
+        self._count -= 1
+        if self._colCount[col] == 0:
+            self._bottomRow[col] = -1
+            if self._shooterPos[col] != -1:
+                self._unindex(col)
+        elif self._bottomRow[col] == row:
+            above = row-1
+            while not self._alive[above, col]:
+                above -= 1
+            self._bottomRow[col] = above
+        if self._count == 0:
+            return
+
+        # Each boundary only moves inwards, so this is constant amortized time
+        while self._colCount[self._leftCol] == 0:
+            self._leftCol += 1
+        while self._colCount[self._rightCol] == 0:
+            self._rightCol -= 1
+        while self._rowCount[self._lowRow] == 0:
+            self._lowRow -= 1
+
+    def _unindex(self, col):
+        """
+        Removes column col from the index of shooters.
+
+        The last column in the index takes its place, so this is constant time.
+
+        Precondition: col is in the index of shooters.
+        """
+        pos = self._shooterPos[col]
+        last = self._shooters.pop()
+        if last != col:
+            self._shooters[pos] = last
+            self._shooterPos[last] = pos
+        self._shooterPos[col] = -1
+
+    def _dropSprite(self, row, col):
+        """
+        Removes the image of the (dead) alien at (row, col) from the scene.
+        """
+        if self._scene == None:
+            return
+        dead = self._sprites[row][col]
+        self._scene.children = [a for a in self._scene.children if a is not dead]
+
+    def draw(self, view):
+        """
+        Draws the live aliens.
+
+        Parameter view: the view to draw to
+        Precondition: view is an instance of GView
+        """
+        if self._scene == None:
+            self._buildScene()
+        self._scene.draw(view)
+
+    def _buildScene(self):
+        """
+        Makes the images of the aliens and the scene holding the live ones.
+        """
+        self._sprites = []
+        for row in range(self.getRows()):
+            source = ALIEN_IMAGES[self._kind[row, 0]]
+            self._sprites.append([Alien(float(self._cellX[col]),
+                                        float(self._cellY[row]), source)
+                                  for col in range(self.getCols())])
+        live = [self._sprites[row][col] for (row, col) in np.argwhere(self._alive).tolist()]
+        self._scene = GScene(x=self._dx, y=self._dy, children=live)
+
+
+class BoltManager(object):
+    """
+    This class stores the laser bolts currently on screen.
+
+    The bolts of each owner (PLAYER_BOLT or ALIEN_BOLT) are kept in a pair of
+    compact NumPy arrays of positions.  The first getCount(owner) entries are
+    the live bolts.  Bolts are deleted in batches that pack the remaining
+    bolts to the front in one pass, so the arrays never have gaps.  As all
+    bolts of an owner have the same velocity, moving them is one array
+    operation.
+
+    For drawing with a fixed time step, the manager also keeps where each
+    bolt was when mark was last called (at the start of an update), and the
+    bolts that cull removed since then.  A bolt fired after the mark was
+    where it was fired.
+
+    The Bolt objects are only used for drawing.  All bolts of an owner look
+    the same, so they are a pool that is placed at the live slots each time
+    the bolts are drawn.  The pool only grows when more bolts are on screen
+    than ever before, and it stays empty if the bolts are never drawn.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _x: the x-coordinate of the bolts of each owner
+    # Invariant: _x is a list of two float arrays of the same length
+    #
+    # Attribute _y: the y-coordinate of the bolts of each owner
+    # Invariant: _y is a list of two float arrays, with len(_y[o]) == len(_x[o])
+    #
+    # Attribute _count: the number of live bolts of each owner
+    # Invariant: _count is a list of two ints; 0 <= _count[o] <= len(_x[o])
+    #
+    # Attribute _lastY: the y-coordinate of the bolts of each owner at the mark
+    # Invariant: _lastY is a list of two float arrays, with len(_lastY[o]) ==
+    # len(_x[o]); the first _count[o] entries belong to the live bolts
+    #
+    # Attribute _gone: the bolts of each owner culled since the mark
+    # Invariant: _gone is a list of two tuples (xs, lastYs, ys) of float arrays
+    # of the same length
+    #
+    # Attribute _sprites: the images used to draw the bolts of each owner
+    # Invariant: _sprites is a list of two lists of Bolt objects; the first
+    # entries of _sprites[o] draw the live and culled bolts when drawn
+
+    # The initial number of slots for each owner
+    CAPACITY = 8
+    # The velocity of the bolts of each owner
+    VELOCITY = (BOLT_SPEED, -BOLT_SPEED)
+    # No culled bolts
+    _NONE = (np.zeros(0), np.zeros(0), np.zeros(0))
+
+    # GETTERS AND SETTERS
+    def getCount(self, owner):
+        """
+        Returns the number of live bolts fired by owner.
+
+        Parameter owner: the owner of the bolts
+        Precondition: owner is PLAYER_BOLT or ALIEN_BOLT
+        """
+        return self._count[owner]
+
+    def getX(self, owner, index):
+        """
+        Returns the x-coordinate of the bolt of owner in slot index.
+        """
+        return float(self._x[owner][index])
+
+    def getY(self, owner, index):
+        """
+        Returns the y-coordinate of the bolt of owner in slot index.
+        """
+        return float(self._y[owner][index])
+
+    def getPositions(self, owner):
+        """
+        Returns the arrays (xs, ys) of the positions of the live bolts of owner.
+
+        The arrays are views of the bolt storage, so they change when the bolts
+        move and are only valid until the next bolt is fired.  Do not change them.
+
+        Parameter owner: the owner of the bolts
+        Precondition: owner is PLAYER_BOLT or ALIEN_BOLT
+        """
+        n = self._count[owner]
+        return (self._x[owner][:n], self._y[owner][:n])
+
+    def getVelocity(self, owner):
+        """
+        Returns the distance the bolts of owner move in one update.
+        """
+        return self.VELOCITY[owner]
+
+    # INITIALIZER
+    def __init__(self):
+        """
+        Initializes an empty set of bolts.
+        """
+        self._x = [np.zeros(self.CAPACITY), np.zeros(self.CAPACITY)]
+        self._y = [np.zeros(self.CAPACITY), np.zeros(self.CAPACITY)]
+        self._lastY = [np.zeros(self.CAPACITY), np.zeros(self.CAPACITY)]
+        self._count = [0, 0]
+        self._gone = [self._NONE, self._NONE]
+        self._sprites = [[], []]
+
+    # METHODS TO ADD, MOVE AND REMOVE BOLTS
+    def fire(self, owner, x, y):
+        """
+        Adds a new bolt for owner at (x, y).
+
+        Parameter owner: the owner of the bolt
+        Precondition: owner is PLAYER_BOLT or ALIEN_BOLT
+
+        Parameter x: the x-coordinate of the bolt
+        Precondition: x is a number (int or float)
+
+        Parameter y: the y-coordinate of the bolt
+        Precondition: y is a number (int or float)
+        """
+        n = self._count[owner]
+        if n == len(self._x[owner]):
+            self._x[owner] = np.resize(self._x[owner], 2*n)
+            self._y[owner] = np.resize(self._y[owner], 2*n)
+            self._lastY[owner] = np.resize(self._lastY[owner], 2*n)
+        self._x[owner][n] = x
+        self._y[owner][n] = y
+        self._lastY[owner][n] = y
+        self._count[owner] = n+1
+
+    def removeMany(self, owner, slots):
+        """
+        Removes the bolts of owner in the given slots.
+
+        The remaining bolts are packed to the front in one pass, keeping their
+        order.  Hence this takes time linear in the number of bolts, no matter
+        how many are removed.
+
+        Parameter owner: the owner of the bolts
+        Precondition: owner is PLAYER_BOLT or ALIEN_BOLT
+
+        Parameter slots: the slots of the bolts to remove
+        Precondition: slots is a sequence of ints in 0..getCount(owner)-1
+        """
+        if len(slots) == 0:
+            return
+        n = self._count[owner]
+        keep = np.ones(n, dtype=bool)
+        keep[list(slots)] = False
+        m = int(np.count_nonzero(keep))
+        self._x[owner][:m] = self._x[owner][:n][keep]
+        self._y[owner][:m] = self._y[owner][:n][keep]
+        self._lastY[owner][:m] = self._lastY[owner][:n][keep]
+        self._count[owner] = m
+
+    def findHit(self, owner, x, y, width, height):
+        """
+        Returns the slot of a bolt of owner that hits the given box, or -1.
+
+        A bolt hits the box when one of the corners of the box that is
+        BOLT_WIDTH by BOLT_HEIGHT around the bolt lies inside it.  This is
+        the same test as Ship._collidesShip, but for all bolts at once.  As in
+        Formation.findHits, the test covers the whole path of each bolt since
+        the last call to move, so fast bolts cannot pass through the box.
+
+        Parameter owner: the owner of the bolts to test
+        Precondition: owner is PLAYER_BOLT or ALIEN_BOLT
+
+        Parameter x: the x-coordinate of the center of the box
+        Precondition: x is a number (int or float)
+
+        Parameter y: the y-coordinate of the center of the box
+        Precondition: y is a number (int or float)
+
+        Parameter width: the width of the box
+        Precondition: width is a number > 0
+
+        Parameter height: the height of the box
+        Precondition: height is a number > 0
+        """
+        n = self._count[owner]
+        ys = self._y[owner][:n]
+        back = ys - self.VELOCITY[owner]
+        hit = ((np.abs(self._x[owner][:n] - x) < width/2 + BOLT_WIDTH) &
+               (np.minimum(ys, back) - BOLT_HEIGHT < y + height/2) &
+               (np.maximum(ys, back) + BOLT_HEIGHT > y - height/2))
+        slots = np.flatnonzero(hit)
+        return int(slots[0]) if len(slots) > 0 else -1
+
+    def clear(self):
+        """
+        Removes every bolt.
+        """
+        for owner in (PLAYER_BOLT, ALIEN_BOLT):
+            self._count[owner] = 0
+            self._gone[owner] = self._NONE
+
+    def mark(self):
+        """
+        Remembers where every bolt is now, and forgets the culled bolts.
+
+        Wave calls this at the start of each update, so that draw can put each
+        bolt between where it was before the update and where it is now.
+        """
+        for owner in (PLAYER_BOLT, ALIEN_BOLT):
+            n = self._count[owner]
+            self._lastY[owner][:n] = self._y[owner][:n]
+            self._gone[owner] = self._NONE
+
+    def move(self):
+        """
+        Moves every bolt by its velocity.
+        """
+        for owner in (PLAYER_BOLT, ALIEN_BOLT):
+            n = self._count[owner]
+            self._y[owner][:n] += self.VELOCITY[owner]
+
+    def cull(self):
+        """
+        Removes the bolts that left the screen.
+
+        Player bolts leave the screen at the top, and alien bolts at the bottom.
+        This is done after collisions, so that a bolt can still hit something
+        on the update it leaves the screen.  The culled bolts are kept until
+        the next mark, as they may still be on screen part of the way back.
+        """
+        for owner in (PLAYER_BOLT, ALIEN_BOLT):
+            n = self._count[owner]
+            ys = self._y[owner]
+            if owner == PLAYER_BOLT:
+                gone = np.flatnonzero(ys[:n] > GAME_HEIGHT)
+            else:
+                gone = np.flatnonzero(ys[:n] <= 0)
+            if len(gone) > 0:
+                self._gone[owner] = (self._x[owner][gone], self._lastY[owner][gone], ys[gone])
+            self.removeMany(owner, gone)
+
+    def draw(self, view, alpha=1.0):
+        """
+        Draws every live bolt.
+
+        With a fixed time step, each bolt is drawn the fraction alpha of the
+        way from where it was at the last mark to where it is now.  The bolts
+        culled since the mark are drawn the same way, so they do not vanish
+        before they reach the edge of the screen.
+
+        Parameter view: the view to draw to
+        Precondition: view is an instance of GView
+
+        Parameter alpha: how far the frame is past the last update
+        Precondition: alpha is a number in 0..1
+        """
+        for owner in (PLAYER_BOLT, ALIEN_BOLT):
+            n = self._count[owner]
+            gone = self._gone[owner]
+            xs = np.concatenate((self._x[owner][:n], gone[0]))
+            last = np.concatenate((self._lastY[owner][:n], gone[1]))
+            ys = np.concatenate((self._y[owner][:n], gone[2]))
+            ys = last + alpha*(ys - last)
+            pool = self._sprites[owner]
+            direction = 1 if owner == PLAYER_BOLT else -1
+            while len(pool) < len(xs):
+                pool.append(Bolt(x=0, y=0, shipdirection=direction))
+            for index in range(len(xs)):
+                sprite = pool[index]
+                sprite.x = float(xs[index])
+                sprite.y = float(ys[index])
+                sprite.draw(view)
+
+
+class FireScheduler(object):
+    """
+    This class decides which aliens fire when the aliens take a shot.
+
+    Each time the aliens fire, this scheduler fires one volley in the pattern
+    BOLT_PATTERN.  A 'single' volley is one bolt from a random column, a
+    'spread' volley is up to BOLT_VOLLEY bolts from different random columns,
+    and an 'aimed' volley is one bolt from the column closest to the ship.
+    Only the bottom alien of a column fires.
+
+    A column that fires is held out of the shooters of the formation for
+    BOLT_COOLDOWN seconds (Wave releases it with a timer).  In addition, a
+    volley never puts more than BOLT_MAX alien bolts on screen.  Hence the
+    number of bolts created at once does not depend on the size of the
+    formation.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _pattern: the volley pattern
+    # Invariant: _pattern is one of 'single', 'spread' or 'aimed'
+    #
+    # Attribute _size: the most bolts in a spread volley
+    # Invariant: _size is an int > 0
+    #
+    # Attribute _cooldown: the seconds a column waits after firing
+    # Invariant: _cooldown is a float >= 0
+    #
+    # Attribute _limit: the most alien bolts on screen
+    # Invariant: _limit is an int >= 0
+
+    # The supported volley patterns
+    PATTERNS = ('single', 'spread', 'aimed')
+
+    # INITIALIZER
+    def __init__(self, pattern=BOLT_PATTERN, size=BOLT_VOLLEY,
+                 cooldown=BOLT_COOLDOWN, limit=BOLT_MAX):
+        """
+        Initializes a scheduler with no columns cooling down.
+
+        Parameter pattern: the volley pattern
+        Precondition: pattern is one of 'single', 'spread' or 'aimed'
+
+        Parameter size: the most bolts in a spread volley
+        Precondition: size is an int > 0
+
+        Parameter cooldown: the seconds a column waits after firing
+        Precondition: cooldown is a number >= 0
+
+        Parameter limit: the most alien bolts on screen at once
+        Precondition: limit is an int >= 0
+        """
+        assert pattern in self.PATTERNS, '%s is not a volley pattern' % repr(pattern)
+        assert type(size) == int and size > 0, '%s is not a volley size' % repr(size)
+        assert type(cooldown) in [int,float] and cooldown >= 0, \
+            '%s is not a valid cooldown' % repr(cooldown)
+        assert type(limit) == int and limit >= 0, '%s is not a bolt limit' % repr(limit)
+        self._pattern = pattern
+        self._size = size
+        self._cooldown = float(cooldown)
+        self._limit = limit
+
+    # GETTERS AND SETTERS
+    def getCooldown(self):
+        """
+        Returns the seconds a column waits after firing.
+        """
+        return self._cooldown
+
+    # METHODS TO SCHEDULE FIRE
+    def volley(self, formation, bolts, target, rng):
+        """
+        Fires one volley and returns the list of columns that fired.
+
+        Every column in the list is held out of the shooters of the formation.
+        It is up to the caller to release it once getCooldown() seconds have
+        passed.
+
+        Parameter formation: the aliens of the wave
+        Precondition: formation is a Formation object
+
+        Parameter bolts: the bolts of the wave
+        Precondition: bolts is a BoltManager object
+
+        Parameter target: the x-coordinate to aim at
+        Precondition: target is a number (int or float)
+
+        Parameter rng: the source of random numbers
+        Precondition: rng is a random.Random object
+        """
+        budget = self._limit - bolts.getCount(ALIEN_BOLT)
+        if self._pattern != 'spread':
+            budget = min(budget, 1)
+        else:
+            budget = min(budget, self._size)
+
+        fired = []
+        while len(fired) < budget:
+            if self._pattern == 'aimed':
+                chosen = formation.nearestShooter(target)
+            else:
+                chosen = formation.pickShooter(rng)
+            if chosen == None:
+                break
+            row, col = chosen
+            bolts.fire(ALIEN_BOLT, formation.getX(row, col), formation.getY(row, col))
+            formation.holdShooter(col)
+            fired.append(col)
+        return fired
+
+
+class TimerQueue(object):
+    """
+    This class keeps the named timers of a wave.
+
+    A timer is a name (any hashable value) that is due a number of seconds
+    from now.  A periodic timer is put back in the queue as soon as it is due,
+    one period after the time it was due (not after the current time), so it
+    keeps its cadence whatever the frame rate.  If a frame is long enough, a
+    periodic timer is due several times in that frame.
+
+    The timers are kept in a heap ordered by the time they are due.  Hence
+    advancing the clock only looks at the timers that are due.  Cancelling or
+    rescheduling a timer does not search the heap; the old entry is left in
+    place and skipped when it reaches the top.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _clock: the seconds since the queue was created
+    # Invariant: _clock is a float >= 0
+    #
+    # Attribute _heap: the scheduled timers
+    # Invariant: _heap is a heap of (due, ticket, name) triples, where due is
+    # the value of _clock when name is due
+    #
+    # Attribute _active: the current ticket and period of every live timer
+    # Invariant: _active is a dict mapping a name to a (ticket, period) pair;
+    # a heap entry is stale if its ticket is not the one in _active.  The
+    # period is None for a timer that is only due once
+    #
+    # Attribute _tickets: the number of timers scheduled so far
+    # Invariant: _tickets is an int >= 0
+
+    # GETTERS AND SETTERS
+    def getClock(self):
+        """
+        Returns the seconds since this queue was created.
+        """
+        return self._clock
+
+    def isPending(self, name):
+        """
+        Returns True if the timer name is scheduled and not yet due.
+
+        Parameter name: the timer name
+        Precondition: name is hashable
+        """
+        return name in self._active
+
+    # INITIALIZER
+    def __init__(self):
+        """
+        Initializes an empty queue with its clock at 0.
+        """
+        self._clock = 0.0
+        self._heap = []
+        self._active = {}
+        self._tickets = 0
+
+    # METHODS TO SCHEDULE TIMERS
+    def schedule(self, name, delay, period=None):
+        """
+        Schedules the timer name to be due delay seconds from now.
+
+        If the timer is already scheduled, the old time is replaced.
+
+        Parameter name: the timer name
+        Precondition: name is hashable
+
+        Parameter delay: the seconds until the timer is due
+        Precondition: delay is a number >= 0
+
+        Parameter period: the seconds between repeats, or None to fire once
+        Precondition: period is None or a number > 0
+        """
+        assert type(delay) in [int,float] and delay >= 0, '%s is not a valid delay' % repr(delay)
+        assert period == None or (type(period) in [int,float] and period > 0), \
+            '%s is not a valid period' % repr(period)
+        self._tickets += 1
+        self._active[name] = (self._tickets, period)
+        heapq.heappush(self._heap, (self._clock + delay, self._tickets, name))
+
+    def cancel(self, name):
+        """
+        Cancels the timer name if it is scheduled.
+
+        Parameter name: the timer name
+        Precondition: name is hashable
+        """
+        self._active.pop(name, None)
+
+    def advance(self, dt):
+        """
+        Advances the clock by dt and returns the names of the timers now due.
+
+        The names are in the order they were due.  A periodic timer appears
+        once for every period that ended in this step.
+
+        Parameter dt: The time since the last animation frame.
+        Precondition: dt is a number >= 0
+        """
+        self._clock += dt
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= self._clock:
+            when, ticket, name = heapq.heappop(heap)
+            entry = self._active.get(name)
+            if entry == None or entry[0] != ticket:
+                continue
+            due.append(name)
+            if entry[1] == None:
+                del self._active[name]
+            else:
+                heapq.heappush(heap, (when + entry[1], ticket, name))
+        return due
+
+
 class Wave(object):
     """
     This class controls a single level or wave of Alien Invaders.
@@ -49,25 +1008,62 @@ class Wave(object):
     Only add the getters and setters that you need for Invaders. You can keep
     everything else hidden.
 
+    A wave does not make any images until it is drawn.  A wave made with
+    headless=True also has no sounds, so it can be updated from a plain
+    Python loop on a machine without a display, an audio device or Kivy (see
+    the module headless).
+
     """
     # HIDDEN ATTRIBUTES:
-    # Attribute _ship: the player ship to control
-    # Invariant: _ship is a Ship object or None
+    # Attribute _shipX: the x-coordinate of the player ship
+    # Invariant: _shipX is a float, or None if the ship was destroyed
     #
-    # Attribute _aliens: the 2d list of aliens in the wave
-    # Invariant: _aliens is a rectangular 2d list containing Alien objects or None
+    # Attribute _ship: the image of the player ship
+    # Invariant: _ship is a Ship object, or None if the wave was never drawn
+    #
+    # Attribute _aliens: the grid of aliens in the wave
+    # Invariant: _aliens is a Formation object
     #
     # Attribute _bolts: the laser bolts currently on screen
-    # Invariant: _bolts is a list of Bolt objects, possibly empty
+    # Invariant: _bolts is a BoltManager object
+    #
+    # Attribute _defLine: the defensive line being protected
+    # Invariant: _defLine is a DefLine object, or None if the wave was never
+    # drawn
+    #
+    # Attribute _gunner: the scheduler for the alien bolts
+    # Invariant: _gunner is a FireScheduler object
     #
-    # Attribute _dline: the defensive line being protected
-    # Invariant : _dline is a GPath object
+    # Attribute _hits: the collisions found in the last update
+    # Invariant: _hits is a list of Hit tuples, possibly empty
     #
     # Attribute _lives: the number of lives left
     # Invariant: _lives is an int >= 0
     #
-    # Attribute _time: the amount of time since the last Alien "step"
-    # Invariant: _time is a float >= 0s
+    # Attribute _boom: the sound of the ship firing
+    # Invariant: _boom is a Sound object, or None if the wave is headless
+    #
+    # Attribute _pew: the sound of the aliens firing
+    # Invariant: _pew is a Sound object, or None if the wave is headless
+    #
+    # Attribute _seed: the seed of the random numbers of this wave
+    # Invariant: _seed is an int >= 0
+    #
+    # Attribute _rng: the random numbers of this wave, seeded with _seed
+    # Invariant: _rng is a random.Random object
+    #
+    # Attribute _lastShipX: the x-coordinate of the ship before the last update
+    # Invariant: _lastShipX is a float, or None if there was no ship
+    #
+    # Attribute _trans_sig: whether the aliens last turned at the right edge
+    # Invariant: _trans_sig is a bool; the aliens march left while it is True
+    #
+    # Attribute _timers: the timers for the alien steps, the alien fire, the
+    # column cooldowns and the ship respawn
+    # Invariant: _timers is a TimerQueue object.  The timer 'march' repeats
+    # every ALIEN_SPEED seconds and the timer 'fire' is always pending.  The
+    # timer ('cool', col) is pending while column col cools down, and the
+    # timer 'respawn' is pending while the aliens hold fire for a new ship
     #
     # You may change any attribute above, as long as you update the invariant
     # You may also add any new attributes as long as you document them.
@@ -80,122 +1076,177 @@ class Wave(object):
     def getLives(self):
         return self._lives
 
-    # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
-    def __init__(self):
+    def getSeed(self):
         """
-        Initializes the attributes.
+        Returns the seed of the random numbers used by this wave.
+
+        A new Wave built with this seed (and given the same input and the same
+        dt values) plays out exactly like this one.
         """
-        self._aliens = []
-        self.orderAliens()
-        self._ship = Ship(x=(GAME_WIDTH//2),y=SHIP_BOTTOM,source='ship.png')
-        self._defLine = DefLine()
-        self._time = 0
-        self._bolts = []
-        self._trans_sig = False #must be an int
-        self._rightPosAlien = self._aliens[-1]
-        self._leftPosAlien = self._aliens[0]
-        self._fire = random.randint(1,BOLT_RATE)
-        self._steps = 0
-        self._lives = 3
-        self._boom = Sound('blast1.wav')
-        self._pew = Sound('pew1.wav')
+        return self._seed
 
-    def orderAliens(self):
+    def hasAliens(self):
         """
-        This method creates the aliens and adds them to the list, self._aliens.
-        THis methods also properly spacs the aliens and correctly arranges
-        them in their respective positions.
+        Returns True if at least one alien is still alive.
         """
+        return self._aliens.getCount() > 0
 
-        left_edge = ALIEN_H_SEP
-        top_edge = GAME_HEIGHT - ALIEN_CEILING
-        height_alien = (ALIEN_HEIGHT*ALIEN_ROWS)+(ALIEN_V_SEP * ALIEN_ROWS-1)
-        bottom_edge = (top_edge - height_alien) + (ALIEN_V_SEP)
-        y_pos = GAME_HEIGHT - ALIEN_CEILING - (ALIEN_HEIGHT//2)
+    def getAlienCount(self):
+        """
+        Returns the number of aliens still alive.
+        """
+        return self._aliens.getCount()
 
-        for row in range(ALIEN_ROWS):#range(1):
-            twodimen_list = []
-            if row%5 == 1 or row%5 == 2:
-                source = ALIEN_IMAGES[0]
-            elif row%5 == 3 or row%5 == 4:
-                source = ALIEN_IMAGES[1]
-            else:
-                source = ALIEN_IMAGES[2]
-            x_pos = ALIEN_H_SEP + (ALIEN_WIDTH//2)
-            for col in range(ALIENS_IN_ROW):#range(1):
-                twodimen_list.append(Alien(x_pos, y_pos,source))
-                x_pos += ALIEN_H_SEP + ALIEN_WIDTH
-            self._aliens.append(twodimen_list)
-            y_pos -= ALIEN_HEIGHT + ALIEN_V_SEP
+    def getAlienGrid(self):
+        """
+        Returns the bool array of which aliens are alive (row 0 on top).
 
+        The array belongs to the wave; do not change it.
+        """
+        return self._aliens.getAlive()
 
-    def countSteps(self):
+    def getAlienCells(self):
         """
-        Counts the number of steps that the aliens move.
+        Returns the starting positions (cellX, cellY) of the alien columns and rows.
+
+        The arrays belong to the wave; do not change them.
         """
-        self._steps +=1
-        return self._steps
+        return self._aliens.getCells()
 
+    def getAlienOffset(self):
+        """
+        Returns the distance (dx, dy) the aliens moved from their start.
+        """
+        return self._aliens.getOffset()
+
+    def getBoltPositions(self, owner):
+        """
+        Returns the arrays (xs, ys) of the positions of the bolts of owner.
+
+        The arrays belong to the wave and are only valid until the next update.
+
+        Parameter owner: the owner of the bolts
+        Precondition: owner is PLAYER_BOLT or ALIEN_BOLT
+        """
+        return self._bolts.getPositions(owner)
+
+    def getHits(self):
+        """
+        Returns the collisions resolved in the last update.
+
+        The result is a list of Hit tuples (owner, slot, target), in the order
+        they were found.  The target is the (row, col) of the alien that was
+        killed, or None if the ship was destroyed.  The slot is the index the
+        bolt had before it was removed.
+        """
+        return self._hits
+
+    def hasShip(self):
+        """
+        Returns True if the ship has not been destroyed.
+        """
+        return self._shipX != None
+
+    def getShipX(self):
+        """
+        Returns the x-coordinate of the ship, or None if it was destroyed.
+        """
+        return self._shipX
+
+    def restoreShip(self):
+        """
+        Puts a new ship at the bottom of the screen.
+
+        The aliens hold their fire for SHIP_RESPAWN seconds after the ship
+        comes back.
+        """
+        self._shipX = float(GAME_WIDTH//2)
+        self._lastShipX = self._shipX
+        self._timers.schedule('respawn', SHIP_RESPAWN)
+
+    def clearBolts(self):
+        """
+        Removes every laser bolt from the screen.
+        """
+        self._bolts.clear()
+
+    # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
+    def __init__(self, seed=None, headless=False):
+        """
+        Initializes the attributes.
+
+        If headless is True, the wave plays no sounds.  It then only needs
+        Kivy if it is drawn.
+
+        Every wave has its own random numbers, so waves do not disturb each
+        other or the random module.  If seed is None, a fresh seed is chosen
+        by the operating system; it is available from getSeed().
+
+        Parameter seed: the seed for the random numbers of this wave
+        Precondition: seed is None or an int >= 0
+
+        Parameter headless: whether to make the wave without sounds
+        Precondition: headless is a bool
+        """
+        assert seed == None or (type(seed) == int and seed >= 0), \
+            '%s is not a valid seed' % repr(seed)
+        if seed == None:
+            seed = random.SystemRandom().getrandbits(32)
+        self._seed = seed
+        self._rng = random.Random(seed)
+        assert type(headless) == bool, '%s is not a bool' % repr(headless)
+        self._aliens = Formation()
+        self._shipX = float(GAME_WIDTH//2)
+        self._lastShipX = self._shipX
+        self._ship = None
+        self._defLine = None
+        self._timers = TimerQueue()
+        self._timers.schedule('march', ALIEN_SPEED, ALIEN_SPEED)
+        self._timers.schedule('fire', self._rng.randint(1,BOLT_RATE)*ALIEN_SPEED)
+        self._bolts = BoltManager()
+        self._gunner = FireScheduler()
+        self._hits = []
+        self._trans_sig = False
+        self._lives = 3
+        if headless:
+            self._boom = None
+            self._pew = None
+        else:
+            self._boom = Sound('blast1.wav')
+            self._pew = Sound('pew1.wav')
 
     def moveAliensLeft(self):
         """
-        Move aliens to the left. This method also counts the number of steps
-        that the lists of aliens take and also finds the x values of the alien
-        at the outer most left position.
+        Move aliens to the left. If the outer most left alien was already at the
+        left edge, the aliens also move down and turn around.
         """
 
         left_end = 0 + ALIEN_WIDTH//2 + ALIEN_H_SEP
-        upcoming_pos = 0
-        order_acc = []
-
-        for row in range(len(self._aliens)):
-            for col in range(len(self._aliens[row])):
-                each_alien = self._aliens[row][col]
-                if each_alien != None:
-                    order_acc.append(each_alien.x)
-                    each_alien.x = each_alien.x - ALIEN_H_WALK
-                    upcoming_pos = each_alien.x - ALIEN_H_WALK
-                    self.countSteps()
-        order_acc.sort()
-        outer_left_alien = int(order_acc[0])
+        count = self._aliens.getCount()
+        if count == 0:
+            return
+
+        outer_left_alien = int(self._aliens.getLeft())
+        self._aliens.march(-ALIEN_H_WALK, 0)
         if outer_left_alien <= left_end:
             self._trans_sig = False
-
-            for row in range(len(self._aliens)):
-                for col in range(len(self._aliens[row])):
-                    each_alien = self._aliens[row][col]
-                    if each_alien != None:
-                        each_alien.y = each_alien.y - ALIEN_V_SEP
+            self._aliens.march(0, -ALIEN_V_SEP)
 
     def moveAliensRight(self):
-        """ Move aliens to the right. This method also counts the number of steps
-        that the lists of aliens take and also finds the x values of the alien
-        at the outer most right position.
+        """ Move aliens to the right. If the next step would take the outer most right
+        alien past the right edge, the aliens also move down and turn around.
         """
 
         right_end = GAME_WIDTH-ALIEN_WIDTH//2
-        upcoming_pos = 0
-        right_order_acc = []
-
-
-        for row in range(len(self._aliens)):
-            for col in range(len(self._aliens[row])):
-                each_alien = self._aliens[row][col]
-                if self._aliens[row][col] != None:
-                    right_order_acc.append(each_alien.x)
-                    if each_alien != None:
-                        each_alien.x = each_alien.x + ALIEN_H_WALK
-                        upcoming_pos = each_alien.x + ALIEN_H_WALK
-                        self.countSteps()
-        right_order_acc.sort()
-        outer_left_alien = int(right_order_acc[-1])
+        count = self._aliens.getCount()
+        if count == 0:
+            return
+
+        self._aliens.march(ALIEN_H_WALK, 0)
+        upcoming_pos = self._aliens.getRight() + ALIEN_H_WALK
         if upcoming_pos >= right_end:
             self._trans_sig = True
-            for row in range(len(self._aliens)):
-                for col in range(len(self._aliens[row])):
-                    each_alien = self._aliens[row][col]
-                    if each_alien != None:
-                        each_alien.y = each_alien.y - ALIEN_V_SEP
+            self._aliens.march(0, -ALIEN_V_SEP)
 
 
     def ship_bolt_object(self,input):
@@ -205,137 +1256,100 @@ class Wave(object):
         Parameter input: input from the user and returns True if is held down.
         Precondition: input is a string.
         """
-        self._shipbolts = []
-        for col in self._bolts:
-            if col.isPlayerBolt():
-                self._shipbolts.append('ship')
-        if len(self._shipbolts) < 1:
+        if self._bolts.getCount(PLAYER_BOLT) < 1:
             if input.is_key_down('up'):
-                if self._ship != None:
-                    bolt = Bolt(x=self._ship.x,y=(GAME_HEIGHT-(GAME_HEIGHT-self._ship.y)), shipdirection=1)
-                    self._bolts.append(bolt)
-                    self._boom.play()
+                if self._shipX != None:
+                    self._bolts.fire(PLAYER_BOLT, self._shipX, SHIP_BOTTOM)
+                    self._play(self._boom)
 
 
 
 
-    def moveBolts(self,input,dt):
+    def moveBolts(self,input):
         """
-        This method checks if the bolt is fired by the player or if it is fired
-        by the aliens. Returns True if fired by the player. Returns False if fired
-        by the aliens. This method also, sets the direction for the bolts (up or down).
-        This method also calls the methods that creates the objects.
+        This method creates the bolts fired by the ship, and then moves every
+        bolt up (player) or down (aliens).  The aliens fire from _runTimers.
         """
         self.ship_bolt_object(input)
-        self.alien_bolt_object(dt)
-        for col in self._bolts:
-            col.y = col.y + col.getVelocity()
+        self._bolts.move()
 
 
-    def removeShipBolts(self):
+    def alien_bolt_object(self):
         """
-        This method removes the bolt from self._bolts if its height
-        exceeds the height of the game screen.
+        Creates the bolts fired by the aliens and adds them to self._bolts.
 
-        Parameter input: input from the user and returns True if is held down.
-        Precondition: input is a string.
+        This method is called when the timer 'fire' is due.  It schedules the
+        next shot between 1 and BOLT_RATE alien steps later, and a cooldown
+        timer for every column that fired.  The aliens do not fire while the
+        timer 'respawn' is pending.
         """
+        if not self._timers.isPending('respawn'):
+            target = self._shipX if self._shipX != None else GAME_WIDTH/2
+            fired = self._gunner.volley(self._aliens, self._bolts, target, self._rng)
+            for col in fired:
+                self._timers.schedule(('cool', col), self._gunner.getCooldown())
+            if fired:
+                self._play(self._pew)
+        self._timers.schedule('fire', self._rng.randint(1,BOLT_RATE)*ALIEN_SPEED)
 
 
-        bolts_acc = []
-        for i in range(len(self._bolts)):
-            if self._bolts[i].y <= GAME_HEIGHT:
-                bolts_acc.append(self._bolts[i])
-        self._bolts = bolts_acc
-        self._shipbolts = []
-
-
-    def botRow(self, chosencol):
-        """
-        Checks if the row is empty (None). Returns the bottom most row that is
-        not empty. If there is no bottm most non empty, return -1.
-        """
-        bestRow = -1
-        for row in range(len(self._aliens)):
-            if self._aliens[row][chosencol] != None:
-                bestRow = row
-        return bestRow
-
 
-    def isColEmpty(self, chosencol):
-        """
-        Checks if the column is empty (None). If it is empty, return True. Else,
-        return false.
+    def _collisionDetection(self):
         """
-        return self.botRow(chosencol) == -1
+        This method finds every collision in this update and then applies them.
 
-
-    def alien_bolt_object(self,dt):
+        Collisions are handled in two phases.  First _detectHits finds the hits
+        without changing anything.  Then _resolveHits kills the aliens, destroys
+        the ship and removes the bolts, all in one pass.  The hits are kept in
+        self._hits so that other code can react to them.
         """
-        Creates the bolts fired by the aliens and adds them to self._bolts.
-
-        Parameter dt: The time since the last animation frame.
-        Precondition: dt is a number (int or float)
+        self._hits = self._detectHits()
+        self._resolveHits(self._hits)
 
+    def _detectHits(self):
         """
+        Returns the list of Hit tuples for the collisions in this update.
 
-        num  = len(self._aliens[0])-1
-        while True:
-            colnum = random.randint(0, num)
-            if (self.isColEmpty(colnum)==False):
-                break
-        chosen_alien = self._aliens[self.botRow(colnum)][colnum]
-
-        self._time += dt
-        if self._time > ALIEN_SPEED:
-            if self._steps>self._fire:
-                for row in range(len(self._aliens)):
-                    for col in range(len(self._aliens[row])):
-                        each_alien = self._aliens[row][col]
-                        if self._aliens[row][col]!= None and chosen_alien.x!= None and chosen_alien.y!=None:
-                            abolt = Bolt(x=chosen_alien.x,y=chosen_alien.y, shipdirection=-1)
-                            self._bolts.append(abolt)
-                            self._pew.play()
-                            self._fire = random.randint(1, BOLT_RATE)
-                self._steps = 0
-                self._time = 0
-
-
-
-    def removeAlienBolts(self):
+        Each player bolt hits the first live alien in its path that no earlier
+        bolt has hit.  At most one alien bolt hits the ship.  Nothing is
+        changed by this method.
         """
-        This method removes the bolt from self._bolts if its height
-        exceeds the height of the game screen.
+        hits = []
+        claimed = set()
+        for slot in range(self._bolts.getCount(PLAYER_BOLT)):
+            x = self._bolts.getX(PLAYER_BOLT, slot)
+            y = self._bolts.getY(PLAYER_BOLT, slot)
+            back = y - self._bolts.getVelocity(PLAYER_BOLT)
+            for target in self._aliens.findHits(x, back, y):
+                if not target in claimed:
+                    claimed.add(target)
+                    hits.append(Hit(PLAYER_BOLT, slot, target))
+                    break
+
+        if self._shipX != None:
+            slot = self._bolts.findHit(ALIEN_BOLT, self._shipX, SHIP_BOTTOM,
+                                       SHIP_WIDTH, SHIP_HEIGHT)
+            if slot != -1:
+                hits.append(Hit(ALIEN_BOLT, slot, None))
+        return hits
+
+    def _resolveHits(self, hits):
         """
+        Applies a list of hits found by _detectHits.
 
-        bolts_acc = []
-        for i in range(len(self._bolts)):
-            if self._bolts[i].y > (GAME_HEIGHT-GAME_HEIGHT):
-                bolts_acc.append(self._bolts[i])
-        self._bolts = bolts_acc
-
-
-    def _collisionDetection(self):
+        Parameter hits: the hits to apply
+        Precondition: hits is a list of Hit tuples for the current bolts
         """
-        This method sets the hit ship or alien to None in its list and removes
-        the bolt from self._bolts.
-        """
-        for bolt in self._bolts:
-            if bolt.isPlayerBolt(): # added to test
-                for row in range(len(self._aliens)):
-                    for col in range(len(self._aliens[row])):
-                        each_alien = self._aliens[row][col]
-                        if each_alien != None:
-                            if each_alien._collidesAlien(bolt):
-                                self._aliens[row][col] = None
-                                if bolt in self._bolts:
-                                    self._bolts.remove(bolt)
-            if self._ship != None:
-                if self._ship._collidesShip(bolt):
-                    self._ship = None
-                    self._lives-=1
-                    if bolt in self._bolts:
-                        self._bolts.remove(bolt)
+        spent = ([], [])
+        for hit in hits:
+            if hit.target == None:
+                self._shipX = None
+                self._lives-=1
+            else:
+                self._aliens.kill(hit.target[0], hit.target[1])
+            spent[hit.owner].append(hit.slot)
+        self._bolts.removeMany(PLAYER_BOLT, spent[PLAYER_BOLT])
+        self._bolts.removeMany(ALIEN_BOLT, spent[ALIEN_BOLT])
 
 
         # UPDATE METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
@@ -347,30 +1361,44 @@ class Wave(object):
         Precondition: input is a string.
         """
 
-        da = self._ship.x
+        da = self._shipX
         if input.is_key_down('left'):
             da = max((da - SHIP_MOVEMENT),(GAME_WIDTH-(GAME_WIDTH -SHIP_WIDTH//2)))
         if input.is_key_down('right'):
             da = min((da + SHIP_MOVEMENT), (GAME_WIDTH-SHIP_WIDTH//2))
-        self._ship.x = da
+        self._shipX = da
 
 
 
-    def aliensUpdate(self,dt):
-        """ Calculates the time since the last frame and determines when to
-        move the aliens.
+    def aliensUpdate(self):
+        """
+        Moves the aliens one step.
 
-        Parameter dt: time since last animation frame.
-        Precondition: dt is a number (int or float)
+        This method is called when the timer 'march' is due.
         """
+        if self._trans_sig:
+            self.moveAliensLeft()
+        else:
+            self.moveAliensRight()
 
-        self._time += dt
-        if self._time > ALIEN_SPEED:
-            if self._trans_sig:
-                self.moveAliensLeft()
-            else:
-                self.moveAliensRight()
-            self._time = 0
+    def _runTimers(self, dt):
+        """
+        Advances the timers by dt and handles the ones that are due.
+
+        The aliens only march while there is a ship, but the other timers
+        keep running.
+
+        Parameter dt: The time since the last animation frame.
+        Precondition: dt is a number (int or float)
+        """
+        for name in self._timers.advance(dt):
+            if name == 'march':
+                if self._shipX != None:
+                    self.aliensUpdate()
+            elif name == 'fire':
+                self.alien_bolt_object()
+            elif type(name) == tuple and name[0] == 'cool':
+                self._aliens.releaseShooter(name[1])
 
 
 
@@ -384,12 +1412,14 @@ class Wave(object):
         Parameter dt: The time since the last animation frame.
         Precondition: dt is a number (int or float)
         """
-        if self._ship != None:
+        self._lastShipX = self._shipX
+        self._bolts.mark()
+        if self._shipX != None:
             self.shipUpdate(input)
-            self.aliensUpdate(dt)
-        if self._bolts != None:
-            self.moveBolts(input,dt)
+        self._runTimers(dt)
+        self.moveBolts(input)
         self._collisionDetection()
+        self._bolts.cull()
         self._invadedLine()
 
 
@@ -399,20 +1429,19 @@ class Wave(object):
         """
         Draws the Aliens in their correction positions.
         """
-        len_2dlist = len(self._aliens)
-        for row in range(len_2dlist):
-            for col in range(len(self._aliens[row])):
-                each_alien = self._aliens[row][col]
-                if each_alien != None:
-                    each_alien.draw(view)
+        self._aliens.draw(view)
 
-    def drawTheShip(self,view):
+    def drawTheShip(self,view,alpha=1.0):
         """
-        Draws the ship.
+        Draws the ship, the fraction alpha of the way from where it was before
+        the last update to where it is now.
         """
 
-        self._invadedLine()
-        if self._ship != None:
+        if self._shipX != None:
+            if self._ship == None:
+                self._ship = Ship(x=self._shipX,y=SHIP_BOTTOM,source='ship.png')
+            last = self._shipX if self._lastShipX == None else self._lastShipX
+            self._ship.x = last + alpha*(self._shipX - last)
             self._ship.draw(view)
 
     def drawTheDefLine(self,view):
@@ -420,34 +1449,50 @@ class Wave(object):
         Draws the defense line.
         """
 
-        if self._defLine != None:
-            self._defLine.draw(view)
+        if self._defLine == None:
+            self._defLine = DefLine()
+        self._defLine.draw(view)
 
 
-    def drawMoveBolts(self,view):
+    def drawMoveBolts(self,view,alpha=1.0):
         """
-        Draws bolts fired by ship and aliens
+        Draws bolts fired by ship and aliens, interpolated by alpha
         """
-        for col in self._bolts:
-            if self._bolts != None and self._bolts != []:
-                self.removeAlienBolts()
-                self.removeShipBolts()
-                col.draw(view)
+        self._bolts.draw(view, alpha)
 
 
-    def draw(self,view):
+    def draw(self,view,alpha=1.0):
         """
         Calls the draw functions to draw the objects created in each function.
 
+        The ship and the bolts are drawn between their last two positions (the
+        aliens move in steps, so they are not).  This is smoother when the game
+        has a fixed time step.
+
         Parameter view :the view (inherited from GameApp)
         Precondition: must be an instance of GView
+
+        Parameter alpha: how far the frame is past the last update (the alpha
+        of GameApp)
+        Precondition: alpha is a number in 0..1
         """
         self.drawTheAliens(view)
-        self.drawTheShip(view)
+        self.drawTheShip(view,alpha)
         self.drawTheDefLine(view)
-        self.drawMoveBolts(view)
+        self.drawMoveBolts(view,alpha)
+
 
 
+    # HELPER METHOD FOR SOUNDS
+    def _play(self, sound):
+        """
+        Plays sound, unless the wave is headless.
+
+        Parameter sound: the sound to play
+        Precondition: sound is a Sound object or None
+        """
+        if sound != None:
+            sound.play()
 
     # HELPER METHODS FOR COLLISION DETECTION
 
@@ -457,10 +1502,7 @@ class Wave(object):
         This method checks to see if any of the aliens have crossed the defense line.
         If so, it causes the ship to lose the round.
         """
-        for row in range(len(self._aliens)):
-            for col in range(len(self._aliens[row])):
-                each_alien = self._aliens[row][col]
-                if each_alien != None:
-                    if (each_alien.y - ALIEN_HEIGHT//2) <= DEFENSE_LINE:
-                        self._ship = None
-                        self._lives=0
+        if self._aliens.getCount() > 0:
+            if self._aliens.getBottom() <= DEFENSE_LINE:
+                self._shipX = None
+                self._lives=0
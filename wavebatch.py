@@ -0,0 +1,646 @@
+"""
+Batched simulation of many waves for Alien Invaders
+
+This module contains the class WaveBatch, which plays many independent waves
+of Alien Invaders at once.  It follows the same rules as the class Wave in
+wave.py: the formation marches on a timer and drops at the edges, the bottom
+alien of a column fires on a random timer and then cools down, the ship fires
+one bolt at a time, bolts hit along their path, and a wave ends when the
+ship has no lives left, the aliens reach the defense line, or every alien is
+destroyed.
+
+Instead of one object per wave, the state of all N waves is kept in NumPy
+arrays whose first axis is the wave.  One call to update advances every wave
+by the same dt with a few whole-array operations, so the cost per wave is
+very small.  The batch never makes images or sounds, so it does not need
+Kivy.  This is meant for difficulty tuning and training bots, where
+thousands of games are played at the same time.
+
+Each wave in the batch has its own seed.  The random numbers of a wave only
+depend on its seed and on how many numbers it has drawn, so a wave plays out
+the same way no matter which other waves are in the batch.  They are not the
+same random numbers as a Wave with the same seed, so a single wave in a
+batch is a different (but equally likely) game than Wave(seed).
+
+When the ship of a wave is destroyed, the next update clears the bolts of
+that wave and restores the ship, as Invaders does when the player continues
+(and as headless.play does).
+
+Author: agent
+Date: October 18, 2026
+"""
+from consts import *
+import numpy as np
+
+
+# The columns of the timer arrays.  The timer COOL+c is the cooldown of
+# alien column c.
+MARCH   = 0
+FIRE    = 1
+RESPAWN = 2
+COOL    = 3
+
+# The constants of the splitmix64 hash used for random numbers
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1   = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2   = np.uint64(0x94D049BB133111EB)
+
+
+class WaveBatch(object):
+    """
+    This class plays N independent waves of Alien Invaders in lockstep.
+
+    Wave i is controlled by the i-th entry of the actions given to update,
+    which is a combination of ACTION_LEFT, ACTION_RIGHT and ACTION_FIRE (the
+    keys 'left', 'right' and 'up' of a Wave).  A wave that is over is frozen
+    until it is reset.
+
+    The timers of each wave (the alien steps, the alien fire, the column
+    cooldowns and the respawn hold) work like the TimerQueue of a Wave: each
+    timer has a due time and a ticket, and the timers of a wave are handled
+    in order of due time, then ticket.  Each pass of the timer loop handles
+    the next due timer of every wave at once.
+
+    Alien bolts are kept in BOLT_MAX slots per wave, as a Wave never has more
+    than that many on screen.  A wave has at most one player bolt.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _size: the number of waves
+    # Invariant: _size is an int > 0
+    #
+    # Attribute _pattern: the volley pattern of the aliens
+    # Invariant: _pattern is one of 'single', 'spread' or 'aimed'
+    #
+    # Attribute _cellX: the starting x-coordinate of each column
+    # Invariant: _cellX is a float array of length ALIENS_IN_ROW
+    #
+    # Attribute _cellY: the starting y-coordinate of each row (row 0 on top)
+    # Invariant: _cellY is a float array of length ALIEN_ROWS
+    #
+    # Attribute _alive: which aliens of each wave are alive
+    # Invariant: _alive is a bool array of shape (N, ALIEN_ROWS, ALIENS_IN_ROW)
+    #
+    # Attribute _dx: how far the formation of each wave moved horizontally
+    # Invariant: _dx is a float array of length N
+    #
+    # Attribute _dy: how far the formation of each wave moved vertically
+    # Invariant: _dy is a float array of length N
+    #
+    # Attribute _marchLeft: whether the formation of each wave moves left
+    # Invariant: _marchLeft is a bool array of length N
+    #
+    # Attribute _held: which columns of each wave are cooling down
+    # Invariant: _held is a bool array of shape (N, ALIENS_IN_ROW)
+    #
+    # Attribute _shipX: the x-coordinate of the ship of each wave
+    # Invariant: _shipX is a float array of length N
+    #
+    # Attribute _shipAlive: whether the ship of each wave is alive
+    # Invariant: _shipAlive is a bool array of length N
+    #
+    # Attribute _lives: the lives left in each wave
+    # Invariant: _lives is an int array of length N, with entries >= 0
+    #
+    # Attribute _done: whether each wave is over
+    # Invariant: _done is a bool array of length N
+    #
+    # Attribute _clock: the seconds each wave has been played
+    # Invariant: _clock is a float array of length N
+    #
+    # Attribute _due: when each timer of each wave is due
+    # Invariant: _due is a float array of shape (N, COOL+ALIENS_IN_ROW); an
+    # entry is inf if that timer is not pending
+    #
+    # Attribute _ticket: the ticket of each timer of each wave
+    # Invariant: _ticket is an int array with the same shape as _due
+    #
+    # Attribute _tickets: the number of timers each wave has scheduled
+    # Invariant: _tickets is an int array of length N
+    #
+    # Attribute _playerOn: whether each wave has a player bolt
+    # Invariant: _playerOn is a bool array of length N
+    #
+    # Attribute _playerX: the x-coordinate of the player bolt of each wave
+    # Invariant: _playerX is a float array of length N
+    #
+    # Attribute _playerY: the y-coordinate of the player bolt of each wave
+    # Invariant: _playerY is a float array of length N
+    #
+    # Attribute _alienOn: which alien bolt slots of each wave are in use
+    # Invariant: _alienOn is a bool array of shape (N, BOLT_MAX)
+    #
+    # Attribute _alienX: the x-coordinate of each alien bolt
+    # Invariant: _alienX is a float array of shape (N, BOLT_MAX)
+    #
+    # Attribute _alienY: the y-coordinate of each alien bolt
+    # Invariant: _alienY is a float array of shape (N, BOLT_MAX)
+    #
+    # Attribute _alienAge: the order the alien bolts were fired in
+    # Invariant: _alienAge is an int array of shape (N, BOLT_MAX); an older
+    # bolt has a smaller entry
+    #
+    # Attribute _seeds: the seed of each wave
+    # Invariant: _seeds is a uint64 array of length N
+    #
+    # Attribute _draws: the random numbers each wave has drawn
+    # Invariant: _draws is a uint64 array of length N
+
+    # GETTERS AND SETTERS
+    def getSize(self):
+        """
+        Returns the number of waves in this batch.
+        """
+        return self._size
+
+    def getSeeds(self):
+        """
+        Returns a copy of the seed of each wave.
+        """
+        return self._seeds.copy()
+
+    def getLives(self):
+        """
+        Returns the lives left in each wave, as an int array.
+
+        The array belongs to the batch; do not change it.
+        """
+        return self._lives
+
+    def getAlienCounts(self):
+        """
+        Returns the number of live aliens in each wave, as an int array.
+        """
+        return self._alive.sum(axis=(1, 2))
+
+    def getAlive(self):
+        """
+        Returns which aliens of each wave are alive.
+
+        The result is a bool array of shape (N, ALIEN_ROWS, ALIENS_IN_ROW)
+        that belongs to the batch; do not change it.
+        """
+        return self._alive
+
+    def getCells(self):
+        """
+        Returns the starting positions (cellX, cellY) of the columns and rows.
+
+        The position of alien (row, col) of wave i is
+        (cellX[col] + dx[i], cellY[row] + dy[i]), with (dx, dy) from
+        getOffsets().
+        """
+        return (self._cellX, self._cellY)
+
+    def getOffsets(self):
+        """
+        Returns the arrays (dx, dy) of how far each formation moved.
+        """
+        return (self._dx, self._dy)
+
+    def getShipX(self):
+        """
+        Returns the x-coordinate of the ship of each wave, as a float array.
+        """
+        return self._shipX
+
+    def getShipAlive(self):
+        """
+        Returns whether the ship of each wave is alive, as a bool array.
+        """
+        return self._shipAlive
+
+    def getPlayerBolts(self):
+        """
+        Returns the arrays (on, x, y) of the player bolt of each wave.
+        """
+        return (self._playerOn, self._playerX, self._playerY)
+
+    def getAlienBolts(self):
+        """
+        Returns the arrays (on, x, y) of the alien bolts of each wave.
+
+        Each array has shape (N, BOLT_MAX); only the slots that are on are
+        bolts on screen.
+        """
+        return (self._alienOn, self._alienX, self._alienY)
+
+    def getDone(self):
+        """
+        Returns whether each wave is over, as a bool array.
+        """
+        return self._done
+
+    # INITIALIZER
+    def __init__(self, size, seed=None, pattern=BOLT_PATTERN):
+        """
+        Initializes a batch of size new waves.
+
+        Parameter size: the number of waves
+        Precondition: size is an int > 0
+
+        Parameter seed: the seed of the first wave (wave i has seed seed+i),
+        or None for seeds chosen by the operating system
+        Precondition: seed is None or an int >= 0
+
+        Parameter pattern: the volley pattern of the aliens
+        Precondition: pattern is one of 'single', 'spread' or 'aimed'
+        """
+        assert type(size) == int and size > 0, '%s is not a valid size' % repr(size)
+        assert seed == None or (type(seed) == int and seed >= 0), \
+            '%s is not a valid seed' % repr(seed)
+        assert pattern in ('single', 'spread', 'aimed'), \
+            '%s is not a volley pattern' % repr(pattern)
+        self._size = size
+        self._pattern = pattern
+
+        rows = np.arange(ALIEN_ROWS)
+        cols = np.arange(ALIENS_IN_ROW)
+        top = GAME_HEIGHT - ALIEN_CEILING - (ALIEN_HEIGHT//2)
+        left = ALIEN_H_SEP + (ALIEN_WIDTH//2)
+        self._cellX = (left + cols*(ALIEN_H_SEP + ALIEN_WIDTH)).astype(float)
+        self._cellY = (top - rows*(ALIEN_HEIGHT + ALIEN_V_SEP)).astype(float)
+
+        n = size
+        self._alive = np.ones((n, ALIEN_ROWS, ALIENS_IN_ROW), dtype=bool)
+        self._dx = np.zeros(n)
+        self._dy = np.zeros(n)
+        self._marchLeft = np.zeros(n, dtype=bool)
+        self._held = np.zeros((n, ALIENS_IN_ROW), dtype=bool)
+        self._shipX = np.full(n, float(GAME_WIDTH//2))
+        self._shipAlive = np.ones(n, dtype=bool)
+        self._lives = np.full(n, SHIP_LIVES, dtype=int)
+        self._done = np.zeros(n, dtype=bool)
+        self._clock = np.zeros(n)
+        self._due = np.full((n, COOL+ALIENS_IN_ROW), np.inf)
+        self._ticket = np.zeros((n, COOL+ALIENS_IN_ROW), dtype=int)
+        self._tickets = np.zeros(n, dtype=int)
+        self._playerOn = np.zeros(n, dtype=bool)
+        self._playerX = np.zeros(n)
+        self._playerY = np.zeros(n)
+        self._alienOn = np.zeros((n, BOLT_MAX), dtype=bool)
+        self._alienX = np.zeros((n, BOLT_MAX))
+        self._alienY = np.zeros((n, BOLT_MAX))
+        self._alienAge = np.zeros((n, BOLT_MAX), dtype=int)
+
+        if seed == None:
+            first = int.from_bytes(np.random.SeedSequence().generate_state(2, np.uint32).tobytes(), 'little')
+        else:
+            first = seed
+        self._seeds = (np.arange(n, dtype=np.uint64) + np.uint64(first % 2**64))
+        self._draws = np.zeros(n, dtype=np.uint64)
+        self.reset()
+
+    # METHODS TO START AND PLAY THE WAVES
+    def reset(self, games=None, seeds=None):
+        """
+        Starts new waves in place of the given waves.
+
+        Parameter games: the waves to reset, or None for all of them
+        Precondition: games is None, a bool array of length N, or an array
+        of wave indices
+
+        Parameter seeds: new seeds for those waves, or None to keep drawing
+        from their current seeds
+        Precondition: seeds is None or an int array with one entry per wave
+        that is reset
+        """
+        games = self._rows(games)
+        if seeds is not None:
+            self._seeds[games] = np.asarray(seeds, dtype=np.uint64)
+            self._draws[games] = 0
+
+        self._alive[games] = True
+        self._dx[games] = 0.0
+        self._dy[games] = 0.0
+        self._marchLeft[games] = False
+        self._held[games] = False
+        self._shipX[games] = float(GAME_WIDTH//2)
+        self._shipAlive[games] = True
+        self._lives[games] = SHIP_LIVES
+        self._done[games] = False
+        self._clock[games] = 0.0
+        self._due[games] = np.inf
+        self._tickets[games] = 0
+        self._clearBolts(games)
+
+        self._schedule(games, MARCH, np.full(len(games), ALIEN_SPEED))
+        self._schedule(games, FIRE, self._fireDelay(games))
+
+    def update(self, actions, dt):
+        """
+        Advances every wave that is not over by dt seconds.
+
+        Parameter actions: what the player does in each wave
+        Precondition: actions is an int, or an int array of length N, made of
+        ACTION_LEFT, ACTION_RIGHT and ACTION_FIRE combined with |
+
+        Parameter dt: The time since the last animation frame.
+        Precondition: dt is a number >= 0
+        """
+        assert type(dt) in [int,float] and dt >= 0, '%s is not a valid dt' % repr(dt)
+        actions = np.broadcast_to(np.asarray(actions, dtype=int), (self._size,))
+        live = ~self._done
+
+        # A destroyed ship comes back on the next update, with no bolts
+        back = np.flatnonzero(live & ~self._shipAlive)
+        if len(back) > 0:
+            self._clearBolts(back)
+            self._shipX[back] = float(GAME_WIDTH//2)
+            self._shipAlive[back] = True
+            self._schedule(back, RESPAWN, np.full(len(back), SHIP_RESPAWN))
+
+        self._moveShips(live, actions)
+        self._clock[live] += dt
+        self._runTimers(live)
+        self._fireShips(live, actions)
+
+        self._playerY[self._playerOn] += BOLT_SPEED
+        self._alienY[self._alienOn] -= BOLT_SPEED
+        self._collide(live)
+        self._cull()
+        self._invade(live)
+        self._done |= (self._lives == 0) | ~self._alive.any(axis=(1, 2))
+
+    # HELPER METHODS FOR THE SHIP AND BOLTS
+    def _moveShips(self, live, actions):
+        """
+        Moves the live ships left or right.
+
+        Parameter live: the waves to update
+        Precondition: live is a bool array of length N
+
+        Parameter actions: what the player does in each wave
+        Precondition: actions is an int array of length N
+        """
+        moving = live & self._shipAlive
+        left = moving & (actions & ACTION_LEFT != 0)
+        right = moving & (actions & ACTION_RIGHT != 0)
+        self._shipX[left] = np.maximum(self._shipX[left] - SHIP_MOVEMENT, SHIP_WIDTH//2)
+        self._shipX[right] = np.minimum(self._shipX[right] + SHIP_MOVEMENT,
+                                        GAME_WIDTH - SHIP_WIDTH//2)
+
+    def _fireShips(self, live, actions):
+        """
+        Fires a bolt from every live ship that asks for one and has none.
+
+        Parameter live: the waves to update
+        Precondition: live is a bool array of length N
+
+        Parameter actions: what the player does in each wave
+        Precondition: actions is an int array of length N
+        """
+        fire = live & self._shipAlive & ~self._playerOn & (actions & ACTION_FIRE != 0)
+        self._playerOn[fire] = True
+        self._playerX[fire] = self._shipX[fire]
+        self._playerY[fire] = SHIP_BOTTOM
+
+    def _clearBolts(self, games):
+        """
+        Removes every bolt of the given waves.
+
+        Parameter games: the waves to clear
+        Precondition: games is an int array of wave indices
+        """
+        self._playerOn[games] = False
+        self._alienOn[games] = False
+
+    def _collide(self, live):
+        """
+        Finds and applies the collisions of this update.
+
+        A player bolt destroys the first live alien along its path, taking
+        the bottom rows first and then the left columns, as Formation.findHits
+        does.  The oldest alien bolt that touched the ship destroys it.
+
+        Parameter live: the waves to update
+        Precondition: live is a bool array of length N
+        """
+        games = np.flatnonzero(live & self._playerOn)
+        if len(games) > 0:
+            x = self._playerX[games][:, None, None]
+            y1 = self._playerY[games][:, None, None]
+            y0 = y1 - BOLT_SPEED
+            ax = self._cellX[None, None, :] + self._dx[games][:, None, None]
+            ay = self._cellY[None, :, None] + self._dy[games][:, None, None]
+            hit = (self._alive[games] &
+                   (np.abs(ax - x) < ALIEN_WIDTH/2 + BOLT_WIDTH) &
+                   (y0 - BOLT_HEIGHT < ay + ALIEN_HEIGHT/2) &
+                   (y1 + BOLT_HEIGHT > ay - ALIEN_HEIGHT/2))
+            rows = hit.any(axis=2)
+            found = rows.any(axis=1)
+            games = games[found]
+            row = ALIEN_ROWS - 1 - np.argmax(rows[found][:, ::-1], axis=1)
+            col = np.argmax(hit[found, row], axis=1)
+            self._alive[games, row, col] = False
+            self._playerOn[games] = False
+
+        games = np.flatnonzero(live & self._shipAlive)
+        if len(games) > 0:
+            ys = self._alienY[games]
+            back = ys + BOLT_SPEED
+            hit = (self._alienOn[games] &
+                   (np.abs(self._alienX[games] - self._shipX[games][:, None])
+                    < SHIP_WIDTH/2 + BOLT_WIDTH) &
+                   (ys - BOLT_HEIGHT < SHIP_BOTTOM + SHIP_HEIGHT/2) &
+                   (back + BOLT_HEIGHT > SHIP_BOTTOM - SHIP_HEIGHT/2))
+            found = hit.any(axis=1)
+            games = games[found]
+            age = np.where(hit[found], self._alienAge[games], np.iinfo(int).max)
+            slot = np.argmin(age, axis=1)
+            self._alienOn[games, slot] = False
+            self._shipAlive[games] = False
+            self._lives[games] -= 1
+
+    def _cull(self):
+        """
+        Removes the bolts that left the screen.
+        """
+        self._playerOn &= ~(self._playerY > GAME_HEIGHT)
+        self._alienOn &= ~(self._alienY <= 0)
+
+    def _invade(self, live):
+        """
+        Ends the waves whose aliens reached the defense line.
+
+        Parameter live: the waves to update
+        Precondition: live is a bool array of length N
+        """
+        rows = self._alive.any(axis=2)
+        some = live & rows.any(axis=1)
+        low = ALIEN_ROWS - 1 - np.argmax(rows[:, ::-1], axis=1)
+        bottom = self._cellY[low] + self._dy - ALIEN_HEIGHT//2
+        lost = some & (bottom <= DEFENSE_LINE)
+        self._shipAlive[lost] = False
+        self._lives[lost] = 0
+
+    # HELPER METHODS FOR THE TIMERS
+    def _runTimers(self, live):
+        """
+        Handles every timer of the live waves that is due.
+
+        Each pass handles the earliest due timer (by due time, then ticket) of
+        every wave that has one, so the timers of a wave are handled in the
+        same order as in its TimerQueue.
+
+        Parameter live: the waves to update
+        Precondition: live is a bool array of length N
+        """
+        while True:
+            due = (self._due <= self._clock[:, None]) & live[:, None]
+            games = np.flatnonzero(due.any(axis=1))
+            if len(games) == 0:
+                return
+
+            times = np.where(due[games], self._due[games], np.inf)
+            first = times == times.min(axis=1)[:, None]
+            tickets = np.where(first, self._ticket[games], np.iinfo(int).max)
+            kind = np.argmin(tickets, axis=1)
+
+            # March is periodic; the other timers are only due once
+            march = games[kind == MARCH]
+            self._due[march, MARCH] += ALIEN_SPEED
+            once = kind != MARCH
+            self._due[games[once], kind[once]] = np.inf
+
+            self._march(march[self._shipAlive[march]])
+            self._fireAliens(games[kind == FIRE])
+            cool = kind >= COOL
+            self._held[games[cool], kind[cool]-COOL] = False
+
+    def _schedule(self, games, timer, delay):
+        """
+        Schedules a timer of the given waves delay seconds from now.
+
+        Parameter games: the waves to schedule the timer in
+        Precondition: games is an int array of wave indices
+
+        Parameter timer: the timer to schedule
+        Precondition: timer is an int or an int array, with entries in
+        0..COOL+ALIENS_IN_ROW-1
+
+        Parameter delay: the seconds until each timer is due
+        Precondition: delay is a float array with one entry per wave
+        """
+        self._tickets[games] += 1
+        self._due[games, timer] = self._clock[games] + delay
+        self._ticket[games, timer] = self._tickets[games]
+
+    def _march(self, games):
+        """
+        Moves the formations of the given waves one step.
+
+        A formation moving left drops and turns around if its left-most alien
+        was already at the left edge.  A formation moving right drops and
+        turns around if its next step would pass the right edge.  These are
+        the rules of Wave.moveAliensLeft and Wave.moveAliensRight.
+
+        Parameter games: the waves to move
+        Precondition: games is an int array of wave indices
+        """
+        cols = self._alive[games].any(axis=1)
+        some = cols.any(axis=1)
+        games = games[some]
+        cols = cols[some]
+        leftX = self._cellX[np.argmax(cols, axis=1)] + self._dx[games]
+        rightX = self._cellX[ALIENS_IN_ROW-1-np.argmax(cols[:, ::-1], axis=1)] + self._dx[games]
+
+        going = self._marchLeft[games]
+        step = np.where(going, -ALIEN_H_WALK, ALIEN_H_WALK)
+        self._dx[games] += step
+        turnLeft = going & (np.trunc(leftX) <= ALIEN_WIDTH//2 + ALIEN_H_SEP)
+        turnRight = ~going & (rightX + 2*ALIEN_H_WALK >= GAME_WIDTH - ALIEN_WIDTH//2)
+        turn = turnLeft | turnRight
+        self._marchLeft[games[turn]] = ~going[turn]
+        self._dy[games[turn]] -= ALIEN_V_SEP
+
+    def _fireAliens(self, games):
+        """
+        Fires a volley in the given waves and schedules their next volley.
+
+        A wave whose ship was just restored holds its fire.  A volley follows
+        the rules of FireScheduler.volley: it never puts more than BOLT_MAX
+        alien bolts on screen, only the bottom alien of a column that is not
+        cooling down fires, and each column that fires cools down for
+        BOLT_COOLDOWN seconds.
+
+        Parameter games: the waves that fire
+        Precondition: games is an int array of wave indices
+        """
+        shooting = games[self._due[games, RESPAWN] == np.inf]
+        budget = BOLT_MAX - self._alienOn[shooting].sum(axis=1)
+        budget = np.minimum(budget, BOLT_VOLLEY if self._pattern == 'spread' else 1)
+
+        for shot in range(int(budget.max()) if len(shooting) > 0 else 0):
+            games_now = shooting[budget > shot]
+            cols = self._alive[games_now].any(axis=1) & ~self._held[games_now]
+            ready = cols.any(axis=1)
+            games_now = games_now[ready]
+            cols = cols[ready]
+            if len(games_now) == 0:
+                break
+
+            if self._pattern == 'aimed':
+                target = np.where(self._shipAlive[games_now], self._shipX[games_now], GAME_WIDTH/2)
+                dist = np.abs(self._cellX[None, :] + self._dx[games_now][:, None] - target[:, None])
+                col = np.argmin(np.where(cols, dist, np.inf), axis=1)
+            else:
+                count = cols.sum(axis=1)
+                pick = np.minimum((self._random(games_now)*count).astype(int), count-1)
+                col = np.argmax(np.cumsum(cols, axis=1) > pick[:, None], axis=1)
+
+            live = self._alive[games_now, :, col]
+            row = ALIEN_ROWS - 1 - np.argmax(live[:, ::-1], axis=1)
+            slot = np.argmin(self._alienOn[games_now], axis=1)
+            self._alienOn[games_now, slot] = True
+            self._alienX[games_now, slot] = self._cellX[col] + self._dx[games_now]
+            self._alienY[games_now, slot] = self._cellY[row] + self._dy[games_now]
+            self._alienAge[games_now, slot] = self._tickets[games_now]
+            self._held[games_now, col] = True
+            self._schedule(games_now, COOL+col, np.full(len(games_now), BOLT_COOLDOWN))
+
+        self._schedule(games, FIRE, self._fireDelay(games))
+
+    def _fireDelay(self, games):
+        """
+        Returns the delay until the next volley of the given waves.
+
+        The delay is a random number of alien steps between 1 and BOLT_RATE.
+
+        Parameter games: the waves to draw a delay for
+        Precondition: games is an int array of wave indices
+        """
+        steps = 1 + np.minimum((self._random(games)*BOLT_RATE).astype(int), BOLT_RATE-1)
+        return steps*ALIEN_SPEED
+
+    def _random(self, games):
+        """
+        Returns one random float in [0,1) for each of the given waves.
+
+        The numbers come from the splitmix64 hash of the seed and the number of
+        draws of each wave, so every wave has its own stream.
+
+        Parameter games: the waves to draw for
+        Precondition: games is an int array of wave indices
+        """
+        self._draws[games] += np.uint64(1)
+        with np.errstate(over='ignore'):
+            z = self._seeds[games] + self._draws[games]*_GOLDEN
+            z = (z ^ (z >> np.uint64(30)))*_MIX1
+            z = (z ^ (z >> np.uint64(27)))*_MIX2
+            z = z ^ (z >> np.uint64(31))
+        return (z >> np.uint64(11)).astype(float)/float(2**53)
+
+    def _rows(self, games):
+        """
+        Returns the given waves as an array of wave indices.
+
+        Parameter games: the waves, or None for all of them
+        Precondition: games is None, a bool array of length N, or an array
+        of wave indices
+        """
+        if games is None:
+            return np.arange(self._size)
+        games = np.asarray(games)
+        if games.dtype == bool:
+            return np.flatnonzero(games)
+        return games.astype(int).ravel()